@@ -0,0 +1,165 @@
+"""추천 API 동시성 제한, 대기열 제한, 클라이언트별 요청 속도 제한"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple
+
+
+class AdmissionRejected(Exception):
+    """요청이 수용되지 않음 (app에서 503/429 응답으로 변환)"""
+
+    def __init__(self, code: str, status: int, message: str, retry_after: int):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    동시 실행 수 제한 + 제한된 대기열
+
+    실행 슬롯이 모두 차 있으면 최대 max_queue개까지 queue_timeout초 동안 대기하고,
+    대기열까지 가득 차면 즉시 거절한다.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 32, queue_timeout: float = 2.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._stats = {
+            'accepted': 0,
+            'queued': 0,
+            'shed_queue_full': 0,
+            'shed_queue_timeout': 0,
+            'max_waiting': 0
+        }
+
+    def _retry_after(self) -> int:
+        """대기열이 비워지는 데 걸릴 대략적인 시간(초)"""
+        return max(1, math.ceil(self.queue_timeout))
+
+    def acquire(self) -> None:
+        """실행 슬롯 획득 (실패 시 AdmissionRejected)"""
+        with self._cond:
+            if self._active < self.max_concurrency and self._waiting == 0:
+                self._active += 1
+                self._stats['accepted'] += 1
+                return
+
+            if self._waiting >= self.max_queue:
+                self._stats['shed_queue_full'] += 1
+                raise AdmissionRejected(
+                    'SERVER_OVERLOADED', 503,
+                    '요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요',
+                    self._retry_after()
+                )
+
+            self._waiting += 1
+            self._stats['queued'] += 1
+            self._stats['max_waiting'] = max(self._stats['max_waiting'], self._waiting)
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self._active >= self.max_concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['shed_queue_timeout'] += 1
+                        raise AdmissionRejected(
+                            'SERVER_OVERLOADED', 503,
+                            '대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요',
+                            self._retry_after()
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._active += 1
+            self._stats['accepted'] += 1
+
+    def release(self) -> None:
+        """실행 슬롯 반환"""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        """with 블록 동안 실행 슬롯 점유"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """현재 상태와 누적 통계"""
+        with self._cond:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+                'queue_timeout': self.queue_timeout,
+                'active': self._active,
+                'waiting': self._waiting,
+                **self._stats
+            }
+
+
+class TokenBucketRateLimiter:
+    """
+    클라이언트별 토큰 버킷
+
+    초당 rate개씩 토큰이 채워지고 최대 burst개까지 쌓인다.
+    rate가 0 이하이면 제한하지 않는다.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_clients = max_clients
+        # 클라이언트 -> (남은 토큰, 마지막 갱신 시각), 오래 쓰이지 않은 순
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def check(self, client_id: str) -> None:
+        """토큰 1개 소비 (부족하면 AdmissionRejected)"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(client_id, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[client_id] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            if not allowed:
+                self._limited += 1
+                retry_after = max(1, math.ceil((1 - tokens) / self.rate))
+        if not allowed:
+            raise AdmissionRejected(
+                'RATE_LIMITED', 429,
+                '요청 빈도 제한을 초과했습니다. 잠시 후 다시 시도해주세요',
+                retry_after
+            )
+
+    def metrics(self) -> Dict[str, Any]:
+        """설정과 누적 거절 수"""
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'tracked_clients': len(self._buckets),
+                'rate_limited': self._limited
+            }
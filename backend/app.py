@@ -1,86 +1,285 @@
 """Flask REST API 서버"""
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
 from flask_cors import CORS
+from functools import wraps
+import hmac
+import json
 import os
+import threading
+import time
 import traceback
-import pandas as pd
 from typing import Tuple, List
-
-from file_utils import find_data_file
-from data_loader import load_and_validate_data
-from recommendation_engine import RecommendationEngine
+from urllib.parse import quote
+
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from admission import AdmissionController, AdmissionRejected, TokenBucketRateLimiter
+from image_proxy import DiskImageCache, ImageFetchError, ImageProxy, snap_width
+from memory_debug import AllocationTracer, deep_sizeof, process_memory
+
+from catalog_changes import CatalogChange, CatalogChangeError, CatalogEditor
+from catalog import LIST_ITEM_FIELDS, SpeciesCatalog, encode_list_cursor, load_snapshot
+from species_resolver import NameMatch
+from recommendation_engine import DEFAULT_POLICY, RecommendationEngine
+from request_schema import (
+    decode_image_query, decode_list_query, decode_memory_query, decode_preferences, decode_recommend_request,
+    decode_session_options, decode_session_request, decode_species_query
+)
+from scoring_policy import PolicyRegistry, ScoringPolicy
+from scoring_rules import compile_score_tables
+from scoring_session import ScoringSession, ScoringSessionStore
+from warmup import WarmupState
 
 app = Flask(__name__)
 
+# 신뢰하는 리버스 프록시 단계 수 (0이면 X-Forwarded-For를 무시하고 접속 주소만 사용)
+# 프록시 뒤에 배포할 때만 실제 프록시 수로 지정한다. 클라이언트가 보낸 헤더는 믿지 않는다.
+TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+if TRUSTED_PROXY_HOPS > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS)
+
 # CORS 설정 (개발용: 모든 도메인 허용)
-CORS(app, resources={r"/api/*": {"origins": "*"}})
+# 별칭/오타로 찾은 종 상세 응답의 실제 종명 헤더를 프론트엔드에서 읽을 수 있게 노출
+CORS(app, resources={r"/api/*": {"origins": "*", "expose_headers": ["X-Species-Resolved", "X-Species-Match"]}})
 
 # 전역 변수
 dataset = None
 engine = None
 dataset_warnings = []
+catalog_editor = None
+
+# 관리자 API 종 변경 로그 (기동 시 다시 적용)
+CATALOG_CHANGELOG = os.getenv(
+    'CATALOG_CHANGELOG',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.catalog_changes.jsonl')
+)
+
+# 기동 준비 시 실행할 대표 선호도 (회귀 검사 코퍼스와 같은 형식, 없으면 건너뜀)
+WARMUP_QUERIES_FILE = os.getenv(
+    'WARMUP_QUERIES_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'regression_corpus.json')
+)
+
+# 기동 준비 진행 상황 (/api/health/ready)
+warmup = WarmupState()
+
+# 설문 진행 중 미리보기용 점수 세션
+scoring_sessions = ScoringSessionStore(
+    ttl_seconds=float(os.getenv('SCORING_SESSION_TTL', 1800)),
+    max_sessions=int(os.getenv('SCORING_SESSION_MAX', 1000))
+)
+
+# 추천 API 부하 제어 (동시 실행 수, 대기열, 클라이언트별 요청 속도)
+recommend_admission = AdmissionController(
+    max_concurrency=int(os.getenv('RECOMMEND_MAX_CONCURRENCY', 8)),
+    max_queue=int(os.getenv('RECOMMEND_MAX_QUEUE', 32)),
+    queue_timeout=float(os.getenv('RECOMMEND_QUEUE_TIMEOUT', 2.0))
+)
+recommend_rate_limiter = TokenBucketRateLimiter(
+    rate=float(os.getenv('RECOMMEND_RATE_LIMIT', 10)),
+    burst=int(os.getenv('RECOMMEND_RATE_BURST', 20))
+)
+
+# 종 사진 썸네일 프록시 (디스크 캐시)
+image_proxy = ImageProxy(DiskImageCache(
+    os.getenv('IMAGE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.image_cache')),
+    max_bytes=int(float(os.getenv('IMAGE_CACHE_MAX_MB', 256)) * 1024 * 1024)
+))
+
+# 요청 단위 할당 추적 (/api/debug/memory?trace=start로 켤 때만 동작)
+allocation_tracer = AllocationTracer()
+
+
+def load_catalog() -> Tuple[SpeciesCatalog, List[str]]:
+    """
+    카탈로그 로드
+    
+    CATALOG_SNAPSHOT이 지정되면 사전 생성된 스냅샷을 읽어 pandas를 전혀 import하지 않는다.
+    (스냅샷 생성: python data_loader.py --snapshot <경로>)
+    지정되지 않으면 원본 CSV/Excel을 pandas로 검증한 뒤 카탈로그로 변환한다.
+    """
+    snapshot_path = os.getenv('CATALOG_SNAPSHOT')
+    if snapshot_path:
+        return load_snapshot(snapshot_path)
+    
+    from file_utils import find_data_file
+    from data_loader import load_and_validate_data
+    
+    file_path = find_data_file()
+    df, warnings_list = load_and_validate_data(file_path)
+    return SpeciesCatalog.from_dataframe(df, source=file_path), warnings_list
+
+
+def load_policies() -> PolicyRegistry:
+    """점수 정책 로드 (SCORING_POLICIES_FILE이 없으면 기본 정책만 사용)"""
+    policies_path = os.getenv('SCORING_POLICIES_FILE')
+    if policies_path:
+        return PolicyRegistry.from_file(policies_path, DEFAULT_POLICY)
+    return PolicyRegistry.single(DEFAULT_POLICY)
+
+
+def warm_recommend_queries() -> dict:
+    """대표 선호도로 정책마다 추천을 한 번씩 실행 (점수 계산 경로와 지연 생성 캐시 예열)"""
+    if not WARMUP_QUERIES_FILE or not os.path.exists(WARMUP_QUERIES_FILE):
+        return {'status': 'skipped'}
+    with open(WARMUP_QUERIES_FILE, 'r', encoding='utf-8') as f:
+        cases = json.load(f).get('cases', [])
+    queries = 0
+    for case in cases:
+        preferences, errors = decode_preferences({'preferences': case.get('preferences')})
+        if errors:
+            continue
+        for policy_name in engine.policies.policies:
+            engine.recommend(preferences, {'scoring_policy': policy_name})
+            queries += 1
+    return {'queries': queries}
+
+
+def warm_species_details() -> int:
+    """전체 종 상세 조회 (스냅샷 mmap 콜드 저장소 페이지를 미리 읽음)"""
+    count = 0
+    for index, record in enumerate(dataset.records):
+        if record is not None:
+            dataset.get_detail(index)
+            count += 1
+    return count
 
 
 def init_data():
-    """데이터 초기화"""
-    global dataset, engine, dataset_warnings
+    """
+    데이터 초기화와 예열 (단계별 소요 시간은 warmup에 기록)
     
+    카탈로그/엔진은 모두 준비된 뒤 한 번에 교체하므로 요청은 이전 상태나 완성된 상태만 본다.
+    """
+    global dataset, engine, dataset_warnings, catalog_editor
+    
+    warmup.start()
     try:
-        file_path = find_data_file()
-        dataset, dataset_warnings = load_and_validate_data(file_path)
-        engine = RecommendationEngine(dataset)
-        print(f"데이터 로드 완료: {len(dataset)}개 종")
+        with warmup.stage('load_catalog') as info:
+            catalog, warnings_list = load_catalog()
+            info['species'] = len(catalog)
+        with warmup.stage('replay_changes') as info:
+            editor = CatalogEditor(catalog, CATALOG_CHANGELOG)
+            applied, replay_warnings = editor.replay()
+            info['applied'] = applied
+        with warmup.stage('build_engine'):
+            new_engine = RecommendationEngine(catalog, load_policies())
+        
+        dataset, catalog_editor, engine = catalog, editor, new_engine
+        dataset_warnings = warnings_list + replay_warnings
+        scoring_sessions.clear()
+        print(f"데이터 로드 완료: {len(dataset)}개 종 (변경 로그 {applied}건 적용)")
         if dataset_warnings:
             print("경고:")
             for warning in dataset_warnings:
                 print(f"  - {warning}")
+        
+        with warmup.stage('warm_recommend') as info:
+            info.update(warm_recommend_queries())
+        with warmup.stage('warm_species_details') as info:
+            info['species'] = warm_species_details()
+        warmup.finish()
         return True
     except Exception as e:
         print(f"데이터 로드 실패: {str(e)}")
         traceback.print_exc()
+        warmup.finish(str(e))
         return False
 
 
-def validate_preferences(data: dict) -> Tuple[bool, List[str]]:
-    """선호도 입력 검증"""
-    errors = []
-    
-    if 'preferences' not in data:
-        errors.append("'preferences' 필드가 필요합니다")
-        return False, errors
-    
-    prefs = data['preferences']
-    
-    # 종류 검증
-    if '종류' not in prefs or not isinstance(prefs['종류'], list) or len(prefs['종류']) == 0:
-        errors.append("'종류'는 최소 1개 이상 선택해야 합니다")
-    
-    # 등급 값 검증
-    grade_fields = {
-        '사육_난이도_5단계': (1, 5),
-        '초기비용_등급_5단계_max': (1, 5),
-        '사육장_사이즈_3단계_max': (1, 3),
-        '먹이빈도_등급_prefer': (1, 5),
-        '핸들링적합도_5단계_prefer': (1, 5)
-    }
-    
-    for field, (min_val, max_val) in grade_fields.items():
-        if field in prefs:
-            val = prefs[field]
-            if val is not None and (not isinstance(val, int) or val < min_val or val > max_val):
-                errors.append(f"'{field}'는 {min_val}-{max_val} 범위의 정수여야 합니다")
-    
-    # 범주형 값 검증
-    if '활동패턴' in prefs and prefs['활동패턴'] not in [None, '', '야행성', '주행성']:
-        errors.append("'활동패턴'은 '야행성', '주행성' 또는 None이어야 합니다")
-    
-    if '식성타입' in prefs and prefs['식성타입'] not in [None, '', '잡식', '초식', '육식']:
-        errors.append("'식성타입'은 '잡식', '초식', '육식' 또는 None이어야 합니다")
+def prepare_server() -> None:
+    """백그라운드 기동 준비 (완료 전까지 /api/health/ready는 503)"""
+    if not init_data():
+        print("데이터 초기화 실패. /api/health/live와 /api/health/ready가 503을 반환합니다.")
+        return
+    if os.getenv('IMAGE_CACHE_WARM', 'false').lower() == 'true':
+        warm_image_cache()
+
+
+def _client_id() -> str:
+    """
+    요청 속도 제한/정책 분할용 클라이언트 식별자 (접속 주소)
     
-    if '관상용_애완용' in prefs and prefs['관상용_애완용'] not in [None, '', '관상용', '애완용', '둘 다']:
-        errors.append("'관상용_애완용'은 '관상용', '애완용', '둘 다' 또는 None이어야 합니다")
+    X-Forwarded-For는 TRUSTED_PROXY_HOPS로 지정한 프록시 단계만 ProxyFix가 반영하므로
+    클라이언트가 헤더를 바꿔 속도 제한 버킷을 우회하거나 다른 클라이언트 버킷을 밀어낼 수 없다.
+    """
+    return request.remote_addr or 'unknown'
+
+
+def choose_policy(options: dict) -> Tuple[ScoringPolicy, List[str]]:
+    """
+    요청 정책 선택
     
-    return len(errors) == 0, errors
+    options.scoring_policy로 직접 지정하거나, 지정하지 않으면 policy_key
+    (없으면 X-Client-Id 헤더 또는 클라이언트 주소) 해시로 트래픽 분할에 따라 배정한다.
+    """
+    name = options.get('scoring_policy')
+    if name is not None and name not in engine.policies:
+        return None, [f"'scoring_policy'는 {engine.policies.names()} 중 하나여야 합니다"]
+    split_key = options.get('policy_key') or request.headers.get('X-Client-Id') or _client_id()
+    return engine.policies.choose(name, str(split_key)), []
+
+
+def admin_required(view):
+    """X-Admin-Token 헤더가 ADMIN_TOKEN과 일치하는 요청만 실행 (미설정 시 관리자 API 비활성)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        admin_token = os.getenv('ADMIN_TOKEN')
+        if not admin_token:
+            return jsonify({
+                'error': {
+                    'code': 'ADMIN_DISABLED',
+                    'message': '관리자 API가 비활성화되어 있습니다 (ADMIN_TOKEN 미설정)',
+                    'details': []
+                }
+            }), 403
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token):
+            return jsonify({
+                'error': {
+                    'code': 'UNAUTHORIZED',
+                    'message': '관리자 토큰이 올바르지 않습니다',
+                    'details': []
+                }
+            }), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def admission_controlled(view):
+    """요청 속도 제한과 동시 실행 제한을 통과한 요청만 실행"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            recommend_rate_limiter.check(_client_id())
+            recommend_admission.acquire()
+        except AdmissionRejected as e:
+            response = jsonify({
+                'error': {
+                    'code': e.code,
+                    'message': e.message,
+                    'details': []
+                }
+            })
+            response.status_code = e.status
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
+        try:
+            return view(*args, **kwargs)
+        finally:
+            recommend_admission.release()
+    return wrapper
+
+
+@app.before_request
+def begin_allocation_trace():
+    """할당 추적 중이면 요청 시작 스냅샷 (진단 엔드포인트 자체는 제외)"""
+    if request.endpoint != 'debug_memory':
+        g.allocation_trace = allocation_tracer.begin_request()
+
+
+@app.teardown_request
+def end_allocation_trace(exc=None):
+    allocation_tracer.end_request(g.pop('allocation_trace', None), request.endpoint or request.path)
 
 
 @app.route('/api/health', methods=['GET'])
@@ -89,11 +288,30 @@ def health_check():
     return jsonify({
         'status': 'ok',
         'server': 'LizardMatch API',
-        'data_loaded': dataset is not None and engine is not None
+        'data_loaded': dataset is not None and engine is not None,
+        'ready': warmup.ready
     })
 
 
+@app.route('/api/health/live', methods=['GET'])
+def health_live():
+    """프로세스 생존 확인 (기동 준비가 실패해 회복할 수 없을 때만 503)"""
+    alive = warmup.status != 'failed'
+    return jsonify({
+        'status': 'alive' if alive else 'failed',
+        'warmup_status': warmup.status,
+        'uptime_seconds': round(time.monotonic() - warmup.created, 1)
+    }), 200 if alive else 503
+
+
+@app.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    """트래픽 수신 가능 여부 (카탈로그 로드/인덱스/예열 완료 후 200, 단계별 진행 상황 포함)"""
+    return jsonify(warmup.snapshot()), 200 if warmup.ready else 503
+
+
 @app.route('/api/recommend', methods=['POST'])
+@admission_controlled
 def recommend():
     """추천 요청"""
     if dataset is None or engine is None:
@@ -116,9 +334,9 @@ def recommend():
                 }
             }), 400
         
-        # 입력 검증
-        is_valid, errors = validate_preferences(data)
-        if not is_valid:
+        # 입력 검증/정규화 (선언되지 않은 필드는 버림)
+        preferences, options, errors = decode_recommend_request(data)
+        if errors:
             return jsonify({
                 'error': {
                     'code': 'INVALID_INPUT',
@@ -127,8 +345,16 @@ def recommend():
                 }
             }), 400
         
-        preferences = data.get('preferences', {})
-        options = data.get('options', {})
+        policy, errors = choose_policy(options)
+        if policy is None:
+            return jsonify({
+                'error': {
+                    'code': 'INVALID_INPUT',
+                    'message': '입력 값이 유효하지 않습니다',
+                    'details': errors
+                }
+            }), 400
+        options['scoring_policy'] = policy.name
         
         # 추천 수행
         result = engine.recommend(preferences, options)
@@ -145,10 +371,11 @@ def recommend():
         }), 500
 
 
-@app.route('/api/species/<species_name>', methods=['GET'])
-def get_species(species_name):
-    """종 상세 정보 조회"""
-    if dataset is None:
+@app.route('/api/recommend/matrix', methods=['POST'])
+@admission_controlled
+def recommend_matrix():
+    """클라이언트 재가중치용 종 × 질문 점수 행렬"""
+    if dataset is None or engine is None:
         return jsonify({
             'error': {
                 'code': 'DATASET_NOT_LOADED',
@@ -158,34 +385,213 @@ def get_species(species_name):
         }), 500
     
     try:
-        # 종명으로 검색 (정규화된 이름으로도 검색)
-        from data_loader import normalize_species_name
-        normalized_search = normalize_species_name(species_name)
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({
+                'error': {
+                    'code': 'INVALID_INPUT',
+                    'message': 'JSON 데이터가 필요합니다',
+                    'details': []
+                }
+            }), 400
         
-        species = None
-        for idx, row in dataset.iterrows():
-            if (row['종_한글명'] == species_name or 
-                normalize_species_name(row['종_한글명']) == normalized_search):
-                species = row
-                break
+        preferences, options, errors = decode_recommend_request(data)
+        if errors:
+            return jsonify({
+                'error': {
+                    'code': 'INVALID_INPUT',
+                    'message': '입력 값이 유효하지 않습니다',
+                    'details': errors
+                }
+            }), 400
         
-        if species is None:
+        policy, errors = choose_policy(options)
+        if policy is None:
             return jsonify({
                 'error': {
-                    'code': 'SPECIES_NOT_FOUND',
-                    'message': f'종을 찾을 수 없습니다: {species_name}',
+                    'code': 'INVALID_INPUT',
+                    'message': '입력 값이 유효하지 않습니다',
+                    'details': errors
+                }
+            }), 400
+        
+        return jsonify(engine.score_matrix(preferences, policy))
+    
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': f'서버 오류가 발생했습니다: {str(e)}',
+                'details': []
+            }
+        }), 500
+
+
+def _session_preview(session_id: str, session: ScoringSession, top_n: int):
+    """세션의 현재 상위 N개 미리보기 응답"""
+    return jsonify({
+        'session_id': session_id,
+        'expires_in': int(scoring_sessions.ttl_seconds),
+        'top_n': top_n,
+        'results': session.top(top_n)
+    })
+
+
+@app.route('/api/session', methods=['POST'])
+def create_scoring_session():
+    """설문 미리보기용 점수 세션 생성"""
+    if dataset is None or engine is None:
+        return jsonify({
+            'error': {
+                'code': 'DATASET_NOT_LOADED',
+                'message': '데이터셋이 로드되지 않았습니다',
+                'details': []
+            }
+        }), 500
+    
+    try:
+        data = request.get_json(silent=True)
+        preferences, options, errors = decode_session_request({} if data is None else data)
+        if options is not None:
+            policy, policy_errors = choose_policy(options)
+            errors += policy_errors
+        if errors:
+            return jsonify({
+                'error': {
+                    'code': 'INVALID_INPUT',
+                    'message': '입력 값이 유효하지 않습니다',
+                    'details': errors
+                }
+            }), 400
+        
+        session = ScoringSession(engine, preferences, policy)
+        session_id = scoring_sessions.create(session)
+        return _session_preview(session_id, session, options['top_n'])
+    
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': f'서버 오류가 발생했습니다: {str(e)}',
+                'details': []
+            }
+        }), 500
+
+
+@app.route('/api/session/<session_id>', methods=['PATCH', 'DELETE'])
+def update_scoring_session(session_id):
+    """점수 세션 답변 갱신(PATCH) 또는 삭제(DELETE)"""
+    if request.method == 'DELETE':
+        scoring_sessions.delete(session_id)
+        return jsonify({'session_id': session_id, 'deleted': True})
+    
+    session = scoring_sessions.get(session_id)
+    if session is None:
+        return jsonify({
+            'error': {
+                'code': 'SESSION_NOT_FOUND',
+                'message': f'세션을 찾을 수 없거나 만료되었습니다: {session_id}',
+                'details': []
+            }
+        }), 404
+    
+    try:
+        data = request.get_json(silent=True)
+        answers = data.get('answers') if isinstance(data, dict) else None
+        if not isinstance(answers, dict):
+            return jsonify({
+                'error': {
+                    'code': 'INVALID_INPUT',
+                    'message': "'answers' 객체가 필요합니다",
                     'details': []
                 }
-            }), 404
+            }), 400
         
-        # 종 정보를 딕셔너리로 변환
-        result = species.to_dict()
-        # NaN 값을 None으로 변환
-        for key, value in result.items():
-            if pd.isna(value):
-                result[key] = None
+        options, option_errors = decode_session_options(data)
+        with session.lock:
+            merged = dict(session.preferences)
+            merged.update(answers)
+            decoded, errors = decode_preferences({'preferences': merged}, partial=True)
+            errors += option_errors
+            if errors:
+                return jsonify({
+                    'error': {
+                        'code': 'INVALID_INPUT',
+                        'message': '입력 값이 유효하지 않습니다',
+                        'details': errors
+                    }
+                }), 400
+            
+            # 정규화된 값으로 바뀐 답변만 반영 (선언되지 않은 필드는 무시)
+            session.update({key: decoded[key] for key in answers if key in decoded})
+            return _session_preview(session_id, session, options['top_n'])
+    
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': f'서버 오류가 발생했습니다: {str(e)}',
+                'details': []
+            }
+        }), 500
+
+
+def species_not_found(species_name: str, match: NameMatch):
+    """SPECIES_NOT_FOUND 응답 (details: 비슷한 종명 제안, 유사도 내림차순)"""
+    return jsonify({
+        'error': {
+            'code': 'SPECIES_NOT_FOUND',
+            'message': f'종을 찾을 수 없습니다: {species_name}',
+            'details': [
+                {'suggestion': name, 'score': score}
+                for name, score in match.suggestions
+            ]
+        }
+    }), 404
+
+
+@app.route('/api/species/<species_name>', methods=['GET'])
+def get_species(species_name):
+    """종 상세 정보 조회 (fields: 쉼표로 구분한 컬럼만 반환)"""
+    if dataset is None:
+        return jsonify({
+            'error': {
+                'code': 'DATASET_NOT_LOADED',
+                'message': '데이터셋이 로드되지 않았습니다',
+                'details': []
+            }
+        }), 500
+    
+    try:
+        query, errors = decode_species_query(request.args)
+        fields = query.get('fields') if query else None
+        if fields:
+            errors += [f"알 수 없는 컬럼입니다: {field}" for field in fields if field not in dataset.columns]
+        if errors:
+            return jsonify({
+                'error': {
+                    'code': 'INVALID_INPUT',
+                    'message': '입력 값이 유효하지 않습니다',
+                    'details': errors
+                }
+            }), 400
         
-        return jsonify(result)
+        # 종명으로 검색 (정규화된 이름 → 별칭 → 오타 유사 검색)
+        match = dataset.resolve_name(species_name)
+        
+        if match.index is None:
+            return species_not_found(species_name, match)
+        
+        # 핫 + 콜드 컬럼을 합친 상세 정보 (결측치는 카탈로그에서 이미 None)
+        response = jsonify(dataset.get_detail(match.index, fields))
+        if match.method != 'exact':
+            # 별칭/오타로 찾은 경우 실제 종명을 알려 준다 (클라이언트가 링크를 고칠 수 있게)
+            response.headers['X-Species-Resolved'] = quote(dataset.records[match.index]['종_한글명'])
+            response.headers['X-Species-Match'] = match.method
+        return response
     
     except Exception as e:
         traceback.print_exc()
@@ -198,9 +604,76 @@ def get_species(species_name):
         }), 500
 
 
+@app.route('/api/species/<species_name>/image', methods=['GET'])
+def get_species_image(species_name):
+    """종 사진 썸네일 (w: 요청 폭, 160/320/640 중 하나로 맞춤)"""
+    if dataset is None:
+        return jsonify({
+            'error': {
+                'code': 'DATASET_NOT_LOADED',
+                'message': '데이터셋이 로드되지 않았습니다',
+                'details': []
+            }
+        }), 500
+    
+    query, errors = decode_image_query(request.args)
+    if errors:
+        return jsonify({
+            'error': {
+                'code': 'INVALID_INPUT',
+                'message': '입력 값이 유효하지 않습니다',
+                'details': errors
+            }
+        }), 400
+    width = query.get('w')
+    
+    match = dataset.resolve_name(species_name)
+    if match.index is None:
+        return species_not_found(species_name, match)
+    species = dataset.records[match.index]
+    
+    source_url = species.get('사진_URL') or ''
+    if not source_url:
+        return jsonify({
+            'error': {
+                'code': 'IMAGE_NOT_FOUND',
+                'message': f'등록된 사진이 없습니다: {species_name}',
+                'details': []
+            }
+        }), 404
+    
+    try:
+        image = image_proxy.get(source_url, snap_width(width))
+    except ImageFetchError as e:
+        return jsonify({
+            'error': {
+                'code': 'IMAGE_FETCH_FAILED',
+                'message': str(e),
+                'details': []
+            }
+        }), 502
+    
+    if request.if_none_match.contains(image.etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(image.data, mimetype=image.content_type)
+    response.set_etag(image.etag)
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+def warm_image_cache() -> dict:
+    """전체 카탈로그 사진 썸네일 병렬 캐시 (IMAGE_CACHE_WARM=true일 때 기동 시 실행)"""
+    return image_proxy.warm(
+        (record.get('사진_URL') for record in dataset.records if record is not None),
+        workers=int(os.getenv('IMAGE_WARM_WORKERS', 8))
+    )
+
+
 @app.route('/api/species/list', methods=['GET'], strict_slashes=False)
 def list_species():
-    """도감 목록 조회 (검색/필터 지원)"""
+    """도감 목록 조회 (검색/필터, 온도/습도 범위 조건, fields 프로젝션, cursor 페이지네이션 지원)"""
     if dataset is None or engine is None:
         return jsonify({
             'error': {
@@ -211,64 +684,65 @@ def list_species():
         }), 500
 
     try:
-        q = (request.args.get('q') or '').strip()
-        difficulty = request.args.get('difficulty')
-        species_type = request.args.get('type')
-        limit = request.args.get('limit', None)
-
-        df = dataset.copy()
-
-        # 검색(종_한글명 부분일치)
-        if q:
-            df = df[df['종_한글명'].astype(str).str.contains(q, case=False, na=False)]
-
-        # 난이도 필터(1~5)
-        if difficulty is not None and str(difficulty).strip() != '':
-            try:
-                d = int(difficulty)
-                df = df[df['사육_난이도_5단계'].astype('Int64') == d]
-            except Exception:
-                pass
-
-        # 종류 필터
-        if species_type is not None and str(species_type).strip() != '':
-            df = df[df['종류'].astype(str) == str(species_type).strip()]
-
-        # 정렬(이름)
-        df = df.sort_values(by=['종류', '사육_난이도_5단계', '종_한글명'], ascending=[True, True, True])
-
-        if limit is not None and str(limit).strip() != '':
-            try:
-                lim = max(1, min(500, int(limit)))
-                df = df.head(lim)
-            except Exception:
-                pass
+        query, errors = decode_list_query(request.args)
+        if errors:
+            return jsonify({
+                'error': {
+                    'code': 'INVALID_INPUT',
+                    'message': '입력 값이 유효하지 않습니다',
+                    'details': errors
+                }
+            }), 400
+        q = query['q']
+        difficulty = query['difficulty']
+        species_type = query['type']
+        limit = query['limit']
+        fields = query['fields'] or LIST_ITEM_FIELDS
+        q_lower = q.lower()
+
+        def matches(r) -> bool:
+            # 검색(종_한글명 부분일치, 대소문자 무시), 난이도(1~5), 종류 필터
+            if q and q_lower not in str(r['종_한글명']).lower():
+                return False
+            if difficulty is not None and r['사육_난이도_5단계'] != difficulty:
+                return False
+            if species_type is not None and str(r['종류']) != species_type:
+                return False
+            return True
+
+        # 미리 정렬된 목록 순서(종류, 난이도, 이름)에서 커서 다음 위치부터 limit개만 모은다
+        if query['climate']:
+            # 온도/습도 조건은 구간 인덱스로 후보만 골라 목록 순서로 정렬 (전체 목록을 훑지 않음)
+            order = dataset.climate_filter(
+                query['climate'], contains=query['climate_match'] == 'contains', after=query['cursor']
+            )
+        else:
+            start = dataset.list_position_after(query['cursor']) if query['cursor'] else 0
+            order = dataset.list_order[start:]
+        indices = []
+        next_cursor = None
+        for index in order:
+            if not matches(dataset.records[index]):
+                continue
+            if limit is not None and len(indices) == limit:
+                # 다음 페이지가 있으면 이번 페이지 마지막 항목의 정렬 키가 커서
+                next_cursor = encode_list_cursor(dataset.list_values(indices[-1]))
+                break
+            indices.append(index)
 
         items = []
-        for _, row in df.iterrows():
-            # 도감 카드에 필요한 최소 필드만 노출
-            item = {
-                '종_한글명': row.get('종_한글명'),
-                '종류': row.get('종류'),
-                '관상용_애완용': row.get('관상용_애완용'),
-                '사육_난이도_5단계': int(row.get('사육_난이도_5단계')) if pd.notna(row.get('사육_난이도_5단계')) else None,
-                '초기비용_등급_5단계': int(row.get('초기비용_등급_5단계')) if pd.notna(row.get('초기비용_등급_5단계')) else None,
-                '사육장_사이즈_3단계': int(row.get('사육장_사이즈_3단계')) if pd.notna(row.get('사육장_사이즈_3단계')) else None,
-                '활동패턴': row.get('활동패턴'),
-                '식성타입': row.get('식성타입'),
-                '외형태그': row.get('외형태그'),
-                '사진_URL': row.get('사진_URL') or '',
-                '사육_요약': engine.generate_care_summary(row)
-            }
-            # NaN -> None
-            for k, v in list(item.items()):
-                if pd.isna(v):
-                    item[k] = None
+        for index in indices:
+            row = dataset.records[index]
+            # 도감 카드에 필요한 최소 필드만 노출 (fields로 더 줄일 수 있음)
+            item = {field: row.get(field) for field in fields}
+            if '사진_URL' in item:
+                item['사진_URL'] = item['사진_URL'] or ''
             items.append(item)
 
         return jsonify({
-            'total': int(len(df)),
-            'items': items
+            'total': len(items),
+            'items': items,
+            'next_cursor': next_cursor
         })
     except Exception as e:
         traceback.print_exc()
@@ -281,6 +755,89 @@ def list_species():
         }), 500
 
 
+def invalidate_species_caches(change: CatalogChange) -> dict:
+    """변경된 종에 의존하는 캐시 항목만 무효화 (다른 종의 캐시는 그대로 둔다)"""
+    image_entries = 0
+    old_url = change.old_record.get('사진_URL') if change.old_record is not None else None
+    new_url = change.new_record.get('사진_URL') if change.new_record is not None else None
+    if old_url and old_url != new_url:
+        # 다른 종이 같은 사진을 쓰고 있으면 썸네일을 남긴다
+        if not any(record is not None and record.get('사진_URL') == old_url for record in dataset.records):
+            image_entries = image_proxy.invalidate(old_url)
+    
+    sessions = scoring_sessions.sessions()
+    for session in sessions:
+        with session.lock:
+            session.refresh_species(change.index)
+    
+    return {'image_cache_entries': image_entries, 'sessions': len(sessions)}
+
+
+def _apply_catalog_change(apply, success_status: int = 200):
+    """관리자 변경 공통 처리: 적용 → 캐시 무효화 → 응답"""
+    if dataset is None or catalog_editor is None:
+        return jsonify({
+            'error': {
+                'code': 'DATASET_NOT_LOADED',
+                'message': '데이터셋이 로드되지 않았습니다',
+                'details': []
+            }
+        }), 500
+    
+    try:
+        change = apply()
+    except CatalogChangeError as e:
+        return jsonify({
+            'error': {
+                'code': e.code,
+                'message': e.message,
+                'details': e.details
+            }
+        }), e.status
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': f'서버 오류가 발생했습니다: {str(e)}',
+                'details': []
+            }
+        }), 500
+    
+    invalidated = invalidate_species_caches(change)
+    species = dataset.get_detail(change.index) if change.new_record is not None else None
+    return jsonify({
+        'op': change.op,
+        'species': species,
+        'deleted': change.old_record['종_한글명'] if change.op == 'delete' else None,
+        'invalidated': invalidated
+    }), success_status
+
+
+def _admin_body_object(key: str):
+    data = request.get_json(silent=True)
+    value = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(value, dict):
+        raise CatalogChangeError('INVALID_INPUT', 400, f"'{key}' 객체가 필요합니다")
+    return value
+
+
+@app.route('/api/admin/species', methods=['POST'])
+@admin_required
+def admin_insert_species():
+    """종 추가 (body: {"species": {...전체 컬럼}})"""
+    return _apply_catalog_change(lambda: catalog_editor.insert(_admin_body_object('species')), 201)
+
+
+@app.route('/api/admin/species/<species_name>', methods=['PATCH', 'DELETE'])
+@admin_required
+def admin_change_species(species_name):
+    """종 수정(PATCH, body: {"changes": {...바꿀 컬럼}}) 또는 삭제(DELETE)"""
+    if request.method == 'DELETE':
+        return _apply_catalog_change(lambda: catalog_editor.delete(species_name))
+    return _apply_catalog_change(lambda: catalog_editor.update(species_name, _admin_body_object('changes')))
+
+
 @app.route('/api/metadata', methods=['GET'])
 def get_metadata():
     """메타데이터 조회"""
@@ -300,6 +857,110 @@ def get_metadata():
     })
 
 
+@app.route('/api/policies', methods=['GET'])
+def list_policies():
+    """점수 정책 목록과 트래픽 분할"""
+    if engine is None:
+        return jsonify({
+            'error': {
+                'code': 'DATASET_NOT_LOADED',
+                'message': '데이터셋이 로드되지 않았습니다',
+                'details': []
+            }
+        }), 500
+    
+    return jsonify({
+        'default': engine.policies.default_name,
+        'traffic_split': engine.policies.traffic_split,
+        'policies': [policy.to_dict() for policy in engine.policies.policies.values()]
+    })
+
+
+@app.route('/api/metrics/admission', methods=['GET'])
+def get_admission_metrics():
+    """추천 API 부하 제어 지표 (거절/대기 통계)"""
+    return jsonify({
+        'recommend': dict(
+            recommend_admission.metrics(),
+            coalesced_requests=engine.recommend_flight.shared_count if engine is not None else 0
+        ),
+        'rate_limit': recommend_rate_limiter.metrics(),
+        'image_cache': image_proxy.stats()
+    })
+
+
+def memory_report() -> dict:
+    """
+    상주 구조체별 메모리 (바이트)
+
+    공유 객체는 먼저 잰 구조체에만 포함된다. 엔진/세션은 카탈로그를 복사하지 않고 참조하므로
+    카탈로그를 먼저 재고, 엔진 항목에는 엔진이 따로 가진 것(정책, 진행 중 요청)만 남는다.
+    """
+    seen = set()
+    structures = {}
+    if dataset is not None:
+        structures['catalog.records'] = {
+            'bytes': deep_sizeof(dataset.records, seen),
+            'items': len(dataset.records),
+            'deleted': dataset.deleted_count
+        }
+        structures['catalog.indexes'] = {
+            'bytes': deep_sizeof([dataset.name_index, dataset.list_order, dataset.list_keys], seen),
+            'items': len(dataset.name_index)
+        }
+        structures['catalog.cold_store'] = dict(dataset.cold.memory_usage(), bytes=deep_sizeof(dataset.cold, seen))
+    if engine is not None:
+        structures['scoring_rules'] = {
+            'bytes': deep_sizeof([compile_score_tables(policy.score_tables)
+                                  for policy in engine.policies.policies.values()], seen)
+        }
+        structures['engine'] = {
+            'bytes': deep_sizeof(engine, seen),
+            'recommend_in_flight': engine.recommend_flight.in_flight()
+        }
+    structures['caches.scoring_sessions'] = {
+        'bytes': deep_sizeof(scoring_sessions, seen),
+        'items': len(scoring_sessions.sessions())
+    }
+    image_stats = image_proxy.stats()
+    structures['caches.image_proxy'] = {
+        'bytes': deep_sizeof(image_proxy, seen),
+        'items': image_stats['entries'],
+        'disk_bytes': image_stats['bytes']
+    }
+    return {
+        'process': process_memory(),
+        'structures': structures,
+        'tracing': allocation_tracer.report()
+    }
+
+
+@app.route('/api/debug/memory', methods=['GET'])
+@admin_required
+def debug_memory():
+    """
+    메모리 진단 (관리자)
+
+    ?trace=start[&top=10&frames=1]  요청 단위 할당 추적 시작 (이전 집계 초기화)
+    ?trace=stop                     추적 중지 (집계는 계속 조회 가능)
+    """
+    query, errors = decode_memory_query(request.args)
+    if errors:
+        return jsonify({
+            'error': {
+                'code': 'INVALID_INPUT',
+                'message': '입력 값이 유효하지 않습니다',
+                'details': errors
+            }
+        }), 400
+    
+    if query.get('trace') == 'start':
+        allocation_tracer.start(query['top'], query['frames'])
+    elif query.get('trace') == 'stop':
+        allocation_tracer.stop()
+    return jsonify(memory_report())
+
+
 @app.route('/api/dataset/info', methods=['GET'])
 def get_dataset_info():
     """데이터셋 정보 조회"""
@@ -315,7 +976,7 @@ def get_dataset_info():
     try:
         return jsonify({
             'total_species': len(dataset),
-            'species_types': dataset['종류'].value_counts().to_dict(),
+            'species_types': dataset.value_counts('종류'),
             'warnings': dataset_warnings
         })
     except Exception as e:
@@ -329,16 +990,13 @@ def get_dataset_info():
 
 
 if __name__ == '__main__':
-    # 데이터 초기화
-    if not init_data():
-        print("데이터 초기화 실패. 서버를 시작할 수 없습니다.")
-        exit(1)
-    
     # 환경 변수에서 설정 읽기
     host = os.getenv('FLASK_HOST', '0.0.0.0')
     port = int(os.getenv('FLASK_PORT', 5000))
     debug = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
     
+    # 포트를 먼저 열고 데이터 로드/예열은 백그라운드에서 (/api/health/ready로 확인)
+    threading.Thread(target=prepare_server, daemon=True).start()
+    
     print(f"서버 시작: http://{host}:{port}")
     app.run(host=host, port=port, debug=debug)
-
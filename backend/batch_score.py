@@ -0,0 +1,333 @@
+"""
+오프라인 일괄 점수 계산 CLI
+
+설문 응답 내보내기(JSONL/CSV)를 스트리밍으로 읽어 프로세스 풀에 나눠 점수를 계산하고,
+응답별 상위 N개 추천을 입력 순서대로 JSONL로 기록한다.
+
+    python batch_score.py responses.jsonl results.jsonl --snapshot catalog.json --workers 8
+    python batch_score.py responses.jsonl results.jsonl --snapshot catalog.json --resume
+
+입력 형식:
+  JSONL  한 줄에 {"id": ..., "preferences": {...}} 또는 선호도 객체 하나
+  CSV    선호도 필드명을 컬럼으로 사용 (목록 값은 '|'로 구분, id 컬럼은 응답 ID)
+
+워커마다 엔진을 한 번만 로드하며, 처리 중인 배치 수를 제한해 입력 크기와 무관하게
+메모리 사용량이 일정하다. 배치를 기록할 때마다 체크포인트를 남겨 --resume으로 이어서 실행한다.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from catalog import SpeciesCatalog, load_snapshot
+from recommendation_engine import DEFAULT_POLICY, RecommendationEngine
+from request_schema import PREFERENCES_SCHEMA, decode_preferences
+from scoring_policy import PolicyRegistry
+
+
+# (입력 내 순번, 원본 레코드) - JSONL은 줄 문자열, CSV는 행 딕셔너리
+InputRecord = Tuple[int, Any]
+
+# CSV 셀 변환에 쓰는 선호도 필드 종류
+_FIELD_KINDS = {field.name: field.kind for field in PREFERENCES_SCHEMA.fields}
+
+# 워커 프로세스마다 한 번 로드하는 엔진
+_engine: Optional[RecommendationEngine] = None
+
+
+def load_engine(snapshot_path: Optional[str], data_path: Optional[str],
+                policies_path: Optional[str]) -> RecommendationEngine:
+    """
+    엔진 로드 (스냅샷이 있으면 pandas 없이 로드)
+    """
+    if snapshot_path:
+        catalog, _ = load_snapshot(snapshot_path)
+    else:
+        from file_utils import find_data_file
+        from data_loader import load_and_validate_data
+
+        file_path = data_path or find_data_file()
+        df, _ = load_and_validate_data(file_path)
+        catalog = SpeciesCatalog.from_dataframe(df, source=file_path)
+
+    return RecommendationEngine(catalog, load_policies(policies_path))
+
+
+def load_policies(policies_path: Optional[str]) -> PolicyRegistry:
+    """점수 정책 로드 (파일이 없으면 기본 정책 하나)"""
+    if policies_path:
+        return PolicyRegistry.from_file(policies_path, DEFAULT_POLICY)
+    return PolicyRegistry.single(DEFAULT_POLICY)
+
+
+def _init_worker(snapshot_path: Optional[str], data_path: Optional[str], policies_path: Optional[str]) -> None:
+    global _engine
+    _engine = load_engine(snapshot_path, data_path, policies_path)
+
+
+def _parse_csv_cell(field: str, text: str) -> Any:
+    """CSV 셀 문자열을 선호도 값으로 변환 (변환할 수 없으면 원문을 두고 스키마 검증에 맡김)"""
+    kind = _FIELD_KINDS.get(field)
+    if kind in ('type_list', 'str_list'):
+        return [item.strip() for item in text.split('|') if item.strip()]
+    if kind == 'grade':
+        try:
+            return int(text)
+        except ValueError:
+            return text
+    if kind == 'weight_map':
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+    return text
+
+
+def _parse_record(record_no: int, raw: Any) -> Tuple[Any, Any]:
+    """
+    원본 레코드를 (응답 ID, 요청 본문)으로 변환
+
+    JSONL 줄 파싱에 실패하면 요청 본문 자리에 오류 메시지 목록을 돌려준다.
+    """
+    if isinstance(raw, dict):
+        response_id = raw.get('id') or record_no
+        preferences = {
+            field: _parse_csv_cell(field, value.strip())
+            for field, value in raw.items()
+            if field in _FIELD_KINDS and value is not None and value.strip() != ''
+        }
+        return response_id, {'preferences': preferences}
+
+    try:
+        obj = json.loads(raw)
+    except ValueError as e:
+        return record_no, [f"JSON 파싱 실패: {e}"]
+    if not isinstance(obj, dict):
+        return record_no, ["각 줄은 JSON 객체여야 합니다"]
+    response_id = obj.get('id', record_no)
+    if 'preferences' not in obj:
+        obj = {'preferences': {key: value for key, value in obj.items() if key != 'id'}}
+    return response_id, obj
+
+
+def _score_batch(batch: List[InputRecord], options: Dict[str, Any]) -> Tuple[List[str], int]:
+    """
+    워커에서 배치 하나 점수 계산
+
+    Returns:
+        (출력 JSONL 줄 목록, 오류 건수)
+    """
+    lines = []
+    error_count = 0
+    for record_no, raw in batch:
+        response_id, body = _parse_record(record_no, raw)
+        if isinstance(body, list):
+            preferences, errors = None, body
+        else:
+            preferences, errors = decode_preferences(body)
+
+        result = None
+        if not errors:
+            # 정책을 지정하지 않으면 응답 ID로 트래픽 분할 (같은 응답자는 같은 정책)
+            try:
+                result = _engine.recommend(preferences, dict(options, policy_key=str(response_id)))
+            except Exception as e:
+                # 한 응답의 계산 오류로 전체 작업이 멈추지 않게 해당 줄에 오류로 기록
+                errors = [f"점수 계산 실패: {type(e).__name__}: {e}"]
+
+        if errors:
+            error_count += 1
+            out = {'id': response_id, 'record': record_no, 'errors': errors}
+        else:
+            out = {
+                'id': response_id,
+                'record': record_no,
+                'scoring_policy_version': result['scoring_policy_version'],
+                'results': result['results']
+            }
+        lines.append(json.dumps(out, ensure_ascii=False, separators=(',', ':')) + '\n')
+    return lines, error_count
+
+
+def read_records(path: str, input_format: str) -> Iterator[InputRecord]:
+    """입력 파일을 한 레코드씩 읽음 (빈 줄은 건너뜀, 순번은 1부터)"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if input_format == 'csv':
+            for record_no, row in enumerate(csv.DictReader(f), start=1):
+                yield record_no, row
+        else:
+            record_no = 0
+            for line in f:
+                if line.strip():
+                    record_no += 1
+                    yield record_no, line
+
+
+def _batched(records: Iterator[InputRecord], batch_size: int) -> Iterator[List[InputRecord]]:
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _load_checkpoint(path: str, input_path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if os.path.abspath(checkpoint['input']) != os.path.abspath(input_path):
+        raise ValueError(f"체크포인트의 입력 파일이 다릅니다: {checkpoint['input']}")
+    return checkpoint
+
+
+def _save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    """임시 파일에 쓴 뒤 교체 (중단되어도 이전 체크포인트가 남음)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    일괄 점수 계산 실행
+
+    Returns:
+        처리량 보고서 딕셔너리
+    """
+    input_format = args.format or ('csv' if args.input.lower().endswith('.csv') else 'jsonl')
+    checkpoint_path = args.checkpoint or args.output + '.ckpt'
+    options = {'top_n': args.top_n, 'include_reasons': args.include_reasons}
+    if args.policy:
+        options['scoring_policy'] = args.policy
+
+    records_done = 0
+    error_count = 0
+    output_bytes = 0
+    previous_elapsed = 0.0
+    if args.resume and os.path.exists(checkpoint_path):
+        checkpoint = _load_checkpoint(checkpoint_path, args.input)
+        records_done = checkpoint['records_done']
+        error_count = checkpoint['errors']
+        output_bytes = checkpoint['output_bytes']
+        previous_elapsed = checkpoint.get('elapsed_seconds', 0.0)
+    resumed_from = records_done
+
+    workers = args.workers or os.cpu_count() or 1
+    max_pending = workers * 4
+    started = time.perf_counter()
+    last_progress = started
+
+    def elapsed() -> float:
+        return previous_elapsed + time.perf_counter() - started
+
+    # 체크포인트 이후 기록된 부분은 버리고 이어 쓴다
+    if output_bytes and os.path.getsize(args.output) < output_bytes:
+        raise ValueError(f"출력 파일이 체크포인트보다 짧습니다: {args.output}")
+    mode = 'r+b' if output_bytes else 'wb'
+    with open(args.output, mode) as out:
+        out.seek(output_bytes)
+        out.truncate()
+
+        def write_batch(future) -> None:
+            nonlocal records_done, error_count, output_bytes, last_progress
+            lines, batch_errors = future.result()
+            data = ''.join(lines).encode('utf-8')
+            out.write(data)
+            out.flush()
+            records_done += len(lines)
+            error_count += batch_errors
+            output_bytes += len(data)
+            _save_checkpoint(checkpoint_path, {
+                'input': args.input,
+                'output': args.output,
+                'records_done': records_done,
+                'errors': error_count,
+                'output_bytes': output_bytes,
+                'elapsed_seconds': elapsed()
+            })
+            now = time.perf_counter()
+            if now - last_progress >= args.progress_interval:
+                last_progress = now
+                rate = (records_done - resumed_from) / max(now - started, 1e-9)
+                print(f"처리 {records_done}건 (오류 {error_count}건), {rate:.0f}건/초", file=sys.stderr)
+
+        records = islice(read_records(args.input, input_format), records_done, None)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(args.snapshot, args.data, args.policies)
+        ) as pool:
+            # 완료 순서와 무관하게 제출 순서대로 기록하고, 대기 중인 배치 수를 제한
+            pending = deque()
+            for batch in _batched(records, args.batch_size):
+                pending.append(pool.submit(_score_batch, batch, options))
+                if len(pending) >= max_pending:
+                    write_batch(pending.popleft())
+            while pending:
+                write_batch(pending.popleft())
+
+    run_seconds = time.perf_counter() - started
+    processed = records_done - resumed_from
+    return {
+        'input': args.input,
+        'output': args.output,
+        'records': records_done,
+        'errors': error_count,
+        'resumed_from': resumed_from,
+        'processed_this_run': processed,
+        'elapsed_seconds': round(run_seconds, 3),
+        'records_per_second': round(processed / run_seconds, 1) if run_seconds > 0 else 0.0,
+        'workers': workers,
+        'batch_size': args.batch_size
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='설문 응답 일괄 추천 점수 계산')
+    parser.add_argument('input', help='설문 응답 파일 (JSONL 또는 CSV)')
+    parser.add_argument('output', help='결과 JSONL 경로')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='입력 형식 (기본: 확장자로 판단)')
+    parser.add_argument('--snapshot', help='카탈로그 스냅샷 경로 (권장: 워커가 pandas 없이 빠르게 로드)')
+    parser.add_argument('--data', help='원본 CSV/Excel 경로 (스냅샷이 없을 때, 기본: find_data_file 우선순위)')
+    parser.add_argument('--policies', help='점수 정책 파일 (기본: SCORING_POLICIES_FILE)',
+                        default=os.getenv('SCORING_POLICIES_FILE'))
+    parser.add_argument('--policy', help='모든 응답에 사용할 정책 이름 (기본: 응답 ID로 트래픽 분할)')
+    parser.add_argument('--top-n', type=int, default=10, help='응답별 추천 개수 (기본 10)')
+    parser.add_argument('--include-reasons', action='store_true', help='추천 이유/질문별 기여도 포함')
+    parser.add_argument('--workers', type=int, default=0, help='워커 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--batch-size', type=int, default=500, help='워커에 한 번에 보내는 응답 수 (기본 500)')
+    parser.add_argument('--checkpoint', help='체크포인트 경로 (기본: <output>.ckpt)')
+    parser.add_argument('--resume', action='store_true', help='체크포인트에서 이어서 실행')
+    parser.add_argument('--report', help='처리량 보고서(JSON) 저장 경로')
+    parser.add_argument('--progress-interval', type=float, default=5.0, help='진행 상황 출력 간격(초)')
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.top_n < 1 or args.batch_size < 1:
+        parser.error('--top-n과 --batch-size는 1 이상이어야 합니다')
+    # 워커를 띄우기 전에 정책 이름 확인 (/api/recommend의 choose_policy와 같은 규칙)
+    try:
+        policy_names = load_policies(args.policies).names()
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f'점수 정책 파일을 읽을 수 없습니다: {e}')
+    if args.policy is not None and args.policy not in policy_names:
+        parser.error(f"--policy는 {policy_names} 중 하나여야 합니다")
+
+    report = run(args)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,583 @@
+"""서빙용 종 카탈로그 (pandas 없이 동작)"""
+import base64
+import json
+import math
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+
+from climate_ranges import CLIMATE_RANGE_COLUMNS, IntervalIndex
+from derived_fields import DERIVED_COLUMNS, DERIVED_FIELDS
+from species_resolver import NameMatch, SpeciesResolver
+
+
+# 정수로 보관하는 등급형 컬럼
+GRADE_COLUMNS = [
+    '사육_난이도_5단계',
+    '초기비용_등급_5단계',
+    '성체크기_등급_3단계',
+    '온도습도_5단계',
+    '먹이빈도_등급',
+    '핸들링적합도_5단계',
+    '사육장_사이즈_3단계'
+]
+
+# 점수 계산과 목록/추천 카드에 쓰이는 핫 컬럼 (나머지는 상세 조회 전용 콜드 컬럼)
+# 파생 필드(derived_fields.DERIVED_FIELDS)도 핫 컬럼으로 보관한다.
+# 기후 범위 문자열은 숫자 범위 파생 필드의 입력이라 핫 컬럼에 둔다.
+HOT_COLUMNS = (
+    '종_한글명',
+    '종류',
+    '관상용_애완용',
+    '사육_난이도_5단계',
+    '초기비용_등급_5단계',
+    '성체크기_등급_3단계',
+    '온도습도_5단계',
+    '활동패턴',
+    '식성타입',
+    '먹이빈도_등급',
+    '핸들링적합도_5단계',
+    '사육장_사이즈_3단계',
+    '외형태그',
+    '사진_URL',
+    '사진_페이지_URL'
+) + tuple(CLIMATE_RANGE_COLUMNS) + DERIVED_COLUMNS
+
+# 도감 목록 카드 필드 (fields= 프로젝션으로 고를 수 있는 필드)
+LIST_ITEM_FIELDS = (
+    '종_한글명',
+    '종류',
+    '관상용_애완용',
+    '사육_난이도_5단계',
+    '초기비용_등급_5단계',
+    '사육장_사이즈_3단계',
+    '활동패턴',
+    '식성타입',
+    '외형태그',
+    '사진_URL',
+    '사육_요약'
+)
+
+# 도감 목록 정렬 키 (커서 페이지네이션 기준)
+LIST_SORT_COLUMNS = ('종류', '사육_난이도_5단계', '종_한글명')
+
+SNAPSHOT_FORMAT = 'lizardmatch-catalog'
+SNAPSHOT_VERSION = 3
+
+
+def is_missing(value: Any) -> bool:
+    """결측치 여부 (None 또는 NaN)"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def normalize_species_name(name: str) -> str:
+    """종명 정규화: 모든 공백 제거"""
+    if is_missing(name):
+        return ""
+    return str(name).strip().replace(' ', '').replace('\t', '').replace('\n', '')
+
+
+def list_sort_key(values: Iterable[Any]) -> Tuple[Tuple[bool, Any], ...]:
+    """
+    목록 정렬 값 (종류, 난이도, 종명)을 비교 가능한 정렬 키로 변환
+
+    값마다 (결측 여부, 값)으로 바꿔 결측은 맨 뒤로 보낸다. (pandas sort_values의 NaN 위치와 같음)
+    """
+    return tuple((True, '') if is_missing(value) else (False, value) for value in values)
+
+
+def encode_list_cursor(values: Tuple[Any, ...]) -> str:
+    """목록 정렬 값 (종류, 난이도, 종명)을 URL에 넣을 수 있는 커서 문자열로 인코딩 (결측은 null)"""
+    raw = json.dumps(list(values), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_list_cursor(token: str) -> Optional[Tuple[Optional[str], Optional[int], Optional[str]]]:
+    """커서 문자열을 목록 정렬 값으로 디코딩 (형식이 맞지 않으면 None)"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != 3:
+        return None
+    species_type, difficulty, name = values
+    if (species_type is not None and not isinstance(species_type, str)) \
+            or (difficulty is not None and (not isinstance(difficulty, int) or isinstance(difficulty, bool))) \
+            or (name is not None and not isinstance(name, str)):
+        return None
+    return species_type, difficulty, name
+
+
+def _clean_value(column: str, value: Any) -> Any:
+    """결측치는 None, 등급형 컬럼은 int로 변환"""
+    if is_missing(value):
+        return None
+    if column in GRADE_COLUMNS:
+        return int(value)
+    if hasattr(value, 'item'):
+        # numpy 스칼라 -> 파이썬 기본 타입
+        return value.item()
+    return value
+
+
+class SpeciesRecord:
+    """
+    핫 컬럼만 담는 종 레코드 (__slots__로 딕셔너리보다 작게 보관)
+
+    딕셔너리처럼 record['컬럼'], record.get('컬럼', 기본값)으로 읽는다.
+    데이터셋에 없는 컬럼은 값이 설정되지 않아 get()이 기본값을 돌려준다.
+    """
+    __slots__ = HOT_COLUMNS
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in HOT_COLUMNS and hasattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {column: getattr(self, column) for column in HOT_COLUMNS if hasattr(self, column)}
+
+
+class ColdStore:
+    """
+    상세 조회 전용 콜드 컬럼 저장소
+
+    행마다 JSON 배열로 인코딩한 바이트를 한 버퍼에 이어 붙이고 오프셋만 메모리에 둔다.
+    버퍼는 bytes(원본 파일 로드 시) 또는 스냅샷 사이드카 파일의 mmap이며,
+    행은 조회할 때만 디코딩한다. 로드 후 바뀌거나 추가된 행은 버퍼 대신 _overrides에 둔다.
+    """
+
+    def __init__(self, columns: List[str], buffer: Union[bytes, mmap.mmap], offsets: array):
+        self.columns = list(columns)
+        self._buffer = buffer
+        # offsets[i]..offsets[i + 1]이 i번째 행
+        self._offsets = offsets
+        # 행 인덱스 -> 인코딩된 행 (관리자 변경분)
+        self._overrides: Dict[int, bytes] = {}
+
+    @staticmethod
+    def encode_row(values: List[Any]) -> bytes:
+        return json.dumps(values, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def from_rows(cls, columns: List[str], rows: Iterable[List[Any]]) -> 'ColdStore':
+        """행 값 목록으로 메모리 버퍼 생성"""
+        chunks = []
+        offsets = array('Q', [0])
+        for values in rows:
+            encoded = cls.encode_row(values)
+            chunks.append(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+        return cls(columns, b''.join(chunks), offsets)
+
+    @classmethod
+    def open_file(cls, path: str, columns: List[str], offsets: List[int]) -> 'ColdStore':
+        """스냅샷 사이드카 파일을 mmap으로 연결 (읽은 페이지만 메모리에 올라감)"""
+        if os.path.getsize(path) == 0:
+            return cls(columns, b'', array('Q', offsets))
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(columns, buffer, array('Q', offsets))
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, max(self._overrides, default=-1) + 1)
+
+    def _row_bytes(self, index: int) -> bytes:
+        encoded = self._overrides.get(index)
+        if encoded is None:
+            encoded = self._buffer[self._offsets[index]:self._offsets[index + 1]]
+        return encoded
+
+    def get(self, index: int) -> Dict[str, Any]:
+        """index번째 행의 콜드 컬럼 딕셔너리"""
+        if not self.columns:
+            return {}
+        return dict(zip(self.columns, json.loads(self._row_bytes(index))))
+
+    def set(self, index: int, values: List[Any]) -> None:
+        """index번째 행을 바꾸거나 (index == len이면) 추가"""
+        self._overrides[index] = self.encode_row(values)
+
+    def saved_row(self, index: int) -> Optional[bytes]:
+        """index번째 행의 변경분 (없으면 None), 실패한 변경을 되돌릴 때 restore_row에 넘긴다"""
+        return self._overrides.get(index)
+
+    def restore_row(self, index: int, encoded: Optional[bytes]) -> None:
+        """saved_row로 받아 둔 상태로 되돌림 (None이면 변경분 삭제)"""
+        if encoded is None:
+            self._overrides.pop(index, None)
+        else:
+            self._overrides[index] = encoded
+
+    def write(self, path: str, indices: Optional[List[int]] = None) -> List[int]:
+        """
+        행을 파일로 저장하고 오프셋 반환
+
+        indices를 지정하면 그 행만 순서대로 저장한다 (삭제된 행을 뺀 스냅샷).
+        """
+        if indices is None and not self._overrides:
+            with open(path, 'wb') as f:
+                f.write(self._buffer[:self._offsets[-1]])
+            return list(self._offsets)
+
+        offsets = [0]
+        with open(path, 'wb') as f:
+            for index in (range(len(self)) if indices is None else indices):
+                encoded = self._row_bytes(index)
+                f.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+        return offsets
+
+    @property
+    def nbytes(self) -> int:
+        return self._offsets[-1] + sum(len(encoded) for encoded in self._overrides.values())
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """버퍼/오프셋/변경분 크기 (mmap 버퍼는 파일 기반이라 읽은 페이지만 상주)"""
+        return {
+            'buffer_bytes': self._offsets[-1],
+            'file_backed': isinstance(self._buffer, mmap.mmap),
+            'offsets_bytes': self._offsets.itemsize * len(self._offsets),
+            'override_bytes': sum(len(encoded) for encoded in self._overrides.values())
+        }
+
+
+def _make_record(hot_columns: List[str], values: List[Any]) -> SpeciesRecord:
+    record = SpeciesRecord()
+    for column, value in zip(hot_columns, values):
+        # 반복되는 범주형 문자열은 하나의 객체를 공유
+        setattr(record, column, sys.intern(value) if isinstance(value, str) else value)
+    return record
+
+
+def materialize_derived_fields(record: SpeciesRecord, refresh: bool = False) -> None:
+    """파생 필드가 없으면(refresh=True면 항상) 계산해서 레코드에 저장"""
+    for column, derive in DERIVED_FIELDS:
+        if refresh or not hasattr(record, column):
+            value = derive(record)
+            setattr(record, column, sys.intern(value) if isinstance(value, str) else value)
+
+
+class SpeciesCatalog:
+    """
+    검증이 끝난 종 데이터의 읽기 전용 카탈로그
+
+    records: 점수 계산/목록용 핫 레코드 (SpeciesRecord, 결측치는 None, 파생 필드 포함)
+             관리자 API로 삭제된 종은 None으로 남겨 다른 종의 인덱스를 유지한다 (톰스톤).
+    cold: 상세 조회 전용 콜드 컬럼 (get_detail에서만 읽음)
+    columns: 원본 데이터 컬럼 (파생 필드 제외)
+
+    insert/update/delete는 레코드, 이름 인덱스, 목록 정렬 인덱스, 기후 범위 구간 인덱스,
+    종명 유사 검색 색인을 모두 바뀐 레코드만큼 제자리에서 갱신한다.
+    검증과 동시 실행 제어는 호출자(catalog_changes.CatalogEditor) 책임이다.
+    """
+
+    def __init__(self, columns: List[str], records: List[SpeciesRecord], cold: ColdStore, source: str = ''):
+        self.columns = list(columns)
+        self.hot_columns = [column for column in self.columns if column in HOT_COLUMNS]
+        self.records = records
+        # 파생 필드 단계: 데이터셋 버전당 한 번만 계산 (스냅샷에는 계산된 값이 저장됨)
+        for record in records:
+            materialize_derived_fields(record)
+        self.cold = cold
+        self.source = source
+        self.deleted_count = 0
+        # insert/update/delete마다 증가 (변경 전에 시작한 계산 결과를 구분하는 용도)
+        self.revision = 0
+        # 정규화된 종명 -> 레코드 인덱스
+        self.name_index: Dict[str, int] = {}
+        for i, record in enumerate(records):
+            self.name_index.setdefault(normalize_species_name(record['종_한글명']), i)
+        # 도감 목록 정렬 순서 (레코드 인덱스)와 같은 순서의 정렬 키
+        self.list_order = sorted(range(len(records)), key=lambda i: self.list_key(i))
+        self.list_keys = [self.list_key(i) for i in self.list_order]
+        # 원본 컬럼 -> 기후 범위 구간 인덱스
+        self.climate_indexes: Dict[str, IntervalIndex] = {}
+        for column in CLIMATE_RANGE_COLUMNS:
+            intervals = []
+            for i, record in enumerate(records):
+                bounds = self._climate_bounds(record, column) if record is not None else None
+                if bounds is not None:
+                    intervals.append((bounds[0], bounds[1], i))
+            self.climate_indexes[column] = IntervalIndex(intervals)
+        # 종명 유사 검색 색인 (종명 + 별칭)
+        self.resolver = SpeciesResolver(
+            (i, record['종_한글명']) for i, record in enumerate(records) if record is not None
+        )
+
+    def __len__(self) -> int:
+        return len(self.records) - self.deleted_count
+
+    @classmethod
+    def from_rows(cls, columns: List[str], rows: Iterable[List[Any]], source: str = '') -> 'SpeciesCatalog':
+        """컬럼 목록과 행 배열로 생성 (핫/콜드 컬럼 분리)"""
+        columns = list(columns)
+        hot_positions = [i for i, column in enumerate(columns) if column in HOT_COLUMNS]
+        cold_positions = [i for i, column in enumerate(columns) if column not in HOT_COLUMNS]
+        hot_columns = [columns[i] for i in hot_positions]
+
+        records = []
+        cold_rows = []
+        for row in rows:
+            values = [_clean_value(column, value) for column, value in zip(columns, row)]
+            records.append(_make_record(hot_columns, [values[i] for i in hot_positions]))
+            cold_rows.append([values[i] for i in cold_positions])
+
+        cold = ColdStore.from_rows([columns[i] for i in cold_positions], cold_rows)
+        return cls(columns, records, cold, source)
+
+    @classmethod
+    def from_dataframe(cls, df, source: str = '') -> 'SpeciesCatalog':
+        """검증된 DataFrame으로 생성 (pandas는 호출자 쪽에서만 필요)"""
+        columns = [str(column) for column in df.columns]
+        return cls.from_rows(columns, df.itertuples(index=False, name=None), source)
+
+    def find_index(self, species_name: str) -> Optional[int]:
+        """종명(또는 공백을 제거한 종명)으로 레코드 인덱스 조회"""
+        return self.name_index.get(normalize_species_name(species_name))
+
+    def find_by_name(self, species_name: str) -> Optional[SpeciesRecord]:
+        """종명(또는 공백을 제거한 종명)으로 핫 레코드 조회"""
+        index = self.find_index(species_name)
+        if index is None:
+            return None
+        return self.records[index]
+
+    def resolve_name(self, species_name: str, limit: int = 5) -> NameMatch:
+        """
+        종명 해석: 정확한 종명(공백 무시) → 별칭 → 오타 유사 검색
+
+        해석하지 못하면 index가 None이고 suggestions에 비슷한 종명을 유사도 순으로 담는다.
+        """
+        index = self.find_index(species_name)
+        if index is not None:
+            return NameMatch(index, 'exact', [])
+        return self.resolver.resolve(species_name, limit)
+
+    def list_values(self, index: int) -> Tuple[Any, ...]:
+        """도감 목록 정렬 값 (종류, 난이도, 종명), 커서에 담는 값"""
+        record = self.records[index]
+        return tuple(record[column] for column in LIST_SORT_COLUMNS)
+
+    def list_key(self, index: int) -> Tuple[Tuple[bool, Any], ...]:
+        """도감 목록 정렬 키 (list_sort_key 형식)"""
+        return list_sort_key(self.list_values(index))
+
+    def list_position_after(self, values: Tuple[Any, ...]) -> int:
+        """정렬 값이 values보다 뒤인 첫 목록 위치 (커서 다음 페이지 시작점)"""
+        return bisect_right(self.list_keys, list_sort_key(values))
+
+    @staticmethod
+    def _climate_bounds(record: SpeciesRecord, column: str) -> Optional[Tuple[Any, Any]]:
+        """레코드의 기후 범위 (최저, 최고), 한쪽이라도 없으면 None"""
+        min_column, max_column, _ = CLIMATE_RANGE_COLUMNS[column]
+        low, high = record.get(min_column), record.get(max_column)
+        if low is None or high is None:
+            return None
+        return low, high
+
+    def climate_index(self, column: str) -> IntervalIndex:
+        """기후 범위 컬럼의 구간 인덱스"""
+        return self.climate_indexes[column]
+
+    def climate_filter(
+        self,
+        ranges: List[Tuple[str, Optional[float], Optional[float]]],
+        contains: bool = False,
+        after: Optional[Tuple[Any, ...]] = None
+    ) -> List[int]:
+        """
+        기후 범위 조건 (원본 컬럼, 최저, 최고)을 모두 만족하는 레코드 인덱스 (도감 목록 순서)
+
+        기본은 종의 범위가 [최저, 최고]와 겹치면 통과, contains=True면 종의 범위가 조건 범위를
+        모두 포함해야 통과한다. 범위 값이 없는 종은 해당 조건에서 빠진다.
+        after(목록 정렬 값)가 있으면 목록 순서에서 after보다 뒤인 항목만 (커서 다음 페이지).
+        """
+        candidates: Optional[set] = None
+        for column, low, high in ranges:
+            index = self.climate_index(column)
+            matched = index.containing(low, high) if contains else index.overlapping(low, high)
+            candidates = set(matched) if candidates is None else candidates.intersection(matched)
+            if not candidates:
+                return []
+        keyed = sorted((self.list_key(i), i) for i in candidates or ())
+        if after is not None:
+            keyed = keyed[bisect_right(keyed, (list_sort_key(after), math.inf)):]
+        return [i for _, i in keyed]
+
+    def _add_to_indexes(self, index: int) -> None:
+        record = self.records[index]
+        self.name_index.setdefault(normalize_species_name(record['종_한글명']), index)
+        key = self.list_key(index)
+        position = bisect_right(self.list_keys, key)
+        self.list_keys.insert(position, key)
+        self.list_order.insert(position, index)
+        for column, climate_index in self.climate_indexes.items():
+            bounds = self._climate_bounds(record, column)
+            if bounds is not None:
+                climate_index.add(bounds[0], bounds[1], index)
+        self.resolver.add(index, record['종_한글명'])
+
+    def _remove_from_indexes(self, index: int, record: SpeciesRecord) -> None:
+        """record(index 위치의 현재 또는 이전 값)를 인덱스에서 제거 (없는 항목은 건너뜀, 롤백에서도 씀)"""
+        name = normalize_species_name(record['종_한글명'])
+        if self.name_index.get(name) == index:
+            del self.name_index[name]
+        key = list_sort_key(record[column] for column in LIST_SORT_COLUMNS)
+        for position in range(bisect_left(self.list_keys, key), bisect_right(self.list_keys, key)):
+            if self.list_order[position] == index:
+                del self.list_keys[position]
+                del self.list_order[position]
+                break
+        for climate_index in self.climate_indexes.values():
+            climate_index.remove(index)
+        self.resolver.remove(index, record['종_한글명'])
+
+    def _split_values(self, values: Dict[str, Any]) -> Tuple[SpeciesRecord, List[Any]]:
+        """전체 컬럼 값을 (파생 필드를 계산한 핫 레코드, 콜드 행 값)으로 분리"""
+        cleaned = {column: _clean_value(column, values.get(column)) for column in self.columns}
+        record = _make_record(self.hot_columns, [cleaned[column] for column in self.hot_columns])
+        materialize_derived_fields(record)
+        return record, [cleaned[column] for column in self.cold.columns]
+
+    def _prepare(self, values: Dict[str, Any]) -> Tuple[SpeciesRecord, List[Any]]:
+        """변경 전 준비: 레코드를 만들고 목록 정렬 키가 기존 키와 비교되는지 먼저 확인 (실패해도 상태는 그대로)"""
+        record, cold_values = self._split_values(values)
+        bisect_right(self.list_keys, list_sort_key(record[column] for column in LIST_SORT_COLUMNS))
+        return record, cold_values
+
+    def _rollback(self, index: int, old_record: Optional[SpeciesRecord], record: SpeciesRecord,
+                  previous_cold: Optional[bytes]) -> None:
+        """도중에 실패한 insert/update 되돌리기: 새 값을 인덱스에서 빼고 이전 레코드/콜드 행을 복원"""
+        self._remove_from_indexes(index, record)
+        if old_record is not None:
+            self._remove_from_indexes(index, old_record)
+        self.cold.restore_row(index, previous_cold)
+        if old_record is None:
+            del self.records[index:]
+        else:
+            self.records[index] = old_record
+            self._add_to_indexes(index)
+
+    def insert(self, values: Dict[str, Any]) -> int:
+        """종 추가 후 새 인덱스 반환 (실패하면 아무것도 바꾸지 않음)"""
+        record, cold_values = self._prepare(values)
+        index = len(self.records)
+        try:
+            self.cold.set(index, cold_values)
+            self.records.append(record)
+            self._add_to_indexes(index)
+        except BaseException:
+            self._rollback(index, None, record, None)
+            raise
+        self.revision += 1
+        return index
+
+    def update(self, index: int, values: Dict[str, Any]) -> SpeciesRecord:
+        """
+        종 전체 값을 교체하고 이전 레코드 반환 (실패하면 이전 상태로 되돌림)
+
+        레코드는 새 객체로 바꿔 끼우므로 동시에 읽는 요청은 이전 값 또는 새 값 중 하나만 본다.
+        """
+        old_record = self.records[index]
+        record, cold_values = self._prepare(values)
+        previous_cold = self.cold.saved_row(index)
+        try:
+            self.cold.set(index, cold_values)
+            self._remove_from_indexes(index, old_record)
+            self.records[index] = record
+            self._add_to_indexes(index)
+        except BaseException:
+            self._rollback(index, old_record, record, previous_cold)
+            raise
+        self.revision += 1
+        return old_record
+
+    def delete(self, index: int) -> SpeciesRecord:
+        """종 삭제 (톰스톤) 후 이전 레코드 반환"""
+        old_record = self.records[index]
+        self._remove_from_indexes(index, old_record)
+        self.records[index] = None
+        self.deleted_count += 1
+        self.revision += 1
+        return old_record
+
+    def get_detail(self, index: int, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        핫 + 콜드 컬럼을 합친 상세 정보 (기본: 원본 컬럼 순서의 전체 컬럼)
+
+        fields를 지정하면 그 컬럼만 돌려주며, 모두 핫 컬럼이면 콜드 저장소를 읽지 않는다.
+        """
+        columns = fields or self.columns
+        merged = self.records[index].to_dict()
+        if any(column not in merged for column in columns):
+            merged.update(self.cold.get(index))
+        return {column: merged.get(column) for column in columns}
+
+    def value_counts(self, column: str) -> Dict[Any, int]:
+        """컬럼 값별 개수"""
+        return dict(Counter(record.get(column) for record in self.records if record is not None).most_common())
+
+
+def save_snapshot(catalog: SpeciesCatalog, path: str, warnings_list: List[str]) -> None:
+    """
+    카탈로그를 서빙용 스냅샷으로 저장
+
+    핫 컬럼은 JSON(path)에, 콜드 컬럼은 사이드카 파일(path + '.cold')에 저장한다.
+    """
+    cold_path = path + '.cold'
+    # 삭제된 종(톰스톤)은 빼고 저장
+    live = [i for i, record in enumerate(catalog.records) if record is not None]
+    cold_offsets = catalog.cold.write(cold_path, live if catalog.deleted_count else None)
+    # 파생 필드도 함께 저장해 로드 시 다시 계산하지 않음
+    stored_columns = catalog.hot_columns + [c for c in DERIVED_COLUMNS if c not in catalog.hot_columns]
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'source': catalog.source,
+        'columns': catalog.columns,
+        'hot_columns': stored_columns,
+        'rows': [[catalog.records[i].get(column) for column in stored_columns] for i in live],
+        'cold_columns': catalog.cold.columns,
+        'cold_file': os.path.basename(cold_path),
+        'cold_offsets': cold_offsets,
+        'warnings': warnings_list
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_snapshot(path: str) -> Tuple[SpeciesCatalog, List[str]]:
+    """
+    스냅샷을 로드 (콜드 컬럼은 mmap으로 연결만 하고 읽지 않음)
+
+    Returns:
+        (SpeciesCatalog, warnings): 카탈로그와 스냅샷 생성 시점의 경고 목록
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+
+    if snapshot.get('format') != SNAPSHOT_FORMAT or snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {path}")
+
+    hot_columns = snapshot['hot_columns']
+    records = [
+        _make_record(hot_columns, [_clean_value(column, value) for column, value in zip(hot_columns, row)])
+        for row in snapshot['rows']
+    ]
+    cold_path = os.path.join(os.path.dirname(os.path.abspath(path)), snapshot['cold_file'])
+    cold = ColdStore.open_file(cold_path, snapshot['cold_columns'], snapshot['cold_offsets'])
+    catalog = SpeciesCatalog(snapshot['columns'], records, cold, snapshot.get('source', ''))
+    return catalog, snapshot.get('warnings', [])
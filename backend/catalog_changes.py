@@ -0,0 +1,152 @@
+"""관리자 API의 종 단위 카탈로그 변경과 추가 전용 변경 로그"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from catalog import SpeciesCatalog, SpeciesRecord, normalize_species_name
+from species_validation import validate_species_values
+
+
+class CatalogChangeError(Exception):
+    """변경을 적용할 수 없음 (API 오류 응답으로 변환)"""
+
+    def __init__(self, code: str, status: int, message: str, details: Optional[List[str]] = None):
+        super().__init__(message)
+        self.code = code
+        self.status = status
+        self.message = message
+        self.details = details or []
+
+
+class CatalogChange:
+    """
+    적용된 변경 한 건
+
+    old_record/new_record는 변경 전후 핫 레코드이며 추가면 old_record, 삭제면 new_record가 None이다.
+    호출자는 이것으로 해당 종에 의존하는 캐시 항목만 무효화한다.
+    """
+
+    def __init__(self, op: str, index: int, old_record: Optional[SpeciesRecord],
+                 new_record: Optional[SpeciesRecord]):
+        self.op = op
+        self.index = index
+        self.old_record = old_record
+        self.new_record = new_record
+
+
+class CatalogEditor:
+    """
+    검증 → 카탈로그 제자리 갱신 → 변경 로그 기록
+
+    변경 로그(JSONL)는 추가만 하며, 기동 시 replay()로 원본 데이터/스냅샷 위에 다시 적용한다.
+    changelog_path가 없으면 변경은 메모리에만 반영된다.
+    """
+
+    def __init__(self, catalog: SpeciesCatalog, changelog_path: Optional[str] = None):
+        self.catalog = catalog
+        self.changelog_path = changelog_path
+        self._lock = threading.Lock()
+
+    def _find(self, name: str) -> int:
+        index = self.catalog.find_index(name)
+        if index is None:
+            raise CatalogChangeError('SPECIES_NOT_FOUND', 404, f'종을 찾을 수 없습니다: {name}')
+        return index
+
+    def _validate(
+        self,
+        values: Dict[str, Any],
+        index: Optional[int],
+        changed: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """load_and_validate_data와 같은 규칙 + 정규화한 종명 중복 검사 (changed: 수정한 컬럼만 형식 검사)"""
+        values = dict(values)
+        if '사진_URL' in values and values['사진_URL'] is None:
+            values['사진_URL'] = ''
+        errors = validate_species_values(values, self.catalog.columns, changed)
+        if errors:
+            raise CatalogChangeError('INVALID_INPUT', 400, '입력 값이 유효하지 않습니다', errors)
+        existing = self.catalog.find_index(values['종_한글명'])
+        if existing is not None and existing != index:
+            raise CatalogChangeError(
+                'SPECIES_ALREADY_EXISTS', 409,
+                f"같은 종명(공백 무시)이 이미 있습니다: {normalize_species_name(values['종_한글명'])}"
+            )
+        return values
+
+    def _append_log(self, entry: Dict[str, Any]) -> None:
+        if not self.changelog_path:
+            return
+        entry = dict(entry, at=datetime.now().isoformat(timespec='seconds'))
+        with open(self.changelog_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _apply(self, entry: Dict[str, Any]) -> CatalogChange:
+        op = entry.get('op')
+        if op == 'insert':
+            values = self._validate(entry.get('values') or {}, None)
+            index = self.catalog.insert(values)
+            return CatalogChange(op, index, None, self.catalog.records[index])
+        if op == 'update':
+            index = self._find(entry.get('name'))
+            changes = entry.get('values') or {}
+            values = self.catalog.get_detail(index)
+            values.update(changes)
+            values = self._validate(values, index, changes.keys())
+            old_record = self.catalog.update(index, values)
+            return CatalogChange(op, index, old_record, self.catalog.records[index])
+        if op == 'delete':
+            index = self._find(entry.get('name'))
+            return CatalogChange(op, index, self.catalog.delete(index), None)
+        raise CatalogChangeError('INVALID_INPUT', 400, f'알 수 없는 변경 종류입니다: {op}')
+
+    def apply(self, entry: Dict[str, Any]) -> CatalogChange:
+        """
+        변경 한 건 적용 후 로그 기록
+
+        entry: {'op': 'insert', 'values': {...전체 컬럼}}
+               {'op': 'update', 'name': 종명, 'values': {...바꿀 컬럼}}
+               {'op': 'delete', 'name': 종명}
+        """
+        with self._lock:
+            change = self._apply(entry)
+            self._append_log(entry)
+            return change
+
+    def insert(self, values: Dict[str, Any]) -> CatalogChange:
+        return self.apply({'op': 'insert', 'values': values})
+
+    def update(self, name: str, changes: Dict[str, Any]) -> CatalogChange:
+        return self.apply({'op': 'update', 'name': name, 'values': changes})
+
+    def delete(self, name: str) -> CatalogChange:
+        return self.apply({'op': 'delete', 'name': name})
+
+    def replay(self) -> Tuple[int, List[str]]:
+        """
+        변경 로그를 처음부터 다시 적용 (기동 시, 로그에는 다시 쓰지 않음)
+
+        Returns:
+            (적용 건수, warnings): 적용하지 못한 항목은 경고로 남기고 건너뛴다
+        """
+        if not self.changelog_path or not os.path.exists(self.changelog_path):
+            return 0, []
+        applied = 0
+        warnings_list = []
+        with self._lock, open(self.changelog_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                    applied += 1
+                except CatalogChangeError as e:
+                    detail = f" ({', '.join(e.details)})" if e.details else ''
+                    warnings_list.append(f"변경 로그 {line_no}번째 항목을 적용하지 못했습니다: {e.message}{detail}")
+                except ValueError as e:
+                    warnings_list.append(f"변경 로그 {line_no}번째 항목을 적용하지 못했습니다: {e}")
+        return applied, warnings_list
@@ -0,0 +1,233 @@
+"""
+기후 범위 문자열(온도/습도) 해석과 구간 인덱스
+
+데이터셋의 '22-28°C', '60-80%' 같은 자유 형식 문자열을 (최저, 최고) 숫자 범위로 해석해
+파생 필드(derived_fields)로 보관하고, 도감 목록의 온도/습도 조건은 IntervalIndex로 찾는다.
+"""
+import math
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+
+Number = Union[int, float]
+
+# 원본 컬럼 -> (최저값 파생 컬럼, 최고값 파생 컬럼, 단위)
+CLIMATE_RANGE_COLUMNS: Dict[str, Tuple[str, str, str]] = {
+    '온도_범위_주간': ('주간온도_최저', '주간온도_최고', '°C'),
+    '온도_범위_야간': ('야간온도_최저', '야간온도_최고', '°C'),
+    '바스킹_온도': ('바스킹온도_최저', '바스킹온도_최고', '°C'),
+    '습도_범위': ('습도_최저', '습도_최고', '%'),
+}
+
+# 도감 목록 쿼리 파라미터 접두어 -> 원본 컬럼 (<접두어>_min, <접두어>_max)
+CLIMATE_QUERY_PARAMS: Tuple[Tuple[str, str], ...] = (
+    ('temp', '온도_범위_주간'),
+    ('night_temp', '온도_범위_야간'),
+    ('basking_temp', '바스킹_온도'),
+    ('humidity', '습도_범위'),
+)
+
+# 같은 뜻으로 쓰이는 단위 표기
+_UNIT_ALIASES = {'°C': '°C', '℃': '°C', '°': '°C', 'C': '°C', '%': '%'}
+
+_RANGE_PATTERN = re.compile(
+    r'^\s*(-?\d+(?:\.\d+)?)\s*(?:(?:-|~|–|—)\s*(-?\d+(?:\.\d+)?))?\s*(°C|℃|°|C|%)?\s*$'
+)
+
+
+def _is_missing(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    return isinstance(value, str) and not value.strip()
+
+
+def _number(text: str) -> Number:
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def parse_climate_range(value: Any, unit: Optional[str] = None) -> Optional[Tuple[Number, Number]]:
+    """
+    '22-28°C', '20~24℃', '60-80%', '30°C' 형식을 (최저, 최고)로 해석
+
+    결측이면 None, 해석할 수 없거나 단위가 unit과 다르면 ValueError.
+    최저/최고가 뒤바뀐 값은 정렬해서 돌려준다 (경고는 climate_parse_warnings).
+    """
+    if _is_missing(value):
+        return None
+    match = _RANGE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"범위로 해석할 수 없는 값입니다: {value}")
+    low_text, high_text, unit_text = match.groups()
+    if unit is not None and unit_text is not None and _UNIT_ALIASES[unit_text] != unit:
+        raise ValueError(f"단위가 {unit}이 아닙니다: {value}")
+    low = _number(low_text)
+    high = _number(high_text) if high_text is not None else low
+    return (low, high) if low <= high else (high, low)
+
+
+@lru_cache(maxsize=1024)
+def _cached_range(text: str, unit: str) -> Optional[Tuple[Number, Number]]:
+    try:
+        return parse_climate_range(text, unit)
+    except ValueError:
+        return None
+
+
+def climate_bound(value: Any, unit: str, position: int) -> Optional[Number]:
+    """파생 필드용: 범위의 최저(position=0) 또는 최고(1), 결측/해석 실패는 None"""
+    if _is_missing(value):
+        return None
+    bounds = _cached_range(str(value), unit)
+    return None if bounds is None else bounds[position]
+
+
+def climate_range_errors(values: Mapping[str, Any]) -> List[str]:
+    """종 한 건의 기후 범위 문자열 검증 (관리자 API용 오류 메시지)"""
+    errors = []
+    for column, (_, _, unit) in CLIMATE_RANGE_COLUMNS.items():
+        if column not in values:
+            continue
+        try:
+            parse_climate_range(values[column], unit)
+        except ValueError as e:
+            errors.append(f"{column}: {e}")
+    return errors
+
+
+def climate_parse_warnings(columns: Mapping[str, Iterable[Any]]) -> List[str]:
+    """
+    컬럼별 해석 품질 경고 (dataset_warnings에 합침)
+
+    해석할 수 없는 값은 결측으로 취급하고, 최저/최고가 뒤바뀐 값은 정렬해서 쓴다.
+    """
+    warnings_list = []
+    for column, values in columns.items():
+        if column not in CLIMATE_RANGE_COLUMNS:
+            continue
+        unit = CLIMATE_RANGE_COLUMNS[column][2]
+        invalid = []
+        swapped = 0
+        for value in values:
+            try:
+                parse_climate_range(value, unit)
+            except ValueError:
+                invalid.append(str(value))
+                continue
+            match = _RANGE_PATTERN.match(str(value)) if not _is_missing(value) else None
+            if match and match.group(2) is not None and float(match.group(1)) > float(match.group(2)):
+                swapped += 1
+        if invalid:
+            warnings_list.append(
+                f"{column}: 범위로 해석할 수 없는 값이 {len(invalid)}개 있습니다. "
+                f"결측으로 처리합니다. (예: {invalid[:3]})"
+            )
+        if swapped:
+            warnings_list.append(f"{column}: 최저/최고가 뒤바뀐 값이 {swapped}개 있습니다. 정렬해서 사용합니다.")
+    return warnings_list
+
+
+class IntervalIndex:
+    """
+    구간 인덱스 (구간 → 레코드 인덱스)
+
+    구간을 시작값 순으로 정렬하고, 그 순서 위에 끝값 최댓값 세그먼트 트리를 둔다.
+    query(start_max, end_min)은 start <= start_max인 앞부분에서 끝값이 end_min 이상인
+    구간만 트리를 따라 내려가 찾으므로 결과 k개에 O(log n + k log n)이다.
+
+    add/remove는 정렬 배열을 다시 만들지 않고 작은 변경분(추가 구간, 삭제 표시)에 모아 두고
+    조회 때 함께 본다. 변경분이 sqrt(n)을 넘으면 그때 한 번 다시 정렬한다.
+    상태는 통째로 바꿔 끼우므로 조회는 잠금 없이 변경 전후 중 하나를 본다. (변경은 호출자가 직렬화)
+    """
+
+    # 다시 정렬하기 전까지 쌓아 두는 변경분 최소 개수
+    MIN_PENDING = 32
+
+    def __init__(self, intervals: Iterable[Tuple[Number, Number, int]]):
+        self._state = self._build(intervals)
+
+    @staticmethod
+    def _build(intervals: Iterable[Tuple[Number, Number, int]]) -> Tuple[Any, ...]:
+        items = sorted(intervals)
+        starts = [start for start, _, _ in items]
+        ids = [item_id for _, _, item_id in items]
+        size = 1
+        while size < len(items):
+            size *= 2
+        tree = [-math.inf] * (2 * size)
+        for position, (_, end, _) in enumerate(items):
+            tree[size + position] = end
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        # (정렬된 구간, 시작값, 레코드 인덱스, 최대 끝값 트리, 트리 잎 수, 정렬 배열의 id 집합,
+        #  추가분 {id: (start, end)}, 삭제 표시)
+        return items, starts, ids, tree, size, frozenset(ids), {}, frozenset()
+
+    def __len__(self) -> int:
+        items, _, _, _, _, _, pending, removed = self._state
+        return len(items) - len(removed) + len(pending)
+
+    def add(self, start: Number, end: Number, item_id: int) -> None:
+        """구간 추가 (같은 id가 있으면 교체)"""
+        self.remove(item_id)
+        state = self._state
+        pending = dict(state[6])
+        pending[item_id] = (start, end)
+        self._update(state, pending, state[7])
+
+    def remove(self, item_id: int) -> None:
+        """id의 구간 삭제 (없으면 무시)"""
+        state = self._state
+        members, pending, removed = state[5:]
+        if item_id in pending:
+            pending = dict(pending)
+            del pending[item_id]
+        elif item_id in members and item_id not in removed:
+            removed = removed | {item_id}
+        else:
+            return
+        self._update(state, pending, removed)
+
+    def _update(self, state: Tuple[Any, ...], pending: Dict[int, Tuple[Number, Number]],
+                removed: FrozenSet[int]) -> None:
+        """변경분을 반영한 상태로 교체 (변경분이 많으면 다시 정렬)"""
+        items = state[0]
+        if len(pending) + len(removed) > max(self.MIN_PENDING, math.isqrt(len(items))):
+            live = [item for item in items if item[2] not in removed]
+            live.extend((start, end, item_id) for item_id, (start, end) in pending.items())
+            self._state = self._build(live)
+        else:
+            self._state = state[:6] + (pending, removed)
+
+    def query(self, start_max: Number, end_min: Number) -> List[int]:
+        """start <= start_max 이고 end >= end_min인 구간의 레코드 인덱스"""
+        _, starts, ids, tree, size, _, pending, removed = self._state
+        result = [item_id for item_id, (start, end) in pending.items() if start <= start_max and end >= end_min]
+        limit = bisect_right(starts, start_max)
+        if limit == 0:
+            return result
+        stack = [(1, 0, size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit or tree[node] < end_min:
+                continue
+            if node >= size:
+                item_id = ids[node - size]
+                if item_id not in removed:
+                    result.append(item_id)
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return result
+
+    def overlapping(self, low: Optional[Number], high: Optional[Number]) -> List[int]:
+        """[low, high]와 겹치는 구간 (None은 제한 없음)"""
+        return self.query(math.inf if high is None else high, -math.inf if low is None else low)
+
+    def containing(self, low: Optional[Number], high: Optional[Number]) -> List[int]:
+        """[low, high]를 모두 포함하는 구간 (None은 제한 없음)"""
+        return self.query(math.inf if low is None else low, -math.inf if high is None else high)
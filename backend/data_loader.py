@@ -1,42 +1,15 @@
 """CSV/Excel 데이터 로더 및 검증"""
+import argparse
 import pandas as pd
 import warnings
 from typing import Dict, List, Tuple
 
-
-# 필수 컬럼 목록
-REQUIRED_COLUMNS = [
-    '종_한글명',
-    '사육_난이도_5단계',
-    '초기비용_등급_5단계',
-    '성체크기_등급_3단계',
-    '온도습도_5단계',
-    '활동패턴',
-    '식성타입',
-    '먹이빈도_등급',
-    '핸들링적합도_5단계',
-    '사육장_사이즈_3단계',
-    '외형태그',
-    '종류',
-    '관상용_애완용',
-    '사진_URL'
-]
-
-# 허용된 값 목록
-ALLOWED_ACTIVITY_PATTERNS = ['야행성', '주행성']
-ALLOWED_DIET_TYPES = ['잡식', '초식', '육식']
-ALLOWED_PURPOSES = ['관상용', '애완용', '둘 다']
-ALLOWED_SPECIES_TYPES = [
-    '도마뱀', '게코', '육지 거북', '수생 거북', '반수생 거북',
-    '개구리', '도롱뇽', '카멜레온', '뱀'
-]
-
-
-def normalize_species_name(name: str) -> str:
-    """종명 정규화: 모든 공백 제거"""
-    if pd.isna(name):
-        return ""
-    return str(name).strip().replace(' ', '').replace('\t', '').replace('\n', '')
+from catalog import SpeciesCatalog, normalize_species_name, save_snapshot
+from climate_ranges import CLIMATE_RANGE_COLUMNS, climate_parse_warnings
+from species_validation import (
+    REQUIRED_COLUMNS, ALLOWED_ACTIVITY_PATTERNS, ALLOWED_DIET_TYPES, ALLOWED_PURPOSES, ALLOWED_SPECIES_TYPES,
+    GRADE_5_COLUMNS, GRADE_3_COLUMNS
+)
 
 
 def load_and_validate_data(file_path: str) -> Tuple[pd.DataFrame, List[str]]:
@@ -63,17 +36,13 @@ def load_and_validate_data(file_path: str) -> Tuple[pd.DataFrame, List[str]]:
     df['사진_URL'] = df['사진_URL'].fillna('')
     
     # 등급형 컬럼 범위 검증
-    grade_5_columns = ['사육_난이도_5단계', '초기비용_등급_5단계', '온도습도_5단계', 
-                      '먹이빈도_등급', '핸들링적합도_5단계']
-    grade_3_columns = ['성체크기_등급_3단계', '사육장_사이즈_3단계']
-    
-    for col in grade_5_columns:
+    for col in GRADE_5_COLUMNS:
         invalid = df[(df[col] < 1) | (df[col] > 5)]
         if len(invalid) > 0:
             warnings_list.append(f"{col}: 1-5 범위를 벗어난 값이 {len(invalid)}개 있습니다.")
             df = df[(df[col] >= 1) & (df[col] <= 5)]
     
-    for col in grade_3_columns:
+    for col in GRADE_3_COLUMNS:
         invalid = df[(df[col] < 1) | (df[col] > 3)]
         if len(invalid) > 0:
             warnings_list.append(f"{col}: 1-3 범위를 벗어난 값이 {len(invalid)}개 있습니다.")
@@ -115,5 +84,35 @@ def load_and_validate_data(file_path: str) -> Tuple[pd.DataFrame, List[str]]:
     if removed_count > 0:
         warnings_list.append(f"중복 제거: {removed_count}개의 중복 항목이 제거되었습니다.")
     
+    # 기후 범위 문자열은 카탈로그에서 숫자 범위로 해석됨 (해석 실패는 경고만 하고 결측으로 처리)
+    warnings_list.extend(climate_parse_warnings({
+        col: df[col].tolist() for col in CLIMATE_RANGE_COLUMNS if col in df.columns
+    }))
+    
     return df, warnings_list
 
+
+def build_snapshot(file_path: str, snapshot_path: str) -> Tuple[SpeciesCatalog, List[str]]:
+    """
+    오프라인 검증 후 서빙용 스냅샷 생성
+    
+    서버는 CATALOG_SNAPSHOT 환경 변수로 이 스냅샷을 읽어 pandas 없이 기동한다.
+    """
+    df, warnings_list = load_and_validate_data(file_path)
+    catalog = SpeciesCatalog.from_dataframe(df, source=file_path)
+    save_snapshot(catalog, snapshot_path, warnings_list)
+    return catalog, warnings_list
+
+
+if __name__ == '__main__':
+    from file_utils import find_data_file
+    
+    parser = argparse.ArgumentParser(description='데이터 검증 및 서빙용 카탈로그 스냅샷 생성')
+    parser.add_argument('--input', help='원본 CSV/Excel 경로 (기본: find_data_file 우선순위)')
+    parser.add_argument('--snapshot', required=True, help='생성할 스냅샷(JSON) 경로')
+    args = parser.parse_args()
+    
+    catalog, warnings_list = build_snapshot(args.input or find_data_file(), args.snapshot)
+    print(f"스냅샷 생성 완료: {len(catalog)}개 종 -> {args.snapshot}")
+    for warning in warnings_list:
+        print(f"  - {warning}")
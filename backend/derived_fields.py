@@ -0,0 +1,63 @@
+"""종 데이터에서 계산되는 파생 필드 (카탈로그 로드 시 한 번만 계산)"""
+from typing import Any, Callable, Mapping, Tuple
+
+from climate_ranges import CLIMATE_RANGE_COLUMNS, climate_bound
+
+
+DIFFICULTY_TEXT = {
+    1: "초보자에게 적합한 난이도",
+    2: "초보자도 도전 가능한 난이도",
+    3: "중급자에게 적합한 난이도",
+    4: "고급자에게 적합한 난이도",
+    5: "전문가 수준의 난이도"
+}
+
+
+def calculate_monthly_cost_grade(species_row: Mapping[str, Any]) -> int:
+    """
+    월 유지비 등급 계산
+
+    공식: cost_score = 0.4 * 먹이빈도 + 0.4 * 온도습도 + 0.2 * (성체크기 * 1.7)
+    grade = max(1, min(5, int(round(cost_score))))
+    """
+    feeding = int(species_row['먹이빈도_등급'])
+    temp_humid = int(species_row['온도습도_5단계'])
+    size = int(species_row['성체크기_등급_3단계'])
+
+    cost_score = 0.4 * feeding + 0.4 * temp_humid + 0.2 * (size * 1.7)
+    grade = max(1, min(5, int(round(cost_score))))
+    return grade
+
+
+def generate_care_summary(species_row: Mapping[str, Any]) -> str:
+    """사육 요약 생성 (난이도가 없으면 '적당한 난이도')"""
+    difficulty = species_row['사육_난이도_5단계']
+    # 결측(None/NaN)은 사전에 없는 키로 두어 기본 문구를 쓴다
+    difficulty = None if difficulty is None or difficulty != difficulty else int(difficulty)
+    activity = species_row['활동패턴']
+
+    difficulty_text = DIFFICULTY_TEXT.get(difficulty, "적당한 난이도")
+    activity_text = "주행성으로 낮 시간 활동이 활발합니다" if activity == "주행성" else "야행성으로 밤 시간 활동이 활발합니다"
+
+    return f"{difficulty_text}입니다. {activity_text}."
+
+
+def _climate_bound_field(column: str, unit: str, position: int) -> Callable[[Mapping[str, Any]], Any]:
+    """기후 범위 문자열의 최저(position=0)/최고(1) 숫자 필드 (없거나 해석 실패는 None)"""
+    def derive(species_row: Mapping[str, Any]) -> Any:
+        return climate_bound(species_row.get(column), unit, position)
+    return derive
+
+
+# 파생 필드 등록부: (컬럼명, 계산 함수)
+# 새 파생 필드는 여기에 추가하고 catalog.HOT_COLUMNS에도 컬럼명을 넣는다.
+DERIVED_FIELDS: Tuple[Tuple[str, Callable[[Mapping[str, Any]], Any]], ...] = (
+    ('예상_월유지비_등급_5단계', calculate_monthly_cost_grade),
+    ('사육_요약', generate_care_summary),
+) + tuple(
+    (name, _climate_bound_field(column, unit, position))
+    for column, (min_name, max_name, unit) in CLIMATE_RANGE_COLUMNS.items()
+    for position, name in enumerate((min_name, max_name))
+)
+
+DERIVED_COLUMNS = tuple(name for name, _ in DERIVED_FIELDS)
@@ -0,0 +1,379 @@
+"""종 사진 프록시: 원본 이미지를 받아 고정 폭 썸네일로 변환하고 디스크에 캐시"""
+import hashlib
+import http.client
+import io
+import ipaddress
+import json
+import os
+import socket
+import threading
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+
+from singleflight import SingleFlight
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow가 없으면 리사이즈 없이 원본을 캐시/전달
+    Image = None
+
+
+# 제공하는 썸네일 폭 (요청 폭은 이 중 하나로 맞춘다)
+THUMBNAIL_WIDTHS = (160, 320, 640)
+DEFAULT_THUMBNAIL_WIDTH = 320
+
+# fetcher(url) -> (이미지 바이트, Content-Type)
+Fetcher = Callable[[str], Tuple[bytes, str]]
+
+
+class ImageFetchError(Exception):
+    """원본 이미지를 가져오지 못함"""
+
+
+class CachedImage:
+    """캐시된 이미지 한 장"""
+
+    def __init__(self, data: bytes, content_type: str, etag: str):
+        # etag는 따옴표 없는 원본 값 (응답 헤더는 set_etag로 설정)
+        self.data = data
+        self.content_type = content_type
+        self.etag = etag
+
+
+ALLOWED_SCHEMES = ('http', 'https')
+
+# 그대로 내보낼 수 있는 래스터 이미지 형식 (SVG/HTML 등 스크립트가 들어갈 수 있는 형식은 제외)
+RASTER_CONTENT_TYPES = frozenset(('image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/bmp'))
+
+
+def _public_connection(address: Tuple[str, int], timeout: Any = socket._GLOBAL_DEFAULT_TIMEOUT,
+                       source_address: Optional[Tuple[str, int]] = None) -> socket.socket:
+    """
+    호스트를 한 번만 해석해 모든 주소가 공개 주소인지 확인한 뒤 그 주소로 직접 연결
+
+    검사와 연결이 같은 해석 결과를 쓰므로 DNS 재바인딩(검사 후 내부 주소로 바꾸기)이 통하지 않는다.
+    """
+    host, port = address
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError, ValueError) as e:
+        raise ImageFetchError(f"이미지 호스트를 찾을 수 없습니다: {host} ({e})") from e
+    for info in infos:
+        if not ipaddress.ip_address(info[4][0].split('%')[0]).is_global:
+            raise ImageFetchError(f"내부 주소의 이미지는 가져올 수 없습니다: {host}")
+    last_error: Optional[OSError] = None
+    for info in infos:
+        try:
+            return socket.create_connection(info[4][:2], timeout, source_address)
+        except OSError as e:
+            last_error = e
+    raise last_error or OSError(f"연결할 주소가 없습니다: {host}")
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _public_connection
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    """TLS 인증서/SNI는 원래 호스트 이름으로 확인하고 TCP 연결만 검사한 주소로"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _public_connection
+
+
+class _PublicHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+class _CheckedRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """리다이렉트 대상도 같은 규칙(http/https, 공개 주소)으로 검사"""
+
+    def __init__(self, check: Callable[[str], None]):
+        super().__init__()
+        self._check = check
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        self._check(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+class UrlFetcher:
+    """
+    HTTP(S)로 원본 이미지를 가져오는 기본 fetcher
+
+    사진_URL은 관리자 API나 가져온 데이터셋에서 오므로 http/https만 허용하고,
+    사설/루프백/링크 로컬 주소로 가는 요청(리다이렉트 포함)은 거절한다.
+    주소 검사는 연결할 때 실제로 연결하는 주소에 대해 한다. (allow_private_hosts=True는 로컬 스텁 서버를 쓰는 테스트용)
+    """
+
+    def __init__(self, timeout: float = 10.0, max_bytes: int = 20 * 1024 * 1024,
+                 user_agent: str = 'LizardMatch-ImageProxy/1.0', allow_private_hosts: bool = False):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        # Wikimedia는 User-Agent가 없는 요청을 거절한다
+        self.user_agent = user_agent
+        self.allow_private_hosts = allow_private_hosts
+        handlers = [_CheckedRedirectHandler(self.check_url)]
+        if not allow_private_hosts:
+            handlers += [_PublicHTTPHandler(), _PublicHTTPSHandler()]
+        self._opener = urllib.request.build_opener(*handlers)
+
+    def check_url(self, url: str) -> None:
+        """http/https URL이 아니면 ImageFetchError (주소 검사는 연결 시 _public_connection)"""
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme.lower() not in ALLOWED_SCHEMES or not parts.hostname:
+            raise ImageFetchError(f"http/https 이미지 URL만 가져올 수 있습니다: {url}")
+
+    def __call__(self, url: str) -> Tuple[bytes, str]:
+        self.check_url(url)
+        req = urllib.request.Request(url, headers={'User-Agent': self.user_agent})
+        try:
+            with self._opener.open(req, timeout=self.timeout) as response:
+                data = response.read(self.max_bytes + 1)
+                content_type = response.headers.get_content_type()
+        except ImageFetchError:
+            raise
+        except Exception as e:
+            raise ImageFetchError(f"이미지를 가져오지 못했습니다: {url} ({e})") from e
+        if len(data) > self.max_bytes:
+            raise ImageFetchError(f"이미지가 너무 큽니다: {url}")
+        return data, content_type
+
+
+def snap_width(width: Optional[int]) -> int:
+    """요청 폭 이상인 가장 작은 썸네일 폭 (없으면 최대 폭)"""
+    if width is None:
+        return DEFAULT_THUMBNAIL_WIDTH
+    for candidate in THUMBNAIL_WIDTHS:
+        if width <= candidate:
+            return candidate
+    return THUMBNAIL_WIDTHS[-1]
+
+
+def resize_image(data: bytes, content_type: str, width: int) -> Tuple[bytes, str]:
+    """
+    폭 기준 비율 유지 축소 (원본이 더 작으면 확대하지 않음)
+
+    결과는 API 출처에서 그대로 서빙되므로 래스터 image/* 원본만 받는다.
+    Pillow로 읽을 수 없으면(SVG, HTML 등) ImageFetchError이며 캐시하지 않는다.
+    """
+    if not content_type.startswith('image/') or content_type == 'image/svg+xml':
+        raise ImageFetchError(f"래스터 이미지가 아닙니다: {content_type}")
+    if Image is None:
+        if content_type not in RASTER_CONTENT_TYPES:
+            raise ImageFetchError(f"변환 없이 전달할 수 없는 이미지 형식입니다: {content_type}")
+        return data, content_type
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            if img.width > width:
+                height = max(1, round(img.height * width / img.width))
+                img = img.resize((width, height), Image.LANCZOS)
+            output = io.BytesIO()
+            if img.mode in ('RGBA', 'LA', 'P'):
+                img.save(output, format='PNG', optimize=True)
+                return output.getvalue(), 'image/png'
+            img.convert('RGB').save(output, format='JPEG', quality=82, optimize=True)
+            return output.getvalue(), 'image/jpeg'
+    except Exception as e:
+        raise ImageFetchError(f"이미지를 읽을 수 없습니다: {content_type} ({e})") from e
+
+
+class DiskImageCache:
+    """
+    LRU 방식으로 용량이 제한되는 디스크 캐시
+
+    키마다 이미지 파일(<key>.bin)과 메타데이터 파일(<key>.json)을 저장한다.
+    사용 순서는 파일 수정 시각으로 보존되어 재시작 후에도 유지된다.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> 바이트 크기, 오래 사용되지 않은 순
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + '.bin', base + '.json'
+
+    def _load_index(self) -> None:
+        """디스크의 기존 캐시 파일로 LRU 순서 복원"""
+        found = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.bin'):
+                continue
+            key = filename[:-4]
+            data_path, meta_path = self._paths(key)
+            if not os.path.exists(meta_path):
+                continue
+            stat = os.stat(data_path)
+            found.append((stat.st_mtime, key, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        """캐시 조회 (히트 시 최근 사용으로 갱신)"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(data_path, 'rb') as f:
+                data = f.read()
+            os.utime(data_path)
+        except OSError:
+            with self._lock:
+                size = self._entries.pop(key, None)
+                if size is not None:
+                    self._total_bytes -= size
+            return None
+        return CachedImage(data, meta['content_type'], meta['etag'])
+
+    def put(self, key: str, image: CachedImage) -> None:
+        """캐시 저장 후 용량 초과분 제거"""
+        data_path, meta_path = self._paths(key)
+        tmp_path = data_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(image.data)
+        os.replace(tmp_path, data_path)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'content_type': image.content_type, 'etag': image.etag}, f)
+        with self._lock:
+            old_size = self._entries.pop(key, None)
+            if old_size is not None:
+                self._total_bytes -= old_size
+            self._entries[key] = len(image.data)
+            self._total_bytes += len(image.data)
+            self._evict()
+
+    def delete_prefix(self, prefix: str) -> int:
+        """키가 prefix로 시작하는 항목 삭제"""
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._total_bytes -= self._entries.pop(key)
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+class ImageProxy:
+    """원본 이미지 조회 → 리사이즈 → 디스크 캐시"""
+
+    def __init__(self, cache: DiskImageCache, fetcher: Optional[Fetcher] = None):
+        self.cache = cache
+        self.fetcher = fetcher or UrlFetcher()
+        # 같은 썸네일/원본을 동시에 요청하면 한 번만 가져오고 변환한다
+        self._thumbnail_flight = SingleFlight()
+        self._source_flight = SingleFlight()
+
+    @staticmethod
+    def url_prefix(source_url: str) -> str:
+        """원본 URL별 캐시 키 접두사"""
+        return hashlib.sha1(source_url.encode('utf-8')).hexdigest()
+
+    def cache_key(self, source_url: str, width: int) -> str:
+        return f"{self.url_prefix(source_url)}_{width}"
+
+    def get(self, source_url: str, width: int) -> CachedImage:
+        """썸네일 조회 (캐시 미스 시 가져와서 저장)"""
+        key = self.cache_key(source_url, width)
+        cached = self.cache.get(key)
+        # 래스터가 아닌 항목은 이전 버전이 원본을 그대로 저장한 것이므로 다시 만든다
+        if cached is not None and cached.content_type in RASTER_CONTENT_TYPES:
+            return cached
+        image, _ = self._thumbnail_flight.do(key, lambda: self._build(source_url, width, key))
+        return image
+
+    def _build(self, source_url: str, width: int, key: str) -> CachedImage:
+        # 리더가 된 뒤에도 직전에 다른 요청이 저장했을 수 있다
+        cached = self.cache.get(key)
+        if cached is not None and cached.content_type in RASTER_CONTENT_TYPES:
+            return cached
+        data, content_type = self._source_flight.do(source_url, lambda: self.fetcher(source_url))[0]
+        data, content_type = resize_image(data, content_type, width)
+        image = CachedImage(data, content_type, hashlib.sha1(data).hexdigest())
+        self.cache.put(key, image)
+        return image
+
+    def invalidate(self, source_url: str) -> int:
+        """원본 URL의 모든 폭 썸네일 삭제"""
+        return self.cache.delete_prefix(self.url_prefix(source_url))
+
+    def warm(self, source_urls: Iterable[str], widths: Iterable[int] = (DEFAULT_THUMBNAIL_WIDTH,),
+             workers: int = 8) -> Dict[str, int]:
+        """여러 원본 이미지를 병렬로 미리 캐시 (실패는 건너뜀)"""
+        jobs = [(url, width) for url in dict.fromkeys(u for u in source_urls if u) for width in widths]
+        failed: List[str] = []
+
+        def _warm_one(job):
+            try:
+                self.get(*job)
+            except (ImageFetchError, OSError):
+                failed.append(job[0])
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            list(executor.map(_warm_one, jobs))
+        return {'requested': len(jobs), 'failed': len(failed)}
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 및 single-flight 통계"""
+        return {
+            **self.cache.stats(),
+            'coalesced_requests': self._thumbnail_flight.shared_count + self._source_flight.shared_count,
+            'resize_enabled': Image is not None
+        }
@@ -0,0 +1,180 @@
+"""
+메모리 사용량 진단 (관리자 /api/debug/memory)
+
+- deep_sizeof: 상주 구조체의 대략적인 크기 (공유 객체는 seen으로 한 번만 셈)
+- AllocationTracer: 요청 단위 tracemalloc 추적으로 엔드포인트별 할당 위치 상위 목록 집계
+"""
+import os
+import sys
+import threading
+import tracemalloc
+import types
+from typing import Dict, Any, Optional, Set
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# 크기를 셀 때 따라가지 않는 객체 (코드/모듈은 구조체 크기에 포함하지 않음)
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, types.CodeType, types.FrameType)
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    obj에서 닿을 수 있는 객체의 sys.getsizeof 합계 (바이트)
+
+    여러 구조체를 잴 때 seen을 함께 넘기면 공유 객체는 먼저 잰 구조체에만 포함된다.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, '__dict__'):
+            stack.append(current.__dict__)
+        for slot in getattr(type(current), '__slots__', ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """프로세스 상주 메모리 (바이트, 알 수 없으면 None)"""
+    rss = None
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    peak_rss = None
+    if resource is not None:
+        # Linux는 KiB, macOS는 바이트
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_rss = peak if sys.platform == 'darwin' else peak * 1024
+    return {'rss_bytes': rss, 'peak_rss_bytes': peak_rss}
+
+
+class AllocationTracer:
+    """
+    요청 단위 할당 추적 (필요할 때만 켬)
+
+    켜져 있는 동안 요청 시작/끝에 tracemalloc 스냅샷을 찍어 차이를 엔드포인트별로 누적한다.
+    요청 안에서 할당되고 응답 시점까지 남아 있는 메모리(응답 본문, 복사본, 캐시 추가분)가 잡히며,
+    요청 중 최대 추적 메모리(peak)도 함께 기록한다. tracemalloc은 프로세스 전역이므로
+    추적 중에는 요청을 한 번에 하나씩 처리해 서로의 할당이 섞이지 않게 한다.
+    """
+
+    # 엔드포인트별로 보관하는 할당 위치 수 (보고서의 top보다 넉넉하게)
+    MAX_SITES = 200
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._request_lock = threading.Lock()
+        self.top = 10
+        self.frames = 1
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def active(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, top: int = 10, frames: int = 1) -> None:
+        """추적 시작 (이전 집계는 지움)"""
+        with self._lock:
+            self.top = top
+            self.frames = frames
+            self._endpoints = {}
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """추적 중지 (집계는 report를 위해 남겨 둠)"""
+        with self._lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+
+    def begin_request(self) -> Optional[Dict[str, Any]]:
+        """요청 시작 (추적 중이 아니면 None)"""
+        if not self.active:
+            return None
+        self._request_lock.acquire()
+        if not self.active:
+            self._request_lock.release()
+            return None
+        state = {'before': self._snapshot()}
+        tracemalloc.reset_peak()
+        state['base'], _ = tracemalloc.get_traced_memory()
+        return state
+
+    def end_request(self, state: Optional[Dict[str, Any]], endpoint: str) -> None:
+        """요청 끝: 시작 스냅샷과의 차이를 엔드포인트에 누적"""
+        if state is None:
+            return
+        try:
+            if not self.active:
+                return
+            _, peak = tracemalloc.get_traced_memory()
+            stats = self._snapshot().compare_to(state['before'], 'traceback' if self.frames > 1 else 'lineno')
+            with self._lock:
+                entry = self._endpoints.setdefault(endpoint, {'requests': 0, 'max_peak_bytes': 0, 'sites': {}})
+                entry['requests'] += 1
+                entry['max_peak_bytes'] = max(entry['max_peak_bytes'], peak - state['base'])
+                sites = entry['sites']
+                for stat in stats:
+                    if stat.size_diff <= 0:
+                        continue
+                    site = ' <- '.join(f"{frame.filename}:{frame.lineno}" for frame in stat.traceback)
+                    size, count = sites.get(site, (0, 0))
+                    sites[site] = (size + stat.size_diff, count + max(stat.count_diff, 0))
+                if len(sites) > self.MAX_SITES:
+                    kept = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:self.MAX_SITES]
+                    entry['sites'] = dict(kept)
+        finally:
+            self._request_lock.release()
+
+    def report(self) -> Dict[str, Any]:
+        """엔드포인트별 요청 수, 최대 peak, 누적 할당 상위 위치"""
+        with self._lock:
+            endpoints = {}
+            for endpoint, entry in self._endpoints.items():
+                sites = sorted(entry['sites'].items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+                endpoints[endpoint] = {
+                    'requests': entry['requests'],
+                    'max_peak_bytes': entry['max_peak_bytes'],
+                    'top_sites': [
+                        {
+                            'site': site,
+                            'bytes': size,
+                            'bytes_per_request': size // entry['requests'],
+                            'blocks': count
+                        }
+                        for site, (size, count) in sites
+                    ]
+                }
+            return {
+                'active': self.active,
+                'top': self.top,
+                'frames': self.frames,
+                'traced_bytes': tracemalloc.get_traced_memory()[0] if self.active else None,
+                'endpoints': endpoints
+            }
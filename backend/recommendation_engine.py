@@ -1,9 +1,14 @@
 """추천 엔진"""
-import pandas as pd
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+import heapq
+import json
+import math
 import uuid
 
+from catalog import SpeciesCatalog
+from derived_fields import calculate_monthly_cost_grade, generate_care_summary
+from scoring_policy import DEFAULT_POLICY_NAME, DEFAULT_POLICY_VERSION, PolicyRegistry, ScoringPolicy
 from scoring_helpers import (
     ScoringContext,
     calculate_difficulty_score,
@@ -19,6 +24,8 @@ from scoring_helpers import (
     calculate_species_type_score,
     calculate_purpose_score
 )
+from scoring_rules import RULE_SPECS
+from singleflight import SingleFlight
 
 
 # 기본 가중치
@@ -36,19 +43,195 @@ WEIGHTS = {
     '관상용_애완용': 10
 }
 
+# 기본 점수 정책 (기본 가중치 + 기본 점수표)
+DEFAULT_POLICY = ScoringPolicy(DEFAULT_POLICY_NAME, DEFAULT_POLICY_VERSION, WEIGHTS)
+
+
+# 질문별 점수 규칙: (가중치 키, 선호도 키, 종 컬럼, 계산 함수)
+# 선호도 키가 None인 규칙은 선호도 입력과 무관하게 항상 계산한다.
+# 종류(하드 필터)는 별도로 처리하며, 규칙 순서는 합산 순서이므로 바꾸지 않는다.
+SCORING_RULES = (
+    ('사육_난이도_5단계', '사육_난이도_5단계', '사육_난이도_5단계',
+     lambda value, prefs, ctx: calculate_difficulty_score(int(value), prefs.get('사육_난이도_5단계'), ctx)),
+    ('초기비용_등급_5단계', '초기비용_등급_5단계_max', '초기비용_등급_5단계',
+     lambda value, prefs, ctx: calculate_initial_cost_score(int(value), prefs.get('초기비용_등급_5단계_max'), ctx)),
+    ('온도습도_5단계', None, '온도습도_5단계',
+     lambda value, prefs, ctx: calculate_temperature_humidity_score(int(value), ctx)),
+    ('활동패턴', '활동패턴', '활동패턴',
+     lambda value, prefs, ctx: calculate_activity_pattern_score(value, prefs.get('활동패턴'), ctx)),
+    ('식성타입', '식성타입', '식성타입',
+     lambda value, prefs, ctx: calculate_diet_type_score(value, prefs.get('식성타입'), ctx)),
+    ('먹이빈도_등급', '먹이빈도_등급_prefer', '먹이빈도_등급',
+     lambda value, prefs, ctx: calculate_feeding_frequency_score(int(value), prefs.get('먹이빈도_등급_prefer'), ctx)),
+    ('핸들링적합도_5단계', '핸들링적합도_5단계_prefer', '핸들링적합도_5단계',
+     lambda value, prefs, ctx: calculate_handling_score(int(value), prefs.get('핸들링적합도_5단계_prefer'), ctx)),
+    ('사육장_사이즈_3단계', '사육장_사이즈_3단계_max', '사육장_사이즈_3단계',
+     lambda value, prefs, ctx: calculate_enclosure_size_score(int(value), prefs.get('사육장_사이즈_3단계_max'), ctx)),
+    ('성체크기_등급_3단계', None, '성체크기_등급_3단계',
+     lambda value, prefs, ctx: calculate_adult_size_score(int(value), ctx)),
+    ('외형태그', '외형태그', '외형태그',
+     lambda value, prefs, ctx: calculate_appearance_tags_score(value, prefs.get('외형태그'), ctx)),
+    ('관상용_애완용', '관상용_애완용', '관상용_애완용',
+     lambda value, prefs, ctx: calculate_purpose_score(value, prefs.get('관상용_애완용'), ctx)),
+)
+
+
+# 추천 결과 카드 필드 (options.fields 프로젝션으로 고를 수 있는 필드)
+RESULT_FIELDS = (
+    '종_한글명',
+    '종류',
+    '관상용_애완용',
+    '활동패턴',
+    '사진_URL',
+    '사진_페이지_URL',
+    'match_score',
+    '사육_난이도_5단계',
+    '초기비용_등급_5단계',
+    '사육장_사이즈_3단계',
+    '핸들링적합도_5단계',
+    '예상_월유지비_등급_5단계',
+    '사육_요약',
+    'match_reasons',
+    'question_contributions'
+)
+
+REASON_FIELDS = ('match_reasons', 'question_contributions')
+
+# options.group_by로 묶을 수 있는 종 컬럼 (그룹마다 상위 N개)
+GROUP_BY_FIELDS = ('종류',)
+
+# 데이터셋에 없을 수도 있는 카드 필드와 기본값
+OPTIONAL_RESULT_FIELDS = {
+    '활동패턴': None,
+    '사진_URL': '',
+    '사진_페이지_URL': '',
+    '사육_난이도_5단계': None,
+    '사육장_사이즈_3단계': None,
+    '핸들링적합도_5단계': None
+}
+
+
+def normalize_score(
+    total_score: float,
+    custom_weights: Dict[str, int],
+    default_weights: Optional[Dict[str, int]] = None
+) -> float:
+    """합산 점수를 0-100으로 정규화"""
+    if custom_weights:
+        max_possible_score = sum(custom_weights.values())
+    else:
+        max_possible_score = sum((default_weights or WEIGHTS).values())
+    if max_possible_score > 0:
+        return min(100, max(0, (total_score / max_possible_score) * 100))
+    return 0
+
 
 class RecommendationEngine:
     """추천 엔진 클래스"""
     
-    def __init__(self, dataframe: pd.DataFrame):
-        self.df = dataframe.copy()
+    def __init__(self, catalog: SpeciesCatalog, policies: Optional[PolicyRegistry] = None):
+        # 카탈로그는 읽기 전용으로 공유한다 (복사하지 않음)
+        self.catalog = catalog
+        self.records = catalog.records
         self.dataset_version = "도마뱀_cursor_ai_utf8_clean.csv@DATASET"
+        # 같은 카탈로그 위에서 동작하는 점수 정책들
+        self.policies = policies or PolicyRegistry.single(DEFAULT_POLICY)
+        # 같은 요청이 동시에 들어오면 한 번만 계산 (recommend 참고)
+        self.recommend_flight = SingleFlight()
+    
+    def choose_policy(self, options: Optional[Dict[str, Any]] = None) -> ScoringPolicy:
+        """
+        요청 정책 선택
+        
+        options.scoring_policy가 있으면 해당 정책, 없으면 options.policy_key 해시로 트래픽 분할
+        """
+        options = options or {}
+        return self.policies.choose(options.get('scoring_policy'), options.get('policy_key'))
+    
+    @staticmethod
+    def resolve_weights(preferences: Dict[str, Any], policy: ScoringPolicy = DEFAULT_POLICY) -> Dict[str, int]:
+        """요청에 사용할 가중치 (custom_weights가 없으면 정책 가중치)"""
+        custom_weights = preferences.get('custom_weights', {})
+        if not custom_weights:
+            custom_weights = policy.weights.copy()
+        return custom_weights
+    
+    @staticmethod
+    def make_context(
+        preferences: Dict[str, Any],
+        custom_weights: Dict[str, int],
+        policy: ScoringPolicy
+    ) -> ScoringContext:
+        """정책의 기본 가중치/점수표를 쓰는 점수 계산 컨텍스트"""
+        return ScoringContext(preferences, custom_weights, policy.weights, policy.score_tables)
+    
+    def score_species_type_column(
+        self,
+        preferences: Dict[str, Any],
+        policy: ScoringPolicy = DEFAULT_POLICY
+    ) -> List[float]:
+        """전체 종에 대한 종류(하드 필터) 점수 열 계산 (삭제된 종은 0)"""
+        context = self.make_context(preferences, {}, policy)
+        return [
+            calculate_species_type_score(
+                record['종류'],
+                preferences.get('종류'),
+                preferences.get('종류_가중치'),
+                context
+            ) if record is not None else 0.0
+            for record in self.records
+        ]
+    
+    def score_rule_column(
+        self,
+        rule_index: int,
+        preferences: Dict[str, Any],
+        custom_weights: Dict[str, int],
+        policy: ScoringPolicy = DEFAULT_POLICY
+    ) -> List[float]:
+        """전체 종에 대해 SCORING_RULES[rule_index] 한 질문의 점수 열만 계산"""
+        _, pref_key, column, scorer = SCORING_RULES[rule_index]
+        if pref_key is not None and pref_key not in preferences:
+            return [0.0] * len(self.records)
+        context = self.make_context(preferences, custom_weights, policy)
+        return [
+            scorer(record[column], preferences, context) if record is not None else 0.0
+            for record in self.records
+        ]
+    
+    def score_record_row(
+        self,
+        record: Optional[Any],
+        preferences: Dict[str, Any],
+        custom_weights: Dict[str, int],
+        policy: ScoringPolicy = DEFAULT_POLICY
+    ) -> Tuple[float, List[float]]:
+        """
+        종 하나의 (종류 점수, SCORING_RULES별 기여도) 행
+
+        score_species_type_column/score_rule_column의 한 행과 같은 값이다 (삭제된 종은 0).
+        """
+        if record is None:
+            return 0.0, [0.0] * len(SCORING_RULES)
+        type_score = calculate_species_type_score(
+            record['종류'],
+            preferences.get('종류'),
+            preferences.get('종류_가중치'),
+            self.make_context(preferences, {}, policy)
+        )
+        context = self.make_context(preferences, custom_weights, policy)
+        row = [
+            scorer(record[column], preferences, context) if pref_key is None or pref_key in preferences else 0.0
+            for _, pref_key, column, scorer in SCORING_RULES
+        ]
+        return type_score, row
     
     def calculate_match_score(
         self,
-        species_row: pd.Series,
+        species_row: Dict[str, Any],
         preferences: Dict[str, Any],
-        custom_weights: Dict[str, int]
+        custom_weights: Dict[str, int],
+        policy: ScoringPolicy = DEFAULT_POLICY
     ) -> Tuple[float, ScoringContext]:
         """
         종과 선호도 매칭 점수 계산 (0-100)
@@ -56,7 +239,7 @@ class RecommendationEngine:
         Returns:
             (점수, ScoringContext): 계산된 점수와 컨텍스트
         """
-        context = ScoringContext(preferences, custom_weights)
+        context = self.make_context(preferences, custom_weights, policy)
         
         total_score = 0.0
         
@@ -73,130 +256,323 @@ class RecommendationEngine:
         if species_score == 0:
             return 0.0, context
         
-        # 사육 난이도
-        if '사육_난이도_5단계' in preferences:
-            total_score += calculate_difficulty_score(
-                int(species_row['사육_난이도_5단계']),
-                preferences.get('사육_난이도_5단계'),
-                context
-            )
+        # 나머지 질문별 점수
+        for _, pref_key, column, scorer in SCORING_RULES:
+            if pref_key is None or pref_key in preferences:
+                total_score += scorer(species_row[column], preferences, context)
         
-        # 초기 비용
-        if '초기비용_등급_5단계_max' in preferences:
-            total_score += calculate_initial_cost_score(
-                int(species_row['초기비용_등급_5단계']),
-                preferences.get('초기비용_등급_5단계_max'),
-                context
-            )
-        
-        # 온도/습도
-        total_score += calculate_temperature_humidity_score(
-            int(species_row['온도습도_5단계']),
-            context
-        )
-        
-        # 활동 패턴
-        if '활동패턴' in preferences:
-            total_score += calculate_activity_pattern_score(
-                species_row['활동패턴'],
-                preferences.get('활동패턴'),
-                context
-            )
-        
-        # 식성 타입
-        if '식성타입' in preferences:
-            total_score += calculate_diet_type_score(
-                species_row['식성타입'],
-                preferences.get('식성타입'),
-                context
-            )
+        return normalize_score(total_score, custom_weights, policy.weights), context
+    
+    def score_matrix(
+        self,
+        preferences: Dict[str, Any],
+        policy: ScoringPolicy = DEFAULT_POLICY
+    ) -> Dict[str, Any]:
+        """
+        클라이언트 재가중치용 점수 분해 행렬
         
-        # 먹이 빈도
-        if '먹이빈도_등급_prefer' in preferences:
-            total_score += calculate_feeding_frequency_score(
-                int(species_row['먹이빈도_등급']),
-                preferences.get('먹이빈도_등급_prefer'),
-                context
-            )
+        종류 하드 필터를 통과한 종마다 질문별 가중치 적용 전 점수(0-100)를 반환한다.
+        클라이언트는 아래 순서 그대로 계산하면 recommend와 같은 점수/순위를 얻는다.
         
-        # 핸들링 적합도
-        if '핸들링적합도_5단계_prefer' in preferences:
-            total_score += calculate_handling_score(
-                int(species_row['핸들링적합도_5단계']),
-                preferences.get('핸들링적합도_5단계_prefer'),
-                context
-            )
+            total = type_scores[i]
+            for j, key in enumerate(questions):
+                total += (scores[i][j] / 100) * weight(key)
+            score = min(100, max(0, total / sum(custom_weights) * 100))
         
-        # 사육장 크기
-        if '사육장_사이즈_3단계_max' in preferences:
-            total_score += calculate_enclosure_size_score(
-                int(species_row['사육장_사이즈_3단계']),
-                preferences.get('사육장_사이즈_3단계_max'),
+        weight(key)는 custom_weights[key]가 없으면 default_weights[key]이며,
+        custom_weights가 비어 있으면 default_weights 전체를 사용한다.
+        score > 0인 종만 점수 내림차순(동점은 행 순서)으로 정렬한다.
+        """
+        names = []
+        species_types = []
+        type_scores = []
+        scores = []
+        # 정책 기본 가중치가 0인 질문도 점수를 계산하도록 모든 질문에 0이 아닌 가중치를 준다
+        # (질문별 점수는 가중치와 무관하고, 종류 점수는 종류_가중치만 쓴다)
+        unit_weights = {rule[0]: 1 for rule in SCORING_RULES}
+        for record in self.records:
+            if record is None:
+                continue
+            context = self.make_context(preferences, unit_weights, policy)
+            species_score = calculate_species_type_score(
+                record['종류'],
+                preferences.get('종류'),
+                preferences.get('종류_가중치'),
                 context
             )
+            if species_score == 0:
+                continue
+            
+            row = []
+            for question_key, pref_key, column, scorer in SCORING_RULES:
+                if pref_key is None or pref_key in preferences:
+                    scorer(record[column], preferences, context)
+                row.append(context.question_scores.get(question_key, 0))
+            
+            names.append(record['종_한글명'])
+            species_types.append(record['종류'])
+            type_scores.append(species_score)
+            scores.append(row)
         
-        # 성체 크기
-        total_score += calculate_adult_size_score(
-            int(species_row['성체크기_등급_3단계']),
-            context
+        return {
+            'dataset_version': self.dataset_version,
+            'scoring_policy_version': policy.version,
+            'questions': [rule[0] for rule in SCORING_RULES],
+            'default_weights': policy.weights,
+            'species': names,
+            'species_types': species_types,
+            'type_scores': type_scores,
+            'scores': scores
+        }
+    
+    @staticmethod
+    def _result_card(score: float, row, context: ScoringContext, fields) -> Dict[str, Any]:
+        """추천 결과 카드 (fields에 있는 필드만 계산)"""
+        card = {}
+        for field in fields:
+            if field == 'match_score':
+                card[field] = round(score, 1)
+            elif field == 'match_reasons':
+                card[field] = context.match_reasons[:2]  # 상위 2개
+            elif field == 'question_contributions':
+                # 질문별 기여도 정렬 (상위 5개)
+                sorted_contributions = sorted(
+                    context.question_contributions.items(),
+                    key=lambda x: x[1],
+                    reverse=True
+                )[:5]
+                card[field] = {k: round(v, 1) for k, v in sorted_contributions}
+            elif field in OPTIONAL_RESULT_FIELDS:
+                card[field] = row.get(field, OPTIONAL_RESULT_FIELDS[field])
+            else:
+                card[field] = row[field]
+        return card
+    
+    def calculate_monthly_cost_grade(self, species_row: Dict[str, Any]) -> int:
+        """월 유지비 등급 (카탈로그 레코드는 예상_월유지비_등급_5단계로 미리 계산되어 있음)"""
+        return calculate_monthly_cost_grade(species_row)
+    
+    def generate_care_summary(self, species_row: Dict[str, Any]) -> str:
+        """사육 요약 (카탈로그 레코드는 사육_요약으로 미리 계산되어 있음)"""
+        return generate_care_summary(species_row)
+    
+    def coalescing_key(
+        self,
+        preferences: Dict[str, Any],
+        policy: ScoringPolicy,
+        top_n: int,
+        fields,
+        group_by: Optional[str] = None
+    ) -> str:
+        """요청 결합 키 (선호도는 키 순서와 무관한 정규형, 카탈로그가 바뀌면 달라짐)"""
+        return json.dumps(
+            [self.catalog.revision, policy.name, policy.version, top_n, list(fields), group_by, preferences],
+            sort_keys=True, ensure_ascii=False, default=str
         )
+    
+    def rule_upper_bounds(
+        self,
+        preferences: Dict[str, Any],
+        custom_weights: Dict[str, int],
+        policy: ScoringPolicy = DEFAULT_POLICY
+    ) -> List[Optional[float]]:
+        """
+        SCORING_RULES별 기여도 상한 (계산하지 않는 규칙은 None)
+
+        기여도는 (점수 / 100) * 가중치이고 점수는 점수표 값(외형태그는 그 비율) 또는 0이므로,
+        점수표 최댓값/최솟값과 0 중 가장 큰 기여도가 상한이다 (음수 가중치 포함).
+        """
+        context = self.make_context(preferences, custom_weights, policy)
+        bounds = []
+        for question_key, pref_key, _, _ in SCORING_RULES:
+            if pref_key is not None and pref_key not in preferences:
+                bounds.append(None)
+                continue
+            weight = context.get_weight(question_key, RULE_SPECS[question_key].default_weight)
+            points = context.score_tables[question_key].values()
+            bounds.append(max(0.0, (max(points) / 100) * weight, (min(points) / 100) * weight))
+        return bounds
+    
+    def top_scores(
+        self,
+        preferences: Dict[str, Any],
+        custom_weights: Dict[str, int],
+        policy: ScoringPolicy,
+        top_n: int,
+        prune: bool = True
+    ) -> List[Tuple[float, int]]:
+        """점수 상위 N개 (점수, 레코드 인덱스) - 점수 내림차순, 동점은 인덱스 순"""
+        return self.top_scores_by_group(preferences, custom_weights, policy, top_n, None, prune).get(None, [])
+    
+    def top_scores_by_group(
+        self,
+        preferences: Dict[str, Any],
+        custom_weights: Dict[str, int],
+        policy: ScoringPolicy,
+        top_n: int,
+        group_column: Optional[str] = None,
+        prune: bool = True
+    ) -> Dict[Any, List[Tuple[float, int]]]:
+        """
+        그룹(group_column 값)별 점수 상위 N개 (group_column이 None이면 전체가 그룹 None 하나)
         
-        # 외형 태그
-        if '외형태그' in preferences:
-            total_score += calculate_appearance_tags_score(
-                species_row['외형태그'],
-                preferences.get('외형태그'),
-                context
-            )
+        한 번 훑으면서 그룹마다 따로 상위 N개 최소 힙을 유지한다.
+        prune=True이면 상한 가지치기로 계산을 줄인다. 규칙을 기여도 상한이 큰 순서로 계산하면서
+        (현재까지 합 + 남은 규칙 상한)이 그 종이 속한 그룹의 N번째 점수를 넘지 못하면 즉시 버린다.
+        끝까지 계산한 종의 점수는 calculate_match_score와 같은 순서로 합산하므로
+        결과는 전체 계산(prune=False)과 정확히 같다.
+        top_n이 0 이하이면 빈 결과 (요청 검증을 거치지 않는 워밍업/회귀 게이트 같은 직접 호출용).
+        """
+        if top_n <= 0:
+            return {}
+        if not prune:
+            scored = []
+            for index, row in enumerate(self.records):
+                if row is None:
+                    continue
+                score, _ = self.calculate_match_score(row, preferences, custom_weights, policy)
+                if score > 0:
+                    scored.append((score, index))
+            scored.sort(key=lambda x: x[0], reverse=True)
+            groups: Dict[Any, List[Tuple[float, int]]] = {}
+            for score, index in scored:
+                group = groups.setdefault(self.records[index][group_column] if group_column else None, [])
+                if len(group) < top_n:
+                    group.append((score, index))
+            return groups
         
-        # 사육 목적
-        if '관상용_애완용' in preferences:
-            total_score += calculate_purpose_score(
-                species_row['관상용_애완용'],
-                preferences.get('관상용_애완용'),
-                context
-            )
+        bounds = self.rule_upper_bounds(preferences, custom_weights, policy)
+        active = [j for j, bound in enumerate(bounds) if bound is not None]
+        # 상한이 큰 규칙부터 계산, remaining[k]는 k번째 이후 규칙 상한의 합 (부동소수 오차 여유 포함)
+        order = sorted(active, key=lambda j: bounds[j], reverse=True)
+        remaining = [0.0] * (len(order) + 1)
+        for k in range(len(order) - 1, -1, -1):
+            remaining[k] = remaining[k + 1] + bounds[order[k]]
+        remaining = [bound + 1e-9 for bound in remaining]
         
-        # 점수를 0-100으로 정규화
-        max_possible_score = sum(custom_weights.values()) if custom_weights else sum(WEIGHTS.values())
-        if max_possible_score > 0:
-            normalized_score = min(100, max(0, (total_score / max_possible_score) * 100))
-        else:
-            normalized_score = 0
+        rules = [(j, SCORING_RULES[j][2], SCORING_RULES[j][3]) for j in order]
+        default_weights = policy.weights
+        species_types = preferences.get('종류')
+        species_weights = preferences.get('종류_가중치')
+        # 규칙 함수가 근거/점수를 기록하는 임시 컨텍스트 (종마다 비움)
+        context = self.make_context(preferences, custom_weights, policy)
+        
+        # 그룹별 (점수, -인덱스, 정규화 전 합계) 힙: 가장 약한 후보가 맨 앞
+        heaps: Dict[Any, List[Tuple[float, int, float]]] = {}
+        # 정규화는 단조 증가이므로 가지치기는 정규화 전 합계로 비교한다 (힙이 찬 그룹만).
+        # 동점이면 먼저 나온 종이 앞서므로 N번째 후보의 합계와 같아도 들어갈 수 없다.
+        thresholds: Dict[Any, float] = {}
+        for index, row in enumerate(self.records):
+            if row is None:
+                continue
+            species_score = calculate_species_type_score(row['종류'], species_types, species_weights, context)
+            if species_score == 0:
+                continue
+            group = row[group_column] if group_column else None
+            threshold = thresholds.get(group)
+            if threshold is not None and species_score + remaining[0] <= threshold:
+                continue
+            
+            contributions = [0.0] * len(SCORING_RULES)
+            partial = species_score
+            pruned = False
+            for k, (j, column, scorer) in enumerate(rules):
+                contribution = scorer(row[column], preferences, context)
+                contributions[j] = contribution
+                partial += contribution
+                if threshold is not None and partial + remaining[k + 1] <= threshold:
+                    pruned = True
+                    break
+            context.question_contributions.clear()
+            context.question_scores.clear()
+            context.match_reasons.clear()
+            if pruned:
+                continue
+            
+            # calculate_match_score와 같은 순서로 합산
+            total_score = 0.0
+            total_score += species_score
+            for j in active:
+                total_score += contributions[j]
+            score = normalize_score(total_score, custom_weights, default_weights)
+            if score <= 0:
+                continue
+            
+            heap = heaps.setdefault(group, [])
+            item = (score, -index, total_score)
+            if len(heap) < top_n:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+            else:
+                continue
+            if len(heap) == top_n:
+                # N번째 점수가 100(상한)이면 이후 종은 모두 동점 이하이므로 그 그룹은 더 볼 필요가 없다
+                if heap[0][0] >= 100:
+                    if group_column is None:
+                        break
+                    thresholds[group] = math.inf
+                else:
+                    thresholds[group] = heap[0][2]
         
-        return normalized_score, context
+        return {
+            group: [(score, -neg_index) for score, neg_index, _ in sorted(heap, reverse=True)]
+            for group, heap in heaps.items()
+        }
     
-    def calculate_monthly_cost_grade(self, species_row: pd.Series) -> int:
+    def rank(
+        self,
+        preferences: Dict[str, Any],
+        policy: ScoringPolicy,
+        top_n: int,
+        fields
+    ) -> List[Dict[str, Any]]:
         """
-        월 유지비 등급 계산
+        상위 N개 추천 카드 목록
         
-        공식: cost_score = 0.4 * 먹이빈도 + 0.4 * 온도습도 + 0.2 * (성체크기 * 1.7)
-        grade = max(1, min(5, int(round(cost_score))))
+        동시에 들어온 같은 요청끼리 공유하는 결과이므로 호출자는 수정하지 않는다.
         """
-        feeding = int(species_row['먹이빈도_등급'])
-        temp_humid = int(species_row['온도습도_5단계'])
-        size = int(species_row['성체크기_등급_3단계'])
+        custom_weights = self.resolve_weights(preferences, policy)
         
-        cost_score = 0.4 * feeding + 0.4 * temp_humid + 0.2 * (size * 1.7)
-        grade = max(1, min(5, int(round(cost_score))))
-        return grade
+        # 상위 N개만 추린 뒤 그 종만 추천 근거/기여도를 다시 계산해 카드로 변환
+        results = []
+        for _, index in self.top_scores(preferences, custom_weights, policy, top_n):
+            row = self.records[index]
+            score, context = self.calculate_match_score(row, preferences, custom_weights, policy)
+            results.append(self._result_card(score, row, context, fields))
+        return results
     
-    def generate_care_summary(self, species_row: pd.Series) -> str:
-        """사육 요약 생성"""
-        difficulty = int(species_row['사육_난이도_5단계'])
-        activity = species_row['활동패턴']
-        
-        difficulty_text = {
-            1: "초보자에게 적합한 난이도",
-            2: "초보자도 도전 가능한 난이도",
-            3: "중급자에게 적합한 난이도",
-            4: "고급자에게 적합한 난이도",
-            5: "전문가 수준의 난이도"
-        }.get(difficulty, "적당한 난이도")
+    def rank_groups(
+        self,
+        preferences: Dict[str, Any],
+        policy: ScoringPolicy,
+        top_n: int,
+        fields,
+        group_by: str
+    ) -> List[Dict[str, Any]]:
+        """
+        그룹별 상위 N개 추천 카드 ([{'group': 값, 'results': [카드, ...]}, ...])
         
-        activity_text = "주행성으로 낮 시간 활동이 활발합니다" if activity == "주행성" else "야행성으로 밤 시간 활동이 활발합니다"
+        종류로 묶으면 선택한 종류 순서대로 (후보가 없는 종류는 빈 목록),
+        그 밖의 그룹은 가장 높은 점수 순서로 나열한다.
+        """
+        custom_weights = self.resolve_weights(preferences, policy)
+        by_group = self.top_scores_by_group(preferences, custom_weights, policy, top_n, group_by)
         
-        return f"{difficulty_text}입니다. {activity_text}."
+        order = list(dict.fromkeys(preferences.get('종류') or [])) if group_by == '종류' else []
+        order += sorted(
+            (group for group in by_group if group not in order),
+            key=lambda group: (-by_group[group][0][0], by_group[group][0][1])
+        )
+        groups = []
+        for group in order:
+            results = []
+            for _, index in by_group.get(group, []):
+                row = self.records[index]
+                score, context = self.calculate_match_score(row, preferences, custom_weights, policy)
+                results.append(self._result_card(score, row, context, fields))
+            groups.append({'group': group, 'results': results})
+        return groups
     
     def recommend(
         self,
@@ -208,7 +584,7 @@ class RecommendationEngine:
         
         Args:
             preferences: 사용자 선호도
-            options: 옵션 (top_n, include_reasons 등)
+            options: 옵션 (top_n, include_reasons, fields, group_by 등)
         
         Returns:
             추천 결과 딕셔너리
@@ -218,62 +594,39 @@ class RecommendationEngine:
         
         top_n = options.get('top_n', 10)
         include_reasons = options.get('include_reasons', True)
+        # 응답에 넣을 필드 (None이면 전체, 추천 이유는 include_reasons일 때만)
+        fields = options.get('fields') or RESULT_FIELDS
+        if not include_reasons:
+            fields = [field for field in fields if field not in REASON_FIELDS]
         
-        # custom_weights 준비
-        custom_weights = preferences.get('custom_weights', {})
-        if not custom_weights:
-            custom_weights = WEIGHTS.copy()
-        
-        # 각 종에 대해 점수 계산
-        results = []
-        for idx, row in self.df.iterrows():
-            score, context = self.calculate_match_score(row, preferences, custom_weights)
-            
-            if score > 0:  # 종류 필터를 통과한 경우만
-                result = {
-                    '종_한글명': row['종_한글명'],
-                    '종류': row['종류'],
-                    '관상용_애완용': row['관상용_애완용'],
-                    '활동패턴': row.get('활동패턴', None),
-                    '사진_URL': row.get('사진_URL', ''),
-                    '사진_페이지_URL': row.get('사진_페이지_URL', ''),
-                    'match_score': round(score, 1),
-                    '사육_난이도_5단계': int(row.get('사육_난이도_5단계', 0)) if pd.notna(row.get('사육_난이도_5단계', None)) else None,
-                    '초기비용_등급_5단계': int(row['초기비용_등급_5단계']),
-                    '사육장_사이즈_3단계': int(row.get('사육장_사이즈_3단계', 0)) if pd.notna(row.get('사육장_사이즈_3단계', None)) else None,
-                    '핸들링적합도_5단계': int(row.get('핸들링적합도_5단계', 0)) if pd.notna(row.get('핸들링적합도_5단계', None)) else None,
-                    '예상_월유지비_등급_5단계': self.calculate_monthly_cost_grade(row),
-                    '사육_요약': self.generate_care_summary(row)
-                }
-                
-                if include_reasons:
-                    result['match_reasons'] = context.match_reasons[:2]  # 상위 2개
-                    # 질문별 기여도 정렬 (상위 5개)
-                    sorted_contributions = sorted(
-                        context.question_contributions.items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:5]
-                    result['question_contributions'] = {
-                        k: round(v, 1) for k, v in sorted_contributions
-                    }
-                
-                results.append((score, result))
-        
-        # 점수 순으로 정렬
-        results.sort(key=lambda x: x[0], reverse=True)
+        policy = self.choose_policy(options)
+        group_by = options.get('group_by')
         
-        # 상위 N개 선택
-        top_results = [r[1] for r in results[:top_n]]
+        # 같은 (카탈로그 리비전, 정책, 선호도, 옵션)의 동시 요청은 한 번 계산한 결과를 공유
+        key = self.coalescing_key(preferences, policy, top_n, fields, group_by)
+        if group_by:
+            ranked, _ = self.recommend_flight.do(
+                key, lambda: self.rank_groups(preferences, policy, top_n, fields, group_by)
+            )
+        else:
+            ranked, _ = self.recommend_flight.do(
+                key, lambda: self.rank(preferences, policy, top_n, fields)
+            )
         
-        # 요청 ID 생성
+        # 요청 ID 생성 (공유받은 결과여도 요청마다 새로 발급)
         request_id = f"req_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
         
-        return {
+        result = {
             'request_id': request_id,
             'dataset_version': self.dataset_version,
             'top_n': top_n,
-            'results': top_results,
-            'scoring_policy_version': 'v1.0'
+            'scoring_policy_version': policy.version
         }
+        # group_by가 있으면 results 대신 그룹별 상위 N개 (groups[].results는 같은 카드 형식)
+        if group_by:
+            result['group_by'] = group_by
+            result['groups'] = ranked
+        else:
+            result['results'] = ranked
+        return result
 
@@ -0,0 +1,293 @@
+"""
+추천 품질/성능 회귀 검사 CLI
+
+고정된 선호도 코퍼스(regression_corpus.json)로 현재 엔진을 실행해 저장된 기준선의
+상위 N개 순위/점수, 지연 시간, 메모리 할당과 비교한다. 점수 규칙이나 가중치를 바꾼 뒤 실행한다.
+
+    python regression_gate.py record              # 현재 엔진으로 기준선 기록
+    python regression_gate.py check               # 기준선과 비교 (임계값을 넘으면 종료 코드 1)
+    python regression_gate.py check --snapshot catalog.json --report gate.json
+
+비교 항목 (케이스별):
+  rank_correlation  기준선/현재 상위 N개의 Kendall tau-b (목록에 없는 종은 공동 최하위)
+  overlap           상위 N개 종 집합의 겹침 비율
+  max_score_delta   양쪽에 있는 종의 점수 차이 최댓값
+코퍼스 전체:
+  latency_ratio     케이스별 중앙값 지연 시간 합계의 기준선 대비 비율
+  alloc_ratio       케이스별 최대 할당량(tracemalloc) 합계의 기준선 대비 비율
+
+임계값은 코퍼스 파일의 thresholds가 기본이며 명령행 옵션으로 덮어쓴다.
+비율 임계값이 0 이하이면 해당 검사는 건너뛴다 (기준선과 다른 장비에서 실행할 때).
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+
+from batch_score import load_engine
+from recommendation_engine import RecommendationEngine
+from request_schema import decode_preferences
+
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS_PATH = os.path.join(BACKEND_DIR, 'regression_corpus.json')
+DEFAULT_BASELINE_PATH = os.path.join(BACKEND_DIR, 'regression_baseline.json')
+
+THRESHOLD_KEYS = ('min_rank_correlation', 'min_overlap', 'max_score_delta', 'max_latency_ratio', 'max_alloc_ratio')
+
+# (종명, 점수) 순위 목록
+Ranking = List[Tuple[str, float]]
+
+
+def load_corpus(path: str) -> Dict[str, Any]:
+    """코퍼스 로드 후 케이스별 선호도를 API와 같은 규칙으로 검증"""
+    with open(path, 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+    seen = set()
+    for case in corpus['cases']:
+        if case['id'] in seen:
+            raise ValueError(f"코퍼스 케이스 ID가 중복되었습니다: {case['id']}")
+        seen.add(case['id'])
+        preferences, errors = decode_preferences({'preferences': case['preferences']})
+        if errors:
+            raise ValueError(f"코퍼스 케이스 {case['id']}의 선호도가 유효하지 않습니다: {errors}")
+        case['decoded'] = preferences
+    return corpus
+
+
+def rank_case(engine: RecommendationEngine, preferences: Dict[str, Any], top_n: int) -> Ranking:
+    """기본 정책으로 상위 N개 (종명, 점수)"""
+    result = engine.recommend(preferences, {'top_n': top_n})
+    return [(card['종_한글명'], card['match_score']) for card in result['results']]
+
+
+def measure_latency(engine: RecommendationEngine, preferences: Dict[str, Any], top_n: int,
+                    repeat: int) -> List[float]:
+    """한 번 예열 후 repeat회 추천 지연 시간(ms)"""
+    engine.recommend(preferences, {'top_n': top_n})
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        engine.recommend(preferences, {'top_n': top_n})
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def measure_peak_alloc(engine: RecommendationEngine, preferences: Dict[str, Any], top_n: int) -> int:
+    """추천 한 번의 최대 추가 할당량(바이트, tracemalloc)"""
+    engine.recommend(preferences, {'top_n': top_n})
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        engine.recommend(preferences, {'top_n': top_n})
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before
+
+
+def run_corpus(engine: RecommendationEngine, corpus: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """
+    코퍼스 전체 실행
+
+    지연 시간 측정을 모두 마친 뒤 할당량을 측정한다 (tracemalloc 추적 중에는 느려지므로).
+    """
+    top_n = corpus['top_n']
+    cases = {}
+    all_samples = []
+    for case in corpus['cases']:
+        samples = measure_latency(engine, case['decoded'], top_n, repeat)
+        all_samples.extend(samples)
+        cases[case['id']] = {
+            'ranking': rank_case(engine, case['decoded'], top_n),
+            'latency_ms': round(statistics.median(samples), 4)
+        }
+    for case in corpus['cases']:
+        cases[case['id']]['peak_alloc_bytes'] = measure_peak_alloc(engine, case['decoded'], top_n)
+
+    all_samples.sort()
+    return {
+        'dataset_version': engine.dataset_version,
+        'top_n': top_n,
+        'cases': cases,
+        'latency_ms': round(sum(case['latency_ms'] for case in cases.values()), 4),
+        'latency_p95_ms': round(all_samples[int(len(all_samples) * 0.95) - 1], 4) if all_samples else 0.0,
+        'peak_alloc_bytes': sum(case['peak_alloc_bytes'] for case in cases.values())
+    }
+
+
+def kendall_tau_b(expected: List[str], actual: List[str]) -> float:
+    """
+    두 상위 N개 목록의 Kendall tau-b
+
+    두 목록에 나온 종 전체를 대상으로 하며, 한쪽 목록에 없는 종은 그 목록의 공동 최하위로 본다.
+    """
+    items = list(dict.fromkeys(expected + actual))
+    if len(items) < 2:
+        return 1.0 if expected == actual else 0.0
+    expected_rank = {name: i for i, name in enumerate(expected)}
+    actual_rank = {name: i for i, name in enumerate(actual)}
+    ranks = [
+        (expected_rank.get(name, len(expected)), actual_rank.get(name, len(actual)))
+        for name in items
+    ]
+
+    concordant = discordant = ties_expected = ties_actual = 0
+    for i in range(len(ranks)):
+        for j in range(i + 1, len(ranks)):
+            d_expected = ranks[i][0] - ranks[j][0]
+            d_actual = ranks[i][1] - ranks[j][1]
+            if d_expected == 0 and d_actual == 0:
+                continue
+            if d_expected == 0:
+                ties_expected += 1
+            elif d_actual == 0:
+                ties_actual += 1
+            elif (d_expected > 0) == (d_actual > 0):
+                concordant += 1
+            else:
+                discordant += 1
+
+    denominator = math.sqrt((concordant + discordant + ties_expected) * (concordant + discordant + ties_actual))
+    if denominator == 0:
+        return 1.0 if expected == actual else 0.0
+    return (concordant - discordant) / denominator
+
+
+def compare_rankings(expected: Ranking, actual: Ranking) -> Dict[str, Any]:
+    """케이스 하나의 순위 비교 지표"""
+    expected_names = [name for name, _ in expected]
+    actual_names = [name for name, _ in actual]
+    common = set(expected_names) & set(actual_names)
+    size = max(len(expected_names), len(actual_names))
+    expected_scores = dict(expected)
+    actual_scores = dict(actual)
+    return {
+        'rank_correlation': round(kendall_tau_b(expected_names, actual_names), 4),
+        'overlap': round(len(common) / size, 4) if size else 1.0,
+        'max_score_delta': round(max((abs(actual_scores[name] - expected_scores[name]) for name in common),
+                                     default=0.0), 4),
+        'dropped': [name for name in expected_names if name not in common],
+        'added': [name for name in actual_names if name not in common]
+    }
+
+
+def _ratio(current: float, baseline: float) -> float:
+    return round(current / baseline, 4) if baseline else 1.0
+
+
+def check(baseline: Dict[str, Any], current: Dict[str, Any], thresholds: Dict[str, float]) -> Dict[str, Any]:
+    """
+    기준선과 현재 실행 결과 비교
+
+    Returns:
+        보고서 딕셔너리 (passed, failures, 케이스별 지표, 지연/할당 비율)
+    """
+    failures = []
+    cases = {}
+    for case_id, result in current['cases'].items():
+        if case_id not in baseline['cases']:
+            failures.append(f"{case_id}: 기준선에 없는 케이스입니다 (record로 다시 기록하세요)")
+            continue
+        metrics = compare_rankings(baseline['cases'][case_id]['ranking'], result['ranking'])
+        metrics['latency_ratio'] = _ratio(result['latency_ms'], baseline['cases'][case_id]['latency_ms'])
+        metrics['alloc_ratio'] = _ratio(result['peak_alloc_bytes'], baseline['cases'][case_id]['peak_alloc_bytes'])
+        cases[case_id] = metrics
+
+        if metrics['rank_correlation'] < thresholds['min_rank_correlation']:
+            failures.append(f"{case_id}: 순위 상관 {metrics['rank_correlation']} < {thresholds['min_rank_correlation']}")
+        if metrics['overlap'] < thresholds['min_overlap']:
+            failures.append(f"{case_id}: 상위 {current['top_n']}개 겹침 {metrics['overlap']} < {thresholds['min_overlap']}")
+        if metrics['max_score_delta'] > thresholds['max_score_delta']:
+            failures.append(f"{case_id}: 점수 차이 {metrics['max_score_delta']} > {thresholds['max_score_delta']}")
+
+    missing = [case_id for case_id in baseline['cases'] if case_id not in current['cases']]
+    if missing:
+        failures.append(f"코퍼스에서 빠진 기준선 케이스가 있습니다: {missing}")
+
+    latency_ratio = _ratio(current['latency_ms'], baseline['latency_ms'])
+    alloc_ratio = _ratio(current['peak_alloc_bytes'], baseline['peak_alloc_bytes'])
+    if 0 < thresholds['max_latency_ratio'] < latency_ratio:
+        failures.append(f"지연 시간 {current['latency_ms']}ms (기준선 {baseline['latency_ms']}ms), "
+                        f"비율 {latency_ratio} > {thresholds['max_latency_ratio']}")
+    if 0 < thresholds['max_alloc_ratio'] < alloc_ratio:
+        failures.append(f"최대 할당량 {current['peak_alloc_bytes']}B (기준선 {baseline['peak_alloc_bytes']}B), "
+                        f"비율 {alloc_ratio} > {thresholds['max_alloc_ratio']}")
+
+    return {
+        'passed': not failures,
+        'failures': failures,
+        'thresholds': thresholds,
+        'dataset_version': current['dataset_version'],
+        'baseline_dataset_version': baseline['dataset_version'],
+        'baseline_recorded_at': baseline.get('recorded_at'),
+        'min_rank_correlation': min((m['rank_correlation'] for m in cases.values()), default=1.0),
+        'min_overlap': min((m['overlap'] for m in cases.values()), default=1.0),
+        'latency_ms': current['latency_ms'],
+        'baseline_latency_ms': baseline['latency_ms'],
+        'latency_ratio': latency_ratio,
+        'latency_p95_ms': current['latency_p95_ms'],
+        'peak_alloc_bytes': current['peak_alloc_bytes'],
+        'baseline_peak_alloc_bytes': baseline['peak_alloc_bytes'],
+        'alloc_ratio': alloc_ratio,
+        'cases': cases
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='추천 순위/지연 시간/메모리 회귀 검사')
+    parser.add_argument('command', choices=['record', 'check'], help='record: 기준선 기록, check: 기준선과 비교')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_PATH, help='선호도 코퍼스 경로')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help='기준선 경로')
+    parser.add_argument('--snapshot', help='카탈로그 스냅샷 경로 (없으면 원본 데이터 파일)')
+    parser.add_argument('--data', help='원본 CSV/Excel 경로 (기본: find_data_file 우선순위)')
+    parser.add_argument('--repeat', type=int, default=20, help='케이스별 지연 시간 측정 횟수 (기본 20)')
+    parser.add_argument('--report', help='비교 보고서(JSON) 저장 경로')
+    for key in THRESHOLD_KEYS:
+        parser.add_argument('--' + key.replace('_', '-'), type=float, help=f'임계값 {key} (기본: 코퍼스 파일)')
+    return parser
+
+
+if __name__ == '__main__':
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error('--repeat은 1 이상이어야 합니다')
+
+    corpus = load_corpus(args.corpus)
+    # 정책 파일과 무관하게 코드의 기본 정책(WEIGHTS)으로 비교
+    engine = load_engine(args.snapshot, args.data, None)
+    current = run_corpus(engine, corpus, args.repeat)
+
+    if args.command == 'record':
+        current['recorded_at'] = datetime.now().isoformat(timespec='seconds')
+        current['repeat'] = args.repeat
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"기준선 기록: {args.baseline} ({len(current['cases'])}개 케이스, "
+              f"{current['latency_ms']}ms, {current['peak_alloc_bytes']}B)")
+        sys.exit(0)
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    thresholds = dict(corpus['thresholds'])
+    for key in THRESHOLD_KEYS:
+        if getattr(args, key) is not None:
+            thresholds[key] = getattr(args, key)
+
+    report = check(baseline, current, thresholds)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if not report['passed']:
+        print('\n'.join(['회귀 검사 실패:'] + report['failures']), file=sys.stderr)
+    sys.exit(0 if report['passed'] else 1)
@@ -0,0 +1,414 @@
+"""API 입력 스키마 (모듈 로드 시 한 번 컴파일되는 디코더)"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict
+
+import math
+
+from catalog import LIST_ITEM_FIELDS, decode_list_cursor
+from climate_ranges import CLIMATE_QUERY_PARAMS, CLIMATE_RANGE_COLUMNS
+from recommendation_engine import GROUP_BY_FIELDS, RESULT_FIELDS
+
+
+ALLOWED_ACTIVITY_PATTERNS = ('야행성', '주행성')
+ALLOWED_DIET_TYPES = ('잡식', '초식', '육식')
+ALLOWED_PURPOSES = ('관상용', '애완용', '둘 다')
+
+
+class Preferences(TypedDict, total=False):
+    """디코딩된 선호도 (빈 문자열 범주형 값은 None으로 정규화)"""
+    종류: List[str]
+    종류_가중치: Dict[str, float]
+    사육_난이도_5단계: Optional[int]
+    초기비용_등급_5단계_max: Optional[int]
+    사육장_사이즈_3단계_max: Optional[int]
+    먹이빈도_등급_prefer: Optional[int]
+    핸들링적합도_5단계_prefer: Optional[int]
+    활동패턴: Optional[str]
+    식성타입: Optional[str]
+    관상용_애완용: Optional[str]
+    외형태그: Optional[List[str]]
+    custom_weights: Dict[str, float]
+
+
+class RecommendOptions(TypedDict, total=False):
+    """디코딩된 추천 옵션"""
+    top_n: int
+    include_reasons: bool
+    scoring_policy: Optional[str]
+    policy_key: Optional[str]
+    fields: Optional[List[str]]
+    group_by: Optional[str]
+
+
+class ListQuery(TypedDict):
+    """디코딩된 /api/species/list 쿼리"""
+    q: str
+    difficulty: Optional[int]
+    type: Optional[str]
+    limit: Optional[int]
+    cursor: Optional[Tuple[Optional[str], Optional[int], Optional[str]]]
+    fields: Optional[List[str]]
+    climate: List[Tuple[str, Optional[float], Optional[float]]]
+    climate_match: str
+
+
+class Field:
+    """
+    스키마 필드 선언
+
+    kind:
+      'type_list'  최소 1개 이상의 문자열 목록 (문자열이 아닌 항목이 있으면 실패)
+      'grade'      min_value-max_value 범위의 정수 또는 None
+      'choice'     choices 중 하나, '' 또는 None (''은 None으로 정규화)
+      'str_list'   문자열 목록 또는 None
+      'weight_map' 문자열 -> 숫자 객체
+      'int'        min_value 이상(최대 max_value로 제한)의 정수
+      'bool'       참/거짓
+      'str'        문자열 또는 None
+      'query_int'  쿼리 문자열 정수 ('' 이면 미지정, max_value 초과는 잘라냄)
+      'query_float' 쿼리 문자열 실수 ('' 이면 미지정, min_value-max_value 범위)
+      'query_str'  쿼리 문자열 (앞뒤 공백 제거, '' 이면 미지정)
+      'fields'     응답 필드 목록 (목록 또는 쉼표 구분 문자열, choices가 있으면 그 안에서만)
+      'cursor'     목록 페이지 커서 (catalog.encode_list_cursor 형식)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        message: str,
+        required: bool = False,
+        min_value: Optional[int] = None,
+        max_value: Optional[int] = None,
+        choices: Tuple[Any, ...] = (),
+        default: Any = None,
+        clamp: bool = False
+    ):
+        self.name = name
+        self.kind = kind
+        self.message = message
+        self.required = required
+        self.min_value = min_value
+        self.max_value = max_value
+        self.choices = choices
+        self.default = default
+        self.clamp = clamp
+
+
+# 검증 함수: (값) -> (정규화된 값, 유효 여부)
+Validator = Callable[[Any], Tuple[Any, bool]]
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int)
+
+
+def _compile_field(field: Field) -> Validator:
+    """필드 선언을 검증 함수로 변환 (상수는 클로저에 미리 바인딩)"""
+    lo, hi = field.min_value, field.max_value
+
+    if field.kind == 'type_list':
+        def validate(value):
+            ok = isinstance(value, list) and len(value) > 0 and all(isinstance(item, str) for item in value)
+            return value, ok
+    elif field.kind == 'grade':
+        def validate(value):
+            if value is None:
+                return None, True
+            return value, _is_int(value) and lo <= value <= hi
+    elif field.kind == 'choice':
+        allowed = frozenset(field.choices)
+
+        def validate(value):
+            if value is None or value == '':
+                return None, True
+            return value, isinstance(value, str) and value in allowed
+    elif field.kind == 'str_list':
+        def validate(value):
+            if value is None:
+                return None, True
+            ok = isinstance(value, list) and all(isinstance(item, str) for item in value)
+            return value, ok
+    elif field.kind == 'weight_map':
+        def validate(value):
+            ok = isinstance(value, dict) and all(
+                isinstance(key, str) and isinstance(weight, (int, float)) and not isinstance(weight, bool)
+                for key, weight in value.items()
+            )
+            return value, ok
+    elif field.kind == 'int':
+        def validate(value):
+            if not _is_int(value) or isinstance(value, bool) or value < lo:
+                return value, False
+            return (min(value, hi) if hi is not None else value), True
+    elif field.kind == 'bool':
+        def validate(value):
+            return value, isinstance(value, bool)
+    elif field.kind == 'str':
+        def validate(value):
+            return value, value is None or isinstance(value, str)
+    elif field.kind == 'query_int':
+        def validate(value):
+            text = str(value).strip()
+            if text == '':
+                return None, True
+            try:
+                number = int(text)
+            except ValueError:
+                return None, False
+            if field.clamp:
+                return max(lo, min(hi, number)), True
+            return number, lo <= number <= hi
+    elif field.kind == 'query_float':
+        def validate(value):
+            text = str(value).strip()
+            if text == '':
+                return None, True
+            try:
+                number = float(text)
+            except ValueError:
+                return None, False
+            return number, math.isfinite(number) and lo <= number <= hi
+    elif field.kind == 'query_str':
+        def validate(value):
+            text = str(value).strip()
+            return (text or None), True
+    elif field.kind == 'fields':
+        allowed = frozenset(field.choices)
+
+        def validate(value):
+            if value is None:
+                return None, True
+            if isinstance(value, str):
+                value = [name.strip() for name in value.split(',') if name.strip()]
+            if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+                return None, False
+            if allowed and not all(name in allowed for name in value):
+                return None, False
+            # 중복 제거 (요청 순서 유지), 비어 있으면 미지정
+            return (list(dict.fromkeys(value)) or None), True
+    elif field.kind == 'cursor':
+        def validate(value):
+            text = str(value).strip()
+            if text == '':
+                return None, True
+            key = decode_list_cursor(text)
+            return key, key is not None
+    else:
+        raise ValueError(f"알 수 없는 필드 종류입니다: {field.kind}")
+    return validate
+
+
+class CompiledSchema:
+    """
+    필드 선언 목록을 컴파일한 디코더
+
+    decode(obj)는 선언된 필드만 검증/정규화해서 새 딕셔너리로 돌려주고,
+    오류 메시지는 선언 순서대로 모은다. 선언되지 않은 키는 버린다.
+    """
+
+    def __init__(self, fields: List[Field]):
+        self.fields = fields
+        self._compiled = [
+            (field.name, field.required, field.message, field.default, _compile_field(field))
+            for field in fields
+        ]
+
+    def decode(self, obj: Dict[str, Any], partial: bool = False) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Returns:
+            (정규화된 값, 오류 목록)
+
+        partial=True이면 필수 필드가 없어도 오류로 보지 않는다 (설문 진행 중 부분 답변).
+        """
+        out = {}
+        errors = []
+        for name, required, message, default, validate in self._compiled:
+            if name in obj:
+                value, ok = validate(obj[name])
+                if ok:
+                    out[name] = value
+                else:
+                    errors.append(message)
+            elif required and not partial:
+                errors.append(message)
+            elif default is not None:
+                out[name] = default
+        return out, errors
+
+
+PREFERENCES_SCHEMA = CompiledSchema([
+    Field('종류', 'type_list', "'종류'는 최소 1개 이상 선택해야 합니다", required=True),
+    Field('사육_난이도_5단계', 'grade', "'사육_난이도_5단계'는 1-5 범위의 정수여야 합니다", min_value=1, max_value=5),
+    Field('초기비용_등급_5단계_max', 'grade', "'초기비용_등급_5단계_max'는 1-5 범위의 정수여야 합니다",
+          min_value=1, max_value=5),
+    Field('사육장_사이즈_3단계_max', 'grade', "'사육장_사이즈_3단계_max'는 1-3 범위의 정수여야 합니다",
+          min_value=1, max_value=3),
+    Field('먹이빈도_등급_prefer', 'grade', "'먹이빈도_등급_prefer'는 1-5 범위의 정수여야 합니다", min_value=1, max_value=5),
+    Field('핸들링적합도_5단계_prefer', 'grade', "'핸들링적합도_5단계_prefer'는 1-5 범위의 정수여야 합니다",
+          min_value=1, max_value=5),
+    Field('활동패턴', 'choice', "'활동패턴'은 '야행성', '주행성' 또는 None이어야 합니다",
+          choices=ALLOWED_ACTIVITY_PATTERNS),
+    Field('식성타입', 'choice', "'식성타입'은 '잡식', '초식', '육식' 또는 None이어야 합니다", choices=ALLOWED_DIET_TYPES),
+    Field('관상용_애완용', 'choice', "'관상용_애완용'은 '관상용', '애완용', '둘 다' 또는 None이어야 합니다",
+          choices=ALLOWED_PURPOSES),
+    Field('외형태그', 'str_list', "'외형태그'는 문자열 목록이어야 합니다"),
+    Field('종류_가중치', 'weight_map', "'종류_가중치'는 종류별 숫자 가중치 객체여야 합니다"),
+    Field('custom_weights', 'weight_map', "'custom_weights'는 질문별 숫자 가중치 객체여야 합니다"),
+])
+
+RECOMMEND_OPTIONS_SCHEMA = CompiledSchema([
+    Field('top_n', 'int', "'top_n'은 1 이상의 정수여야 합니다", min_value=1, default=10),
+    Field('include_reasons', 'bool', "'include_reasons'는 true/false여야 합니다", default=True),
+    Field('scoring_policy', 'str', "'scoring_policy'는 문자열이어야 합니다"),
+    Field('policy_key', 'str', "'policy_key'는 문자열이어야 합니다"),
+    Field('fields', 'fields', f"'fields'는 {list(RESULT_FIELDS)} 중에서 골라야 합니다", choices=RESULT_FIELDS),
+    Field('group_by', 'choice', f"'group_by'는 {list(GROUP_BY_FIELDS)} 중 하나 또는 None이어야 합니다",
+          choices=GROUP_BY_FIELDS),
+])
+
+SESSION_OPTIONS_SCHEMA = CompiledSchema([
+    Field('top_n', 'int', "'top_n'은 1 이상의 정수여야 합니다", min_value=1, max_value=50, default=5),
+    Field('scoring_policy', 'str', "'scoring_policy'는 문자열이어야 합니다"),
+    Field('policy_key', 'str', "'policy_key'는 문자열이어야 합니다"),
+])
+
+# 기후 범위 쿼리 허용 범위 (단위별)
+CLIMATE_QUERY_LIMITS = {'°C': (-50, 100), '%': (0, 100)}
+
+
+def _climate_query_fields() -> List[Field]:
+    fields = []
+    for prefix, column in CLIMATE_QUERY_PARAMS:
+        low, high = CLIMATE_QUERY_LIMITS[CLIMATE_RANGE_COLUMNS[column][2]]
+        for suffix in ('min', 'max'):
+            name = f"{prefix}_{suffix}"
+            fields.append(Field(name, 'query_float', f"'{name}'는 {low}~{high} 범위의 숫자여야 합니다",
+                                min_value=low, max_value=high))
+    return fields
+
+
+LIST_QUERY_SCHEMA = CompiledSchema([
+    Field('q', 'query_str', "'q'는 문자열이어야 합니다"),
+    Field('difficulty', 'query_int', "'difficulty'는 1-5 범위의 정수여야 합니다", min_value=1, max_value=5),
+    Field('type', 'query_str', "'type'은 문자열이어야 합니다"),
+    Field('limit', 'query_int', "'limit'는 정수여야 합니다", min_value=1, max_value=500, clamp=True),
+    Field('cursor', 'cursor', "'cursor'가 올바르지 않습니다"),
+    Field('fields', 'fields', f"'fields'는 {list(LIST_ITEM_FIELDS)} 중에서 골라야 합니다", choices=LIST_ITEM_FIELDS),
+    Field('climate_match', 'choice', "'climate_match'는 'overlap' 또는 'contains'여야 합니다",
+          choices=('overlap', 'contains'), default='overlap'),
+] + _climate_query_fields())
+
+# 상세 조회 필드는 데이터셋 컬럼에 따라 달라지므로 형식만 검증 (컬럼 확인은 호출자)
+SPECIES_QUERY_SCHEMA = CompiledSchema([
+    Field('fields', 'fields', "'fields'는 쉼표로 구분한 컬럼 이름이어야 합니다"),
+])
+
+IMAGE_QUERY_SCHEMA = CompiledSchema([
+    Field('w', 'query_int', "'w'는 1 이상의 정수여야 합니다", min_value=1, max_value=10000),
+])
+
+MEMORY_QUERY_SCHEMA = CompiledSchema([
+    Field('trace', 'choice', "'trace'는 'start' 또는 'stop'이어야 합니다", choices=('start', 'stop')),
+    Field('top', 'query_int', "'top'은 1-100 범위의 정수여야 합니다", min_value=1, max_value=100, default=10),
+    Field('frames', 'query_int', "'frames'는 1-20 범위의 정수여야 합니다", min_value=1, max_value=20, default=1),
+])
+
+
+def _object_or_error(data: Any, name: str) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    value = data.get(name) if isinstance(data, dict) else None
+    if value is None:
+        return {}, []
+    if not isinstance(value, dict):
+        return None, [f"'{name}'는 객체여야 합니다"]
+    return value, []
+
+
+def decode_preferences(data: Any, partial: bool = False) -> Tuple[Optional[Preferences], List[str]]:
+    """요청 본문의 preferences 디코딩"""
+    if not isinstance(data, dict) or 'preferences' not in data:
+        return None, ["'preferences' 필드가 필요합니다"]
+    prefs = data['preferences']
+    if not isinstance(prefs, dict):
+        return None, ["'preferences'는 객체여야 합니다"]
+    decoded, errors = PREFERENCES_SCHEMA.decode(prefs, partial)
+    return (None if errors else decoded), errors
+
+
+def decode_recommend_request(data: Any) -> Tuple[Optional[Preferences], Optional[RecommendOptions], List[str]]:
+    """/api/recommend, /api/recommend/matrix 요청 본문 디코딩"""
+    preferences, errors = decode_preferences(data)
+    raw_options, option_errors = _object_or_error(data, 'options')
+    options = None
+    if raw_options is not None:
+        options, more_errors = RECOMMEND_OPTIONS_SCHEMA.decode(raw_options)
+        option_errors += more_errors
+    errors = errors + option_errors
+    if errors:
+        return None, None, errors
+    return preferences, options, []
+
+
+def decode_session_options(data: Any) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """점수 세션 요청의 options 디코딩"""
+    raw_options, errors = _object_or_error(data, 'options')
+    if raw_options is None:
+        return None, errors
+    options, errors = SESSION_OPTIONS_SCHEMA.decode(raw_options)
+    return (None if errors else options), errors
+
+
+def decode_session_request(data: Any) -> Tuple[Optional[Preferences], Optional[Dict[str, Any]], List[str]]:
+    """/api/session 생성 요청 본문 디코딩 (preferences는 생략 가능, 부분 답변 허용)"""
+    if not isinstance(data, dict):
+        return None, None, ["요청 본문은 JSON 객체여야 합니다"]
+    preferences, errors = decode_preferences({'preferences': data.get('preferences', {})}, partial=True)
+    options, option_errors = decode_session_options(data)
+    errors = errors + option_errors
+    if errors:
+        return None, None, errors
+    return preferences, options, []
+
+
+def decode_list_query(args: Dict[str, str]) -> Tuple[Optional[ListQuery], List[str]]:
+    """/api/species/list 쿼리 디코딩"""
+    decoded, errors = LIST_QUERY_SCHEMA.decode(args)
+    if errors:
+        return None, errors
+    # 기후 범위 조건: 최저/최고 중 하나만 있으면 다른 쪽은 제한 없음
+    climate = []
+    for prefix, column in CLIMATE_QUERY_PARAMS:
+        low, high = decoded.get(f"{prefix}_min"), decoded.get(f"{prefix}_max")
+        if low is not None and high is not None and low > high:
+            errors.append(f"'{prefix}_min'은 '{prefix}_max'보다 클 수 없습니다")
+        if low is not None or high is not None:
+            climate.append((column, low, high))
+    if errors:
+        return None, errors
+    return ListQuery(
+        q=decoded.get('q') or '',
+        difficulty=decoded.get('difficulty'),
+        type=decoded.get('type'),
+        limit=decoded.get('limit'),
+        cursor=decoded.get('cursor'),
+        fields=decoded.get('fields'),
+        climate=climate,
+        climate_match=decoded.get('climate_match') or 'overlap'
+    ), []
+
+
+def decode_species_query(args: Dict[str, str]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """/api/species/<name> 쿼리 디코딩"""
+    decoded, errors = SPECIES_QUERY_SCHEMA.decode(args)
+    return (None if errors else decoded), errors
+
+
+def decode_image_query(args: Dict[str, str]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """/api/species/<name>/image 쿼리 디코딩"""
+    decoded, errors = IMAGE_QUERY_SCHEMA.decode(args)
+    return (None if errors else decoded), errors
+
+
+def decode_memory_query(args: Dict[str, str]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """/api/debug/memory 쿼리 디코딩"""
+    decoded, errors = MEMORY_QUERY_SCHEMA.decode(args)
+    return (None if errors else decoded), errors
@@ -1,19 +1,39 @@
 """점수 계산 헬퍼 함수들"""
 from typing import Dict, Any, Optional, List, Tuple
-import pandas as pd
+
+from catalog import is_missing
+from scoring_rules import RULE_SPECS, compile_score_tables
+
+
+# 규칙별 점수표 (규칙 파일의 points, 정책마다 일부 항목만 바꿔 쓸 수 있음)
+DEFAULT_SCORE_TABLES: Dict[str, Dict[str, float]] = {key: dict(spec.points) for key, spec in RULE_SPECS.items()}
 
 
 class ScoringContext:
     """점수 계산 컨텍스트"""
-    def __init__(self, preferences: Dict[str, Any], custom_weights: Dict[str, int]):
+    def __init__(
+        self,
+        preferences: Dict[str, Any],
+        custom_weights: Dict[str, int],
+        default_weights: Optional[Dict[str, int]] = None,
+        score_tables: Optional[Dict[str, Dict[str, float]]] = None
+    ):
         self.preferences = preferences
         self.custom_weights = custom_weights
+        # 정책 기본 가중치/점수표 (없으면 각 규칙의 기본값)
+        self.default_weights = default_weights or {}
+        self.score_tables = score_tables or DEFAULT_SCORE_TABLES
+        # 점수표로 컴파일된 조회 배열 (점수표마다 한 번만 컴파일)
+        self.rules = compile_score_tables(self.score_tables)
         self.question_contributions = {}
+        self.question_scores = {}
         self.match_reasons = []
     
     def get_weight(self, question_key: str, default_weight: int) -> int:
-        """질문별 가중치 가져오기 (custom_weights 우선)"""
-        return self.custom_weights.get(question_key, default_weight)
+        """질문별 가중치 가져오기 (custom_weights > 정책 기본 가중치 > 규칙 기본값)"""
+        if question_key in self.custom_weights:
+            return self.custom_weights[question_key]
+        return self.default_weights.get(question_key, default_weight)
     
     def add_contribution(self, question_key: str, score: float):
         """질문별 기여도 추가"""
@@ -21,14 +41,42 @@ class ScoringContext:
             self.question_contributions[question_key] = 0
         self.question_contributions[question_key] += score
     
+    def add_score(self, question_key: str, score: float):
+        """질문별 가중치 적용 전 점수(0-100) 기록 (키는 가중치 키)"""
+        self.question_scores[question_key] = score
+    
     def add_reason(self, reason: str):
         """추천 근거 추가"""
         self.match_reasons.append(reason)
 
 
+def apply_rule(rule_key: str, species_value: Any, answer: Any, context: ScoringContext) -> float:
+    """컴파일된 규칙으로 점수 조회 후 근거/점수/기여도 기록"""
+    rule = context.rules[rule_key]
+    # get_weight와 같은 우선순위 (custom_weights > 정책 기본 가중치 > 규칙 기본값)
+    custom_weights = context.custom_weights
+    if rule_key in custom_weights:
+        weight = custom_weights[rule_key]
+    else:
+        weight = context.default_weights.get(rule_key, rule.default_weight)
+    if weight == 0:
+        return 0
+    
+    score, reason = rule.lookup(species_value, answer)
+    if reason:
+        context.match_reasons.append(reason)
+    
+    # add_score/add_contribution과 같은 기록
+    context.question_scores[rule_key] = score
+    contribution = (score / 100) * weight
+    contributions = context.question_contributions
+    contributions[rule.contribution_key] = contributions.get(rule.contribution_key, 0) + contribution
+    return contribution
+
+
 def normalize_appearance_tag(tag: str) -> str:
     """외형태그 정규화: "멋지다", "멋있고" → "멋있다" """
-    if pd.isna(tag) or not tag:
+    if is_missing(tag) or not tag:
         return ""
     tag = str(tag).strip()
     # "멋지다", "멋있고" → "멋있다"
@@ -39,7 +87,7 @@ def normalize_appearance_tag(tag: str) -> str:
 
 def parse_appearance_tags(tags_str: str) -> List[str]:
     """외형태그 문자열 파싱"""
-    if pd.isna(tags_str) or not tags_str:
+    if is_missing(tags_str) or not tags_str:
         return []
     tags = [normalize_appearance_tag(t.strip()) for t in str(tags_str).split(',')]
     return [t for t in tags if t]
@@ -53,37 +101,7 @@ def calculate_difficulty_score(
     """사육 난이도 점수 계산"""
     if user_preference is None:
         return 0
-    
-    weight = context.get_weight('사육_난이도_5단계', 20)
-    if weight == 0:
-        return 0
-    
-    diff = species_value - user_preference
-    
-    if diff == 0:
-        score = 100
-        context.add_reason("사육 난이도가 선호하신 난이도와 일치합니다")
-    elif diff < 0:  # 더 쉬움
-        if diff == -1:
-            score = 90
-            context.add_reason("사육 난이도가 선호하신 난이도보다 1단계 쉬움")
-        elif diff == -2:
-            score = 75
-            context.add_reason("사육 난이도가 선호하신 난이도보다 2단계 쉬움")
-        else:  # -3 이상
-            score = 60
-            context.add_reason("사육 난이도가 선호하신 난이도보다 훨씬 쉬움")
-    else:  # 더 어려움
-        if diff == 1:
-            score = 50
-            context.add_reason("사육 난이도가 선호하신 난이도보다 1단계 어려움")
-        else:  # 2 이상
-            score = 25
-            context.add_reason("사육 난이도가 선호하신 난이도보다 훨씬 어려움")
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('사육_난이도', contribution)
-    return contribution
+    return apply_rule('사육_난이도_5단계', species_value, user_preference, context)
 
 
 def calculate_initial_cost_score(
@@ -94,26 +112,7 @@ def calculate_initial_cost_score(
     """초기 비용 점수 계산"""
     if user_max is None:
         return 0
-    
-    weight = context.get_weight('초기비용_등급_5단계', 15)
-    if weight == 0:
-        return 0
-    
-    if species_value <= user_max:
-        score = 100
-        context.add_reason("초기 비용이 예산 범위 내입니다")
-    else:
-        diff = species_value - user_max
-        if diff == 1:
-            score = 33
-            context.add_reason("초기 비용이 예산 범위를 1단계 초과합니다")
-        else:
-            score = 0
-            context.add_reason("초기 비용이 예산 범위를 크게 초과합니다")
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('초기비용', contribution)
-    return contribution
+    return apply_rule('초기비용_등급_5단계', species_value, user_max, context)
 
 
 def calculate_temperature_humidity_score(
@@ -121,17 +120,8 @@ def calculate_temperature_humidity_score(
     context: ScoringContext
 ) -> float:
     """온도/습도 점수 계산 (기본적으로 낮을수록 좋음)"""
-    weight = context.get_weight('온도습도_5단계', 10)
-    if weight == 0:
-        return 0
-    
-    # 낮을수록 좋음 (1=100%, 2=80%, 3=60%, 4=40%, 5=20%)
-    score = 100 - (species_value - 1) * 20
-    score = max(0, min(100, score))
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('온도습도', contribution)
-    return contribution
+    # 낮을수록 좋음 (기본: 1=100%, 2=80%, 3=60%, 4=40%, 5=20%)
+    return apply_rule('온도습도_5단계', species_value, None, context)
 
 
 def calculate_activity_pattern_score(
@@ -142,20 +132,7 @@ def calculate_activity_pattern_score(
     """활동 패턴 점수 계산"""
     if user_preference is None or not user_preference:
         return 0
-    
-    weight = context.get_weight('활동패턴', 10)
-    if weight == 0:
-        return 0
-    
-    if str(species_value) == str(user_preference):
-        score = 100
-        context.add_reason(f"활동 패턴이 {user_preference}으로 일치합니다")
-    else:
-        score = 0
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('활동패턴', contribution)
-    return contribution
+    return apply_rule('활동패턴', species_value, user_preference, context)
 
 
 def calculate_diet_type_score(
@@ -166,20 +143,7 @@ def calculate_diet_type_score(
     """식성 타입 점수 계산"""
     if user_preference is None or not user_preference:
         return 0
-    
-    weight = context.get_weight('식성타입', 5)
-    if weight == 0:
-        return 0
-    
-    if str(species_value) == str(user_preference):
-        score = 100
-        context.add_reason(f"식성 타입이 {user_preference}으로 일치합니다")
-    else:
-        score = 0
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('식성타입', contribution)
-    return contribution
+    return apply_rule('식성타입', species_value, user_preference, context)
 
 
 def calculate_feeding_frequency_score(
@@ -190,26 +154,7 @@ def calculate_feeding_frequency_score(
     """먹이 빈도 점수 계산 (선호 빈도 이하: 점수 부여)"""
     if user_prefer is None:
         return 0
-    
-    weight = context.get_weight('먹이빈도_등급', 10)
-    if weight == 0:
-        return 0
-    
-    if species_value <= user_prefer:
-        score = 100
-        context.add_reason("먹이 급여 빈도가 선호하신 빈도 이하입니다")
-    else:
-        diff = species_value - user_prefer
-        if diff == 1:
-            score = 50
-            context.add_reason("먹이 급여 빈도가 선호하신 빈도보다 1단계 높습니다")
-        else:
-            score = 25
-            context.add_reason("먹이 급여 빈도가 선호하신 빈도보다 훨씬 높습니다")
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('먹이빈도', contribution)
-    return contribution
+    return apply_rule('먹이빈도_등급', species_value, user_prefer, context)
 
 
 def calculate_handling_score(
@@ -220,26 +165,7 @@ def calculate_handling_score(
     """핸들링 적합도 점수 계산 (선호 등급 이상: 점수 부여)"""
     if user_prefer is None:
         return 0
-    
-    weight = context.get_weight('핸들링적합도_5단계', 10)
-    if weight == 0:
-        return 0
-    
-    if species_value >= user_prefer:
-        score = 100
-        context.add_reason("핸들링 적합도가 선호하신 등급 이상입니다")
-    else:
-        diff = user_prefer - species_value
-        if diff == 1:
-            score = 50
-            context.add_reason("핸들링 적합도가 선호하신 등급보다 1단계 낮습니다")
-        else:
-            score = 25
-            context.add_reason("핸들링 적합도가 선호하신 등급보다 훨씬 낮습니다")
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('핸들링적합도', contribution)
-    return contribution
+    return apply_rule('핸들링적합도_5단계', species_value, user_prefer, context)
 
 
 def calculate_enclosure_size_score(
@@ -250,21 +176,7 @@ def calculate_enclosure_size_score(
     """사육장 크기 점수 계산 (선호 크기 이하: 점수 부여)"""
     if user_max is None:
         return 0
-    
-    weight = context.get_weight('사육장_사이즈_3단계', 10)
-    if weight == 0:
-        return 0
-    
-    if species_value <= user_max:
-        score = 100
-        context.add_reason("사육장 크기가 선호하신 크기 이하입니다")
-    else:
-        score = 0
-        context.add_reason("사육장 크기가 선호하신 크기를 초과합니다")
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('사육장_사이즈', contribution)
-    return contribution
+    return apply_rule('사육장_사이즈_3단계', species_value, user_max, context)
 
 
 def calculate_adult_size_score(
@@ -272,17 +184,8 @@ def calculate_adult_size_score(
     context: ScoringContext
 ) -> float:
     """성체 크기 점수 계산 (기본적으로 작을수록 좋음)"""
-    weight = context.get_weight('성체크기_등급_3단계', 5)
-    if weight == 0:
-        return 0
-    
-    # 작을수록 좋음 (1=100%, 2=50%, 3=0%)
-    score = 100 - (species_value - 1) * 50
-    score = max(0, min(100, score))
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('성체크기', contribution)
-    return contribution
+    # 작을수록 좋음 (기본: 1=100%, 2=50%, 3=0%)
+    return apply_rule('성체크기_등급_3단계', species_value, None, context)
 
 
 def calculate_appearance_tags_score(
@@ -310,11 +213,12 @@ def calculate_appearance_tags_score(
     
     if matched_tags:
         match_ratio = len(matched_tags) / len(normalized_user_tags)
-        score = match_ratio * 100
+        score = match_ratio * context.score_tables['외형태그']['full_match']
         context.add_reason(f"외형 태그가 일치합니다 ({', '.join(matched_tags)})")
     else:
         score = 0
     
+    context.add_score('외형태그', score)
     contribution = (score / 100) * weight
     context.add_contribution('외형태그', contribution)
     return contribution
@@ -340,9 +244,10 @@ def calculate_species_type_score(
     else:
         weight = 10
     
-    score = 100
+    score = context.score_tables['종류']['match']
     context.add_reason(f"종류가 {species_value}으로 선택하신 종류와 일치합니다")
     
+    context.add_score('종류', score)
     contribution = (score / 100) * weight
     context.add_contribution('종류', contribution)
     return contribution
@@ -356,21 +261,4 @@ def calculate_purpose_score(
     """사육 목적 점수 계산"""
     if user_preference is None or not user_preference:
         return 0
-    
-    weight = context.get_weight('관상용_애완용', 10)
-    if weight == 0:
-        return 0
-    
-    if str(species_value) == str(user_preference):
-        score = 100
-        context.add_reason(f"사육 목적이 {user_preference}으로 일치합니다")
-    elif str(species_value) == "둘 다":
-        score = 80
-        context.add_reason("사육 목적이 '둘 다'로 모든 목적에 적합합니다")
-    else:
-        score = 0
-    
-    contribution = (score / 100) * weight
-    context.add_contribution('관상용_애완용', contribution)
-    return contribution
-
+    return apply_rule('관상용_애완용', species_value, user_preference, context)
@@ -0,0 +1,140 @@
+"""이름 있는 점수 정책(가중치 + 규칙별 점수표)과 트래픽 분할"""
+import hashlib
+import json
+from typing import Dict, Any, List, Optional
+
+from scoring_helpers import DEFAULT_SCORE_TABLES
+from scoring_rules import compile_score_tables
+
+
+DEFAULT_POLICY_NAME = 'default'
+DEFAULT_POLICY_VERSION = 'v1.0'
+
+
+class ScoringPolicy:
+    """
+    점수 정책 하나
+
+    카탈로그는 모든 정책이 공유하므로 정책이 가지는 것은 가중치와 점수표뿐이다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        weights: Dict[str, int],
+        score_tables: Optional[Dict[str, Dict[str, float]]] = None
+    ):
+        self.name = name
+        self.version = version
+        self.weights = dict(weights)
+        self.score_tables = score_tables or DEFAULT_SCORE_TABLES
+        # 규칙 조회 배열은 정책 생성(서버 기동) 시 미리 컴파일
+        compile_score_tables(self.score_tables)
+
+    def derive(
+        self,
+        name: str,
+        version: str,
+        weights: Optional[Dict[str, int]] = None,
+        score_tables: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> 'ScoringPolicy':
+        """이 정책을 바탕으로 일부 가중치/점수표 항목만 바꾼 새 정책"""
+        merged_weights = dict(self.weights)
+        merged_weights.update(weights or {})
+        merged_tables = {key: dict(table) for key, table in self.score_tables.items()}
+        for key, overrides in (score_tables or {}).items():
+            if key not in merged_tables:
+                raise ValueError(f"알 수 없는 점수표입니다: {key}")
+            unknown = [point for point in overrides if point not in merged_tables[key]]
+            if unknown:
+                raise ValueError(f"'{key}' 점수표에 없는 항목입니다: {unknown}")
+            merged_tables[key].update(overrides)
+        return ScoringPolicy(name, version, merged_weights, merged_tables)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'version': self.version,
+            'weights': self.weights,
+            'score_tables': self.score_tables
+        }
+
+
+class PolicyRegistry:
+    """
+    요청별 정책 선택
+
+    요청에 정책 이름이 있으면 그 정책, 없으면 분할 키 해시로 traffic_split 비율에 따라 고른다.
+    같은 분할 키는 항상 같은 정책에 배정된다.
+    """
+
+    def __init__(
+        self,
+        policies: List[ScoringPolicy],
+        default_name: str = DEFAULT_POLICY_NAME,
+        traffic_split: Optional[Dict[str, int]] = None
+    ):
+        self.policies = {policy.name: policy for policy in policies}
+        if default_name not in self.policies:
+            raise ValueError(f"기본 정책이 없습니다: {default_name}")
+        self.default_name = default_name
+        self.traffic_split = dict(traffic_split or {})
+        unknown = [name for name in self.traffic_split if name not in self.policies]
+        if unknown:
+            raise ValueError(f"traffic_split에 알 수 없는 정책이 있습니다: {unknown}")
+        if self.traffic_split and sum(self.traffic_split.values()) != 100:
+            raise ValueError("traffic_split 비율의 합은 100이어야 합니다")
+
+    @classmethod
+    def single(cls, policy: ScoringPolicy) -> 'PolicyRegistry':
+        return cls([policy], default_name=policy.name)
+
+    @classmethod
+    def from_file(cls, path: str, base: ScoringPolicy) -> 'PolicyRegistry':
+        """
+        정책 파일(JSON) 로드
+
+        {
+          "default": "default",
+          "traffic_split": {"default": 90, "difficulty-heavy": 10},
+          "policies": [
+            {"name": "difficulty-heavy", "version": "v1.1-exp",
+             "weights": {"사육_난이도_5단계": 30},
+             "score_tables": {"사육_난이도_5단계": {"harder_1": 40}}}
+          ]
+        }
+
+        각 정책은 base 정책에서 지정한 항목만 바꾼다. base 정책은 항상 포함된다.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        policies = [base]
+        for spec in config.get('policies', []):
+            policies.append(base.derive(
+                spec['name'],
+                spec.get('version', spec['name']),
+                spec.get('weights'),
+                spec.get('score_tables')
+            ))
+        return cls(policies, config.get('default', base.name), config.get('traffic_split'))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.policies
+
+    def names(self) -> List[str]:
+        return list(self.policies)
+
+    def choose(self, name: Optional[str] = None, split_key: Optional[str] = None) -> ScoringPolicy:
+        """요청에 쓸 정책 선택 (알 수 없는 이름이면 KeyError)"""
+        if name:
+            return self.policies[name]
+        if self.traffic_split and split_key:
+            bucket = int(hashlib.sha1(split_key.encode('utf-8')).hexdigest()[:8], 16) % 100
+            cumulative = 0
+            for policy_name, percent in self.traffic_split.items():
+                cumulative += percent
+                if bucket < cumulative:
+                    return self.policies[policy_name]
+        return self.policies[self.default_name]
@@ -0,0 +1,198 @@
+"""
+선언형 점수 규칙 (scoring_rules.json)
+
+규칙 파일은 질문마다 (종 값, 사용자 답변) → 결과(outcome) → 점수표 항목 → 점수를 정의한다.
+점수표(score_tables)마다 한 번 컴파일해 값 범위 안의 입력은 밀집 배열 한 번 조회로 점수와
+추천 근거를 얻는다. 범위 밖 입력은 같은 규칙을 순서대로 평가한다.
+
+kind:
+  grade_pair  등급 차이(diff)로 결과 결정 (cases의 diff 범위 [하한, 상한], null은 제한 없음, 첫 일치)
+  grade       종 등급 값이 곧 점수표 항목 ('1'..'5'). 표에 없는 숫자는 이웃 항목 사이를 직선으로 잇고
+              범위 밖은 양 끝 기울기로 연장해 0-100으로 자른다 (예전 '100 - (등급-1) * 20' 식과 같은 값)
+  category    범주 값 비교 (when: equal / species / otherwise)
+  code        점수표만 파일에서 읽고 계산은 scoring_helpers의 코드로 (외형태그, 종류)
+"""
+import json
+import math
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+
+RULES_PATH = os.getenv(
+    'SCORING_RULES_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scoring_rules.json')
+)
+
+# (점수, 추천 근거 또는 None)
+RuleResult = Tuple[float, Optional[str]]
+
+
+class RuleSpec:
+    """규칙 파일의 규칙 하나"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.key = spec['key']
+        self.contribution_key = spec['contribution_key']
+        self.default_weight = spec['default_weight']
+        self.kind = spec['kind']
+        self.points = dict(spec['points'])
+        self.cases = spec.get('cases', [])
+        self.species_range = tuple(spec.get('species_range', (0, -1)))
+        self.answer_range = tuple(spec.get('answer_range', (0, -1)))
+        self.answer_minus_species = spec.get('diff') == 'answer_minus_species'
+        self.values = list(spec.get('values', []))
+        self._check()
+
+    def _check(self) -> None:
+        if self.kind not in ('grade_pair', 'grade', 'category', 'code'):
+            raise ValueError(f"{self.key}: 알 수 없는 규칙 종류입니다: {self.kind}")
+        unknown = [case['outcome'] for case in self.cases if case['outcome'] not in self.points]
+        if unknown:
+            raise ValueError(f"{self.key}: 점수표에 없는 결과입니다: {unknown}")
+        if self.kind == 'grade_pair':
+            for species_value in range(self.species_range[0], self.species_range[1] + 1):
+                for answer in range(self.answer_range[0], self.answer_range[1] + 1):
+                    if self.match_case(species_value, answer) is None:
+                        raise ValueError(f"{self.key}: 종 {species_value}, 답변 {answer}에 해당하는 규칙이 없습니다")
+
+    def match_case(self, species_value: Any, answer: Any) -> Optional[Dict[str, Any]]:
+        """첫 번째로 일치하는 case (grade_pair, category)"""
+        if self.kind == 'grade_pair':
+            diff = answer - species_value if self.answer_minus_species else species_value - answer
+            for case in self.cases:
+                low, high = case['diff']
+                if (low is None or diff >= low) and (high is None or diff <= high):
+                    return case
+            return None
+        for case in self.cases:
+            when = case['when']
+            if (when == 'equal' and str(species_value) == str(answer)) \
+                    or (when == 'species' and str(species_value) == case['species']) \
+                    or when == 'otherwise':
+                return case
+        return None
+
+    def grade_points(self, species_value: Any, points: Dict[str, float]) -> float:
+        """grade 규칙 점수 (표에 없는 숫자는 직선 보간/연장 후 0-100으로 자름, 숫자가 아니면 0점)"""
+        key = str(species_value)
+        if key in points:
+            return points[key]
+        if isinstance(species_value, bool) or not isinstance(species_value, (int, float)) \
+                or math.isnan(species_value):
+            return 0
+        low, high = self.species_range
+        if species_value < low:
+            left = low
+        elif species_value > high:
+            left = high - 1
+        else:
+            left = math.floor(species_value)
+        left_points = points.get(str(left), 0)
+        right_points = points.get(str(left + 1), 0)
+        score = left_points + (right_points - left_points) * (species_value - left)
+        return max(0, min(100, score))
+
+    def evaluate(self, species_value: Any, answer: Any, points: Dict[str, float]) -> RuleResult:
+        """규칙을 순서대로 평가 (컴파일된 배열 범위 밖 입력용)"""
+        if self.kind == 'grade':
+            return self.grade_points(species_value, points), None
+        case = self.match_case(species_value, answer)
+        if case is None:
+            raise ValueError(f"{self.key}: 종 {species_value}, 답변 {answer}에 해당하는 규칙이 없습니다")
+        reason = case.get('reason')
+        return points[case['outcome']], (reason.format(answer=answer) if reason else None)
+
+
+class CompiledRule:
+    """
+    점수표 하나로 컴파일된 규칙
+
+    grade_pair: 종 등급 s, 답변 a → cells[s * stride + a]
+    grade:      종 등급 s → cells[s]
+    category:   값 코드 s, a → cells[s * stride + a]
+
+    lookup(종 값, 답변)은 규칙 종류별로 만든 클로저라 호출 시 분기 없이 배열만 조회한다.
+    범위 밖이거나 정수가 아닌 등급은 evaluate로 계산하므로 결과는 항상 evaluate와 같다.
+    """
+
+    def __init__(self, spec: RuleSpec, points: Dict[str, float]):
+        self.spec = spec
+        self.points = points
+        self.default_weight = spec.default_weight
+        self.contribution_key = spec.contribution_key
+        evaluate = spec.evaluate
+
+        if spec.kind == 'category':
+            codes = {value: i for i, value in enumerate(spec.values)}
+            stride = len(spec.values)
+            cells = [evaluate(s, a, points) for s in spec.values for a in spec.values]
+
+            def lookup(species_value: Any, answer: Any) -> RuleResult:
+                s = codes.get(str(species_value))
+                a = codes.get(str(answer))
+                if s is not None and a is not None:
+                    return cells[s * stride + a]
+                return evaluate(species_value, answer, points)
+        elif spec.kind == 'grade':
+            species_low, species_high = spec.species_range
+            cells = [None] * (species_high + 1)
+            for s in range(species_low, species_high + 1):
+                cells[s] = evaluate(s, None, points)
+
+            def lookup(species_value: Any, answer: Any = None) -> RuleResult:
+                if species_low <= species_value <= species_high:
+                    try:
+                        return cells[species_value]
+                    except TypeError:
+                        pass  # 정수가 아닌 등급
+                return evaluate(species_value, answer, points)
+        else:
+            species_low, species_high = spec.species_range
+            answer_low, answer_high = spec.answer_range
+            stride = answer_high + 1
+            cells = [None] * ((species_high + 1) * stride)
+            for s in range(species_low, species_high + 1):
+                for a in range(answer_low, answer_high + 1):
+                    cells[s * stride + a] = evaluate(s, a, points)
+
+            def lookup(species_value: Any, answer: Any) -> RuleResult:
+                if species_low <= species_value <= species_high and answer_low <= answer <= answer_high:
+                    try:
+                        return cells[species_value * stride + answer]
+                    except TypeError:
+                        pass  # 정수가 아닌 등급
+                return evaluate(species_value, answer, points)
+
+        self.cells: List[Optional[RuleResult]] = cells
+        self.lookup = lookup
+
+
+def load_rule_specs(path: str = RULES_PATH) -> Dict[str, RuleSpec]:
+    """규칙 파일 로드 (규칙 키 → RuleSpec, 파일 순서 유지)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return {spec['key']: RuleSpec(spec) for spec in config['rules']}
+
+
+RULE_SPECS = load_rule_specs()
+
+# 점수표 객체 id → (점수표, 컴파일된 규칙)
+_compiled_cache: Dict[int, Tuple[Dict[str, Dict[str, float]], Dict[str, CompiledRule]]] = {}
+
+
+def compile_score_tables(score_tables: Dict[str, Dict[str, float]]) -> Dict[str, CompiledRule]:
+    """
+    점수표로 규칙 컴파일 (같은 점수표 객체는 한 번만)
+
+    정책은 생성 시 미리 컴파일하므로 요청 처리 중에는 캐시 조회만 한다.
+    """
+    cached = _compiled_cache.get(id(score_tables))
+    if cached is not None and cached[0] is score_tables:
+        return cached[1]
+    compiled = {
+        key: CompiledRule(spec, score_tables[key])
+        for key, spec in RULE_SPECS.items()
+        if spec.kind != 'code'
+    }
+    _compiled_cache[id(score_tables)] = (score_tables, compiled)
+    return compiled
@@ -0,0 +1,207 @@
+"""설문 진행 중 실시간 추천 미리보기를 위한 증분 점수 세션"""
+import threading
+import time
+import uuid
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from recommendation_engine import RecommendationEngine, SCORING_RULES, normalize_score
+from scoring_policy import ScoringPolicy
+
+
+# 종류(하드 필터) 열을 다시 계산해야 하는 선호도 키
+SPECIES_TYPE_KEYS = ('종류', '종류_가중치')
+
+# 합계가 바뀐 종이 전체의 이 비율보다 많으면 순위 목록을 하나씩 옮기지 않고 다시 정렬
+RANKING_RESORT_FRACTION = 0.25
+
+
+class ScoringSession:
+    """
+    종별 질문 기여도 벡터를 보관하는 점수 세션
+
+    답변 하나가 바뀌면 해당 질문의 열만 다시 계산하고,
+    기여도가 실제로 바뀐 종의 합계만 갱신한다.
+    순위 목록(ranking)도 합계가 바뀐 종만 옮기므로 top()은 앞부분을 잘라 읽기만 한다.
+    """
+
+    def __init__(
+        self,
+        engine: RecommendationEngine,
+        preferences: Optional[Dict[str, Any]] = None,
+        policy: Optional[ScoringPolicy] = None
+    ):
+        self.engine = engine
+        self.policy = policy or engine.choose_policy()
+        self.lock = threading.Lock()
+        self.preferences: Dict[str, Any] = dict(preferences or {})
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """모든 열을 처음부터 계산"""
+        engine = self.engine
+        self.custom_weights = engine.resolve_weights(self.preferences, self.policy)
+        species_count = len(engine.records)
+        self.type_scores = engine.score_species_type_column(self.preferences, self.policy)
+        # contributions[i][j]: i번째 종의 SCORING_RULES[j] 기여도
+        self.contributions = [[0.0] * len(SCORING_RULES) for _ in range(species_count)]
+        for rule_index in range(len(SCORING_RULES)):
+            column = engine.score_rule_column(rule_index, self.preferences, self.custom_weights, self.policy)
+            self._set_column(rule_index, column)
+        self.totals = [self._row_total(i) for i in range(species_count)]
+        self._sort_ranking()
+
+    def _sort_ranking(self) -> None:
+        """점수 > 0인 종의 (-점수, 인덱스) 정렬 목록 (recommend와 같은 순위: 점수 내림차순, 동점은 인덱스 순)"""
+        self.ranking = sorted((-score, i) for i, score in enumerate(self.totals) if score > 0)
+
+    def _update_totals(self, indices: Iterable[int]) -> None:
+        """지정한 종의 합계를 다시 계산하고 순위 목록에서 그 종만 옮긴다"""
+        indices = list(indices)
+        if len(indices) > RANKING_RESORT_FRACTION * len(self.totals):
+            for i in indices:
+                self.totals[i] = self._row_total(i)
+            self._sort_ranking()
+            return
+        ranking = self.ranking
+        for i in indices:
+            old, new = self.totals[i], self._row_total(i)
+            if new == old:
+                continue
+            if old > 0:
+                del ranking[bisect_left(ranking, (-old, i))]
+            self.totals[i] = new
+            if new > 0:
+                insort(ranking, (-new, i))
+
+    def _set_column(self, rule_index: int, column: List[float]) -> List[int]:
+        """질문 열을 교체하고 값이 바뀐 종의 인덱스 반환"""
+        changed = []
+        for i, value in enumerate(column):
+            row = self.contributions[i]
+            if row[rule_index] != value:
+                row[rule_index] = value
+                changed.append(i)
+        return changed
+
+    def _row_total(self, index: int) -> float:
+        """calculate_match_score와 같은 순서로 합산한 정규화 점수"""
+        species_score = self.type_scores[index]
+        if species_score == 0:
+            return 0.0
+        total_score = 0.0
+        total_score += species_score
+        for value in self.contributions[index]:
+            total_score += value
+        return normalize_score(total_score, self.custom_weights, self.policy.weights)
+
+    def update(self, answers: Dict[str, Any]) -> None:
+        """답변 반영: 바뀐 질문의 열만 재계산"""
+        changed_keys = [key for key, value in answers.items()
+                        if key not in self.preferences or self.preferences[key] != value]
+        if not changed_keys:
+            return
+        self.preferences.update(answers)
+
+        if 'custom_weights' in changed_keys:
+            # 가중치가 바뀌면 모든 열과 정규화 기준이 바뀐다
+            self._rebuild()
+            return
+
+        dirty = set()
+        if any(key in SPECIES_TYPE_KEYS for key in changed_keys):
+            new_scores = self.engine.score_species_type_column(self.preferences, self.policy)
+            for i, value in enumerate(new_scores):
+                if self.type_scores[i] != value:
+                    self.type_scores[i] = value
+                    dirty.add(i)
+
+        for rule_index, (_, pref_key, _, _) in enumerate(SCORING_RULES):
+            if pref_key is not None and pref_key in changed_keys:
+                column = self.engine.score_rule_column(
+                    rule_index, self.preferences, self.custom_weights, self.policy
+                )
+                dirty.update(self._set_column(rule_index, column))
+
+        self._update_totals(dirty)
+
+    def refresh_species(self, index: int) -> None:
+        """관리자 API로 추가/수정/삭제된 종 한 행만 다시 계산"""
+        while len(self.totals) <= index:
+            self.type_scores.append(0.0)
+            self.contributions.append([0.0] * len(SCORING_RULES))
+            self.totals.append(0.0)
+        self.type_scores[index], self.contributions[index] = self.engine.score_record_row(
+            self.engine.records[index], self.preferences, self.custom_weights, self.policy
+        )
+        self._update_totals([index])
+
+    def top(self, top_n: int) -> List[Dict[str, Any]]:
+        """현재 상위 N개 미리보기 (recommend와 같은 순위 규칙)"""
+        results = []
+        for neg_score, index in self.ranking[:max(top_n, 0)]:
+            record = self.engine.records[index]
+            results.append({
+                '종_한글명': record['종_한글명'],
+                '종류': record['종류'],
+                '사진_URL': record.get('사진_URL', ''),
+                'match_score': round(-neg_score, 1)
+            })
+        return results
+
+
+class ScoringSessionStore:
+    """TTL과 최대 개수로 제한되는 세션 저장소"""
+
+    def __init__(self, ttl_seconds: float = 1800, max_sessions: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Tuple[ScoringSession, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _purge_expired(self, now: float) -> None:
+        """만료된 세션 제거 (가장 오래 사용되지 않은 순서로 정렬되어 있음)"""
+        while self._sessions:
+            session_id, (_, expires_at) = next(iter(self._sessions.items()))
+            if expires_at > now:
+                break
+            del self._sessions[session_id]
+
+    def create(self, session: ScoringSession) -> str:
+        """세션 등록 후 세션 ID 반환"""
+        session_id = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+            self._sessions[session_id] = (session, now + self.ttl_seconds)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[ScoringSession]:
+        """세션 조회 (조회 시 만료 시간 연장)"""
+        now = time.monotonic()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            self._sessions[session_id] = (entry[0], now + self.ttl_seconds)
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def delete(self, session_id: str) -> bool:
+        """세션 삭제"""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def sessions(self) -> List[ScoringSession]:
+        """현재 세션 목록 (카탈로그 변경 반영용)"""
+        with self._lock:
+            return [session for session, _ in self._sessions.values()]
+
+    def clear(self) -> None:
+        """모든 세션 삭제 (데이터셋 재로드 시)"""
+        with self._lock:
+            self._sessions.clear()
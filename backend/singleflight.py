@@ -0,0 +1,66 @@
+"""동일 키의 동시 작업을 하나로 합치는 single-flight 유틸리티"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    """진행 중인 작업 하나"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출은 먼저 들어온 호출(리더)의 결과를 함께 받는다.
+
+    결과는 작업이 끝나는 즉시 버려지므로 캐시가 아니다.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.shared_count = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        fn 실행 (같은 키가 진행 중이면 그 결과를 기다림)
+
+        Returns:
+            (결과, shared): shared는 다른 호출의 결과를 공유받았는지 여부
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared_count += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """진행 중인 키 개수"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,258 @@
+"""
+종명 유사 검색 (오타, 표기 변형, 예전 데이터셋 이름)
+
+종명과 별칭(species_aliases.json)을 정규화 키로 바꿔 트라이그램 역색인을 만들어 둔다.
+조회는 트라이그램이 겹치는 후보 상위 MAX_CANDIDATES개에만 편집 거리를 계산하므로
+카탈로그 크기와 상관없이 한 번에 계산하는 편집 거리 수가 제한된다.
+후보를 모을 때도 너무 흔한 트라이그램(MAX_POSTINGS_PER_GRAM 초과)은 건너뛰어 역색인을 다 훑지 않는다.
+한글은 자모 단위로 분해해(NFD) 비교하므로 'ㅐ/ㅔ' 같은 한 글자 오타는 거리 1이다.
+"""
+import json
+import os
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+ALIASES_PATH = os.getenv(
+    'SPECIES_ALIASES_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'species_aliases.json')
+)
+
+# 정규화 키 최대 길이 (긴 입력은 잘라서 비교)
+MAX_QUERY_LENGTH = 64
+# 편집 거리를 계산하는 후보 수 상한
+MAX_CANDIDATES = 32
+# 후보를 모을 때 훑는 트라이그램 역색인 길이 상한 (이보다 흔한 트라이그램은 건너뜀)
+MAX_POSTINGS_PER_GRAM = 1000
+# 삭제 표시 항목이 이 수 이상이고 살아 있는 항목보다 많아지면 역색인을 다시 만든다
+COMPACT_MIN_TOMBSTONES = 64
+# 제안에 포함하는 최소 유사도 (0-1)
+MIN_SUGGESTION_SCORE = 0.5
+# 제안 없이 바로 해석하는 조건: 편집 거리 상한과 최소 키 길이 (짧은 이름은 오타 한 번에 다른 종이 됨)
+AUTO_RESOLVE_DISTANCE = 2
+AUTO_RESOLVE_MIN_LENGTH = 8
+
+
+class NameMatch(NamedTuple):
+    """
+    종명 조회 결과
+
+    index: 해석된 레코드 인덱스 (없으면 None)
+    method: 'exact' | 'alias' | 'fuzzy' | None
+    suggestions: 해석하지 못했을 때의 (종_한글명, 유사도) 목록 (유사도 내림차순)
+    """
+    index: Optional[int]
+    method: Optional[str]
+    suggestions: List[Tuple[str, float]]
+
+
+def load_aliases(path: str = ALIASES_PATH) -> Dict[str, str]:
+    """별칭 파일 로드 (없으면 빈 표)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return dict(json.load(f).get('aliases', {}))
+
+
+SPECIES_ALIASES = load_aliases()
+
+
+def fuzzy_key(name: str) -> str:
+    """비교용 키: 소문자, 공백/기호 제거, 한글은 자모 분해"""
+    text = unicodedata.normalize('NFKC', str(name)).lower()
+    text = ''.join(ch for ch in text if ch.isalnum())
+    return unicodedata.normalize('NFD', text)[:MAX_QUERY_LENGTH]
+
+
+def trigrams(key: str) -> Set[str]:
+    """앞뒤 경계 문자를 붙인 3-gram 집합 (짧은 키도 최소 한 개)"""
+    padded = f"\x02{key}\x03"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """편집 거리 (limit를 넘으면 limit + 1, 대각선 띠 안에서만 계산)"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    over = limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ch in enumerate(a, 1):
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= limit else over
+        best = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if ch == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return over
+        previous = current
+    return min(previous[len(b)], over)
+
+
+class SpeciesResolver:
+    """
+    종명 유사 검색 색인 (카탈로그와 함께 만들고 변경 때마다 add/remove로 고침)
+
+    항목은 종명과 별칭이며 모두 레코드 인덱스를 가리킨다.
+    별칭은 정확히(정규화 키 기준) 일치하면 바로 해석하고, 오타 비교 대상에도 포함된다.
+    삭제한 항목은 None으로 표시만 하고 역색인에서 바로 빼지 않는다. (조회 중인 스레드가 있어도 안전)
+    표시만 한 항목이 쌓이면 _compact가 새 항목 목록/역색인을 만들어 한 번에 바꿔 끼운다.
+    """
+
+    def __init__(self, names: Iterable[Tuple[int, str]], aliases: Optional[Dict[str, str]] = None):
+        self.names: Dict[int, str] = {}
+        # 항목: (정규화 키, 레코드 인덱스, 트라이그램 수), 삭제한 항목은 None
+        self._entries: List[Optional[Tuple[str, int, int]]] = []
+        self._postings: Dict[str, List[int]] = {}
+        # 조회용 (항목, 역색인) 묶음: 압축 때 둘을 함께 바꿔 조회가 어긋난 쌍을 보지 않게 한다
+        self._index = (self._entries, self._postings)
+        self._tombstones = 0
+        self._exact: Dict[str, int] = {}
+        self._aliases: Dict[str, int] = {}
+        # 레코드 인덱스 -> 살아 있는 항목 번호들 (종명, 별칭)
+        self._entry_ids: Dict[int, List[int]] = {}
+        # 대상 종 키 -> 별칭 키 (대상 종이 추가/삭제될 때 별칭을 켜고 끔)
+        self._alias_keys: Dict[str, List[str]] = {}
+        for alias, target in (SPECIES_ALIASES if aliases is None else aliases).items():
+            key = fuzzy_key(alias)
+            if key:
+                self._alias_keys.setdefault(fuzzy_key(target), []).append(key)
+
+        for index, name in names:
+            self.add(index, name)
+
+    def add(self, index: int, name: str) -> None:
+        """레코드 추가 (같은 정규화 키의 종명이 이미 있으면 앞의 것이 이긴다)"""
+        self.names[index] = name
+        key = fuzzy_key(name)
+        if not key or key in self._exact:
+            return
+        # 새 종명과 겹치는 별칭은 종명이 우선
+        if key in self._aliases:
+            self._drop_entries(self._aliases.pop(key), key)
+        self._exact[key] = index
+        self._add_entry(key, index)
+        for alias_key in self._alias_keys.get(key, ()):
+            # 다른 종명과 겹치거나 이미 쓰인 별칭은 무시
+            if alias_key in self._exact or alias_key in self._aliases:
+                continue
+            self._aliases[alias_key] = index
+            self._add_entry(alias_key, index)
+
+    def remove(self, index: int, name: Optional[str] = None) -> None:
+        """레코드와 그 종을 가리키는 별칭 삭제 (name: 지울 종명, 기본은 마지막으로 add한 이름)"""
+        name = self.names.get(index) if name is None else name
+        if name is None:
+            return
+        key = fuzzy_key(name)
+        if self._exact.get(key) == index:
+            del self._exact[key]
+        for alias_key in [alias_key for alias_key, target in self._aliases.items() if target == index]:
+            del self._aliases[alias_key]
+        self._drop_entries(index)
+        # names는 남겨 둔다 (조회 중인 결과가 종명을 찾을 수 있도록)
+
+    def _drop_entries(self, index: int, key: Optional[str] = None) -> None:
+        """index의 항목 표시 삭제 (key를 주면 그 키의 항목만)"""
+        for entry_id in list(self._entry_ids.get(index, ())):
+            entry = self._entries[entry_id]
+            if entry is not None and (key is None or entry[0] == key):
+                self._entries[entry_id] = None
+                self._entry_ids[index].remove(entry_id)
+                self._tombstones += 1
+        if self._tombstones >= COMPACT_MIN_TOMBSTONES and self._tombstones > len(self._entries) - self._tombstones:
+            self._compact()
+
+    def _compact(self) -> None:
+        """삭제 표시 항목을 빼고 항목 번호를 다시 매겨 역색인을 새로 만든다"""
+        entries: List[Optional[Tuple[str, int, int]]] = []
+        postings: Dict[str, List[int]] = {}
+        entry_ids: Dict[int, List[int]] = {}
+        for entry in self._entries:
+            if entry is None:
+                continue
+            key, index, _ = entry
+            entry_id = len(entries)
+            entries.append(entry)
+            entry_ids.setdefault(index, []).append(entry_id)
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(entry_id)
+        self._entries, self._postings, self._entry_ids = entries, postings, entry_ids
+        self._index = (entries, postings)
+        self._tombstones = 0
+
+    def _add_entry(self, key: str, index: int) -> None:
+        grams = trigrams(key)
+        entry_id = len(self._entries)
+        self._entries.append((key, index, len(grams)))
+        self._entry_ids.setdefault(index, []).append(entry_id)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(entry_id)
+
+    @staticmethod
+    def _candidates(key: str, entries: List[Optional[Tuple[str, int, int]]],
+                    postings: Dict[str, List[int]]) -> List[int]:
+        """
+        트라이그램 Dice 계수 상위 항목 (최대 MAX_CANDIDATES개)
+
+        역색인이 MAX_POSTINGS_PER_GRAM보다 긴 트라이그램은 세지 않는다. (거의 모든 항목에 있어 순위에 도움이 안 됨)
+        모든 트라이그램이 그만큼 흔하면 가장 드문 하나의 앞부분만 훑는다.
+        """
+        grams = trigrams(key)
+        lists = [postings[gram] for gram in grams if gram in postings]
+        scanned = [ids for ids in lists if len(ids) <= MAX_POSTINGS_PER_GRAM]
+        if not scanned and lists:
+            scanned = [min(lists, key=len)[:MAX_POSTINGS_PER_GRAM]]
+        shared = Counter()
+        for ids in scanned:
+            shared.update(ids)
+        ranked = sorted(
+            ((entry_id, count) for entry_id, count in shared.items() if entries[entry_id] is not None),
+            key=lambda item: (-2 * item[1] / (len(grams) + entries[item[0]][2]), item[0])
+        )
+        return [entry_id for entry_id, _ in ranked[:MAX_CANDIDATES]]
+
+    def resolve(self, name: str, limit: int = 5) -> NameMatch:
+        """정규화 키 일치 → 별칭 → 유사 검색 순으로 해석"""
+        key = fuzzy_key(name)
+        if not key:
+            return NameMatch(None, None, [])
+        if key in self._exact:
+            return NameMatch(self._exact[key], 'exact', [])
+        if key in self._aliases:
+            return NameMatch(self._aliases[key], 'alias', [])
+
+        # 후보마다 편집 거리 → 유사도, 한 종에 여러 항목(종명/별칭)이 걸리면 가장 가까운 것
+        entries, postings = self._index
+        best: Dict[int, Tuple[float, int]] = {}
+        for entry_id in self._candidates(key, entries, postings):
+            entry = entries[entry_id]
+            if entry is None:
+                continue
+            entry_key, index, _ = entry
+            bound = max(len(entry_key), len(key))
+            max_distance = int(bound * (1 - MIN_SUGGESTION_SCORE))
+            distance = bounded_edit_distance(key, entry_key, max_distance)
+            if distance > max_distance:
+                continue
+            score = 1 - distance / bound
+            if index not in best or score > best[index][0]:
+                best[index] = (score, distance)
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[1][1], self.names[item[0]]))
+
+        if ranked:
+            index, (_, distance) = ranked[0]
+            # 다른 종이 비슷하게 가까우면 고르지 않고 제안만
+            unique = all(other_distance > distance + 1 for _, (_, other_distance) in ranked[1:])
+            if distance <= AUTO_RESOLVE_DISTANCE and len(key) >= AUTO_RESOLVE_MIN_LENGTH and unique:
+                return NameMatch(index, 'fuzzy', [])
+        suggestions = [(self.names[index], round(score, 3)) for index, (score, _) in ranked[:limit]]
+        return NameMatch(None, None, suggestions)
@@ -0,0 +1,101 @@
+"""종 데이터 검증 규칙 (파일 로더와 관리자 API가 함께 사용, pandas 없이 동작)"""
+from typing import Dict, Any, Iterable, List, Optional
+
+from catalog import is_missing
+from climate_ranges import climate_range_errors
+
+
+# 필수 컬럼 목록
+REQUIRED_COLUMNS = [
+    '종_한글명',
+    '사육_난이도_5단계',
+    '초기비용_등급_5단계',
+    '성체크기_등급_3단계',
+    '온도습도_5단계',
+    '활동패턴',
+    '식성타입',
+    '먹이빈도_등급',
+    '핸들링적합도_5단계',
+    '사육장_사이즈_3단계',
+    '외형태그',
+    '종류',
+    '관상용_애완용',
+    '사진_URL'
+]
+
+# 허용된 값 목록
+ALLOWED_ACTIVITY_PATTERNS = ['야행성', '주행성']
+ALLOWED_DIET_TYPES = ['잡식', '초식', '육식']
+ALLOWED_PURPOSES = ['관상용', '애완용', '둘 다']
+ALLOWED_SPECIES_TYPES = [
+    '도마뱀', '게코', '육지 거북', '수생 거북', '반수생 거북',
+    '개구리', '도롱뇽', '카멜레온', '뱀'
+]
+
+# 등급형 컬럼 범위
+GRADE_5_COLUMNS = ['사육_난이도_5단계', '초기비용_등급_5단계', '온도습도_5단계',
+                   '먹이빈도_등급', '핸들링적합도_5단계']
+GRADE_3_COLUMNS = ['성체크기_등급_3단계', '사육장_사이즈_3단계']
+
+# 범주형 컬럼 허용 값 (None, ''도 허용)
+CATEGORY_VALUES = {
+    '활동패턴': ALLOWED_ACTIVITY_PATTERNS,
+    '식성타입': ALLOWED_DIET_TYPES,
+    '관상용_애완용': ALLOWED_PURPOSES,
+    '종류': ALLOWED_SPECIES_TYPES
+}
+
+# 도감 목록 정렬 키라 한 건씩 들어오는 변경에서는 비울 수 없는 범주형 컬럼
+# (난이도는 등급 검사가 이미 None을 거부함, 파일 로더의 결측 행은 목록 맨 뒤로 정렬됨)
+NON_EMPTY_CATEGORY_COLUMNS = ['종류']
+
+
+def validate_species_values(
+    values: Dict[str, Any],
+    columns: Iterable[str],
+    changed: Optional[Iterable[str]] = None
+) -> List[str]:
+    """
+    종 한 건 검증 (load_and_validate_data와 같은 규칙)
+
+    values는 변경 후 전체 값이다. 파일 로더는 규칙을 어긴 행을 경고와 함께 버리지만,
+    한 건씩 들어오는 변경은 오류 메시지 목록으로 돌려준다. (중복 종명 검사는 호출자)
+    changed를 주면 값 형식(등급, 범주, 기후 범위)은 그 컬럼만 검사한다.
+    로더가 경고 후 결측으로 둔 기존 값(해석 못 한 기후 범위 등) 때문에 다른 컬럼 수정이 막히지 않게 하려는 것.
+    """
+    errors = []
+    columns = list(columns)
+    checked = values if changed is None else {column: values[column] for column in changed if column in values}
+
+    unknown = [column for column in values if column not in columns]
+    if unknown:
+        errors.append(f"데이터셋에 없는 컬럼입니다: {unknown}")
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in values]
+    if missing:
+        errors.append(f"필수 컬럼이 누락되었습니다: {missing}")
+
+    name = values.get('종_한글명')
+    if is_missing(name) or not isinstance(name, str) or not name.strip():
+        errors.append("'종_한글명'은 비어 있지 않은 문자열이어야 합니다")
+
+    for columns_in_range, max_value in ((GRADE_5_COLUMNS, 5), (GRADE_3_COLUMNS, 3)):
+        for column in columns_in_range:
+            if column not in checked:
+                continue
+            value = checked[column]
+            if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= max_value:
+                errors.append(f"{column}: 1-{max_value} 범위의 정수여야 합니다")
+
+    for column, allowed in CATEGORY_VALUES.items():
+        if column not in checked:
+            continue
+        value = checked[column]
+        if column in NON_EMPTY_CATEGORY_COLUMNS and (is_missing(value) or value == ''):
+            errors.append(f"{column}: 비워 둘 수 없습니다")
+        elif value not in allowed + [None, '']:
+            errors.append(f"{column}: 허용되지 않은 값입니다 ({value})")
+
+    errors.extend(climate_range_errors(checked))
+
+    return errors
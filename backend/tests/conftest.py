@@ -0,0 +1,68 @@
+"""테스트 공용 설정: backend 모듈 import 경로와 작은 합성 카탈로그"""
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import SpeciesCatalog  # noqa: E402
+from species_validation import ALLOWED_SPECIES_TYPES  # noqa: E402
+
+SPECIES_COLUMNS = [
+    '종_한글명', '종류', '관상용_애완용', '사육_난이도_5단계', '초기비용_등급_5단계', '성체크기_등급_3단계',
+    '온도습도_5단계', '활동패턴', '식성타입', '먹이빈도_등급', '핸들링적합도_5단계', '사육장_사이즈_3단계',
+    '외형태그', '사진_URL', '온도_범위_주간', '습도_범위'
+]
+
+TAGS = ['귀엽다', '멋있다', '화려하다', '특이하다', '순하다']
+
+
+def make_species(name: str, **overrides: Any) -> Dict[str, Any]:
+    """검증 규칙을 통과하는 종 한 건 (overrides로 컬럼 값 변경)"""
+    values = {
+        '종_한글명': name,
+        '종류': '게코',
+        '관상용_애완용': '애완용',
+        '사육_난이도_5단계': 2,
+        '초기비용_등급_5단계': 2,
+        '성체크기_등급_3단계': 1,
+        '온도습도_5단계': 3,
+        '활동패턴': '야행성',
+        '식성타입': '잡식',
+        '먹이빈도_등급': 3,
+        '핸들링적합도_5단계': 4,
+        '사육장_사이즈_3단계': 1,
+        '외형태그': '귀엽다',
+        '사진_URL': '',
+        '온도_범위_주간': '24-30°C',
+        '습도_범위': '50-70%',
+    }
+    values.update(overrides)
+    return values
+
+
+def make_catalog(species: List[Dict[str, Any]]) -> SpeciesCatalog:
+    return SpeciesCatalog.from_rows(SPECIES_COLUMNS, [[s.get(c) for c in SPECIES_COLUMNS] for s in species])
+
+
+def random_species(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    """점수 계산 입력 전 범위를 고르게 섞은 합성 종 목록"""
+    return [
+        make_species(
+            f"종{i:04d}",
+            종류=rng.choice(ALLOWED_SPECIES_TYPES),
+            관상용_애완용=rng.choice(['관상용', '애완용', '둘 다']),
+            사육_난이도_5단계=rng.randint(1, 5),
+            초기비용_등급_5단계=rng.randint(1, 5),
+            성체크기_등급_3단계=rng.randint(1, 3),
+            온도습도_5단계=rng.randint(1, 5),
+            활동패턴=rng.choice(['야행성', '주행성']),
+            식성타입=rng.choice(['잡식', '초식', '육식']),
+            먹이빈도_등급=rng.randint(1, 5),
+            핸들링적합도_5단계=rng.randint(1, 5),
+            사육장_사이즈_3단계=rng.randint(1, 3),
+            외형태그=', '.join(rng.sample(TAGS, rng.randint(0, 3))),
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,34 @@
+"""일괄 점수 계산: 정책 이름 검증과 응답별 오류 기록"""
+import json
+
+import pytest
+
+import batch_score
+
+
+class _FailingEngine:
+    def recommend(self, preferences, options):
+        raise RuntimeError('boom')
+
+
+def test_engine_error_is_recorded_per_record(monkeypatch):
+    monkeypatch.setattr(batch_score, '_engine', _FailingEngine())
+    lines, errors = batch_score._score_batch([
+        (1, json.dumps({'id': 'a', 'preferences': {'종류': ['게코']}})),
+        (2, 'not json'),
+    ], {})
+    assert errors == 2
+    first, second = (json.loads(line) for line in lines)
+    assert first['id'] == 'a' and first['errors'] == ['점수 계산 실패: RuntimeError: boom']
+    assert second['record'] == 2 and second['errors'][0].startswith('JSON 파싱 실패')
+
+
+def test_unknown_policy_is_a_usage_error(tmp_path, monkeypatch, capsys):
+    source = tmp_path / 'in.jsonl'
+    source.write_text('{"preferences": {"종류": ["게코"]}}\n', encoding='utf-8')
+    monkeypatch.setattr('sys.argv', ['batch_score.py', str(source), str(tmp_path / 'out.jsonl'), '--policy', 'nope'])
+    with pytest.raises(SystemExit) as exit_info:
+        batch_score.main()
+    assert exit_info.value.code == 2
+    assert '--policy' in capsys.readouterr().err
+    assert not (tmp_path / 'out.jsonl').exists()
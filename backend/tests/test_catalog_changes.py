@@ -0,0 +1,177 @@
+"""카탈로그 변경: 수정 컬럼만 검증, 기후 구간 인덱스와 종명 색인의 제자리 갱신"""
+import random
+
+import pytest
+
+import app as app_module
+import species_resolver
+from catalog_changes import CatalogChangeError, CatalogEditor
+from conftest import make_catalog, make_species, random_species
+from recommendation_engine import RecommendationEngine
+from species_resolver import SpeciesResolver
+
+
+def test_update_skips_unparseable_legacy_climate_value():
+    # 로더는 해석 못 한 기후 범위를 경고 후 결측으로 두므로 그런 행도 다른 컬럼은 고칠 수 있어야 한다
+    catalog = make_catalog([make_species('옛게코', 온도_범위_주간='따뜻하게')])
+    assert catalog.records[0]['주간온도_최저'] is None
+    editor = CatalogEditor(catalog)
+
+    editor.update('옛게코', {'사육_난이도_5단계': 4})
+    assert catalog.records[0]['사육_난이도_5단계'] == 4
+    assert catalog.get_detail(0)['온도_범위_주간'] == '따뜻하게'
+
+    with pytest.raises(CatalogChangeError) as excinfo:
+        editor.update('옛게코', {'온도_범위_주간': '아주 따뜻하게'})
+    assert excinfo.value.status == 400
+    editor.update('옛게코', {'온도_범위_주간': '25-29°C'})
+    assert catalog.climate_filter([('온도_범위_주간', 28, None)]) == [0]
+
+
+def _brute_force(catalog, column, low, high, contains):
+    min_column, max_column = {'온도_범위_주간': ('주간온도_최저', '주간온도_최고'),
+                              '습도_범위': ('습도_최저', '습도_최고')}[column]
+    matched = []
+    for i, record in enumerate(catalog.records):
+        if record is None or record[min_column] is None:
+            continue
+        start, end = record[min_column], record[max_column]
+        if contains and start <= low and end >= high or not contains and start <= high and end >= low:
+            matched.append(i)
+    return sorted(matched, key=lambda i: (catalog.list_key(i), i))
+
+
+def test_climate_filter_matches_brute_force_after_changes():
+    rng = random.Random(7)
+    species = random_species(rng, 60)
+    for values in species:
+        low = rng.randint(15, 32)
+        values['온도_범위_주간'] = f"{low}-{low + rng.randint(0, 8)}°C"
+    catalog = make_catalog(species)
+    editor = CatalogEditor(catalog)
+
+    for step in range(120):
+        names = [record['종_한글명'] for record in catalog.records if record is not None]
+        action = rng.random()
+        if action < 0.3:
+            editor.delete(rng.choice(names))
+        elif action < 0.6:
+            low = rng.randint(15, 32)
+            editor.insert(make_species(f"새종{step:03d}", 온도_범위_주간=f"{low}-{low + rng.randint(0, 8)}°C"))
+        else:
+            low = rng.randint(15, 32)
+            editor.update(rng.choice(names), {'온도_범위_주간': f"{low}-{low + rng.randint(0, 8)}°C"})
+
+        low = rng.randint(12, 36)
+        high = low + rng.randint(0, 6)
+        for contains in (False, True):
+            assert catalog.climate_filter([('온도_범위_주간', low, high)], contains=contains) == \
+                _brute_force(catalog, '온도_범위_주간', low, high, contains)
+
+
+def test_resolver_follows_renames_and_deletes():
+    catalog = make_catalog([make_species('레오파드게코'), make_species('크레스티드게코')])
+    editor = CatalogEditor(catalog)
+    assert catalog.resolve_name('표범도마뱀붙이').method == 'alias'
+
+    editor.update('레오파드게코', {'종_한글명': '레오파드 게코 (하이옐로)'})
+    assert catalog.resolve_name('표범도마뱀붙이').index is None
+    assert catalog.resolve_name('레오파드게코 (하이옐로)').index == 0
+
+    editor.update('레오파드 게코 (하이옐로)', {'종_한글명': '레오파드게코'})
+    assert catalog.resolve_name('표범도마뱀붙이') == (0, 'alias', [])
+
+    editor.delete('크레스티드게코')
+    match = catalog.resolve_name('크레스티드게고')
+    assert match.index is None
+    assert all(name != '크레스티드게코' for name, _ in match.suggestions)
+
+
+def test_resolver_compacts_tombstones_and_matches_rebuild():
+    catalog = make_catalog([make_species('레오파드게코'), make_species('크레스티드게코')])
+    editor = CatalogEditor(catalog)
+    for step in range(200):
+        editor.update('크레스티드게코' if step % 2 else '크레스티드 게코', {'종_한글명': '크레스티드 게코' if step % 2 else '크레스티드게코'})
+
+    resolver = catalog.resolver
+    assert resolver._tombstones < species_resolver.COMPACT_MIN_TOMBSTONES
+    assert sum(len(ids) for ids in resolver._postings.values()) < 200
+    fresh = SpeciesResolver((i, record['종_한글명']) for i, record in enumerate(catalog.records) if record is not None)
+    for query in ('크레스티드게고', '레오파드개코', '표범도마뱀붙이', '게코'):
+        assert resolver.resolve(query) == fresh.resolve(query)
+
+
+def test_common_trigrams_are_not_scanned(monkeypatch):
+    names = [f"{i:04d}게코" for i in range(40)] + ['크레스티드게코']
+    resolver = SpeciesResolver(enumerate(names), aliases={})
+    monkeypatch.setattr(species_resolver, 'MAX_POSTINGS_PER_GRAM', 8)
+    # '게코' 부분의 트라이그램은 41개 항목에 있어 세지 않고, 드문 트라이그램으로 찾는다
+    assert resolver.resolve('크레스티드개코').index == len(names) - 1
+    # 모든 트라이그램이 흔하면 가장 드문 것의 앞부분만 본다
+    assert len(resolver.resolve('게코', limit=100).suggestions) <= 8
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    catalog = make_catalog([make_species('레오파드게코'), make_species('크레스티드게코', 종류='도마뱀')])
+    monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(app_module, 'dataset', catalog)
+    monkeypatch.setattr(app_module, 'engine', RecommendationEngine(catalog))
+    monkeypatch.setattr(app_module, 'catalog_editor', CatalogEditor(catalog))
+    return app_module.app.test_client(), catalog
+
+
+def _list_names(client):
+    return [item['종_한글명'] for item in client.get('/api/species/list').get_json()['items']]
+
+
+@pytest.mark.parametrize('species_type', [None, ''])
+def test_patch_rejects_empty_sort_key_column(admin_client, species_type):
+    client, _ = admin_client
+    headers = {'X-Admin-Token': 'secret'}
+    response = client.patch('/api/admin/species/레오파드게코', json={'changes': {'종류': species_type}}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['error']['details'] == ['종류: 비워 둘 수 없습니다']
+
+    assert _list_names(client) == ['레오파드게코', '크레스티드게코']
+    assert client.get('/api/species/레오파드게코').get_json()['종류'] == '게코'
+    assert client.delete('/api/admin/species/레오파드게코', headers=headers).status_code == 200
+    assert _list_names(client) == ['크레스티드게코']
+
+
+def _catalog_state(catalog):
+    return (
+        list(catalog.list_order), list(catalog.list_keys), dict(catalog.name_index),
+        [catalog.get_detail(i) for i, record in enumerate(catalog.records) if record is not None],
+        sorted(catalog.climate_filter([('온도_범위_주간', None, None)])),
+        catalog.resolve_name('표범도마뱀붙이'), catalog.revision, len(catalog.records),
+    )
+
+
+def test_failed_change_leaves_catalog_unchanged(monkeypatch):
+    catalog = make_catalog([make_species('레오파드게코'), make_species('크레스티드게코', 종류='도마뱀')])
+    editor = CatalogEditor(catalog)
+    before = _catalog_state(catalog)
+
+    add = catalog.resolver.add
+    failures = []
+
+    def fail_once(*args):
+        # 새 값을 색인에 넣는 첫 호출만 실패 (롤백에서 이전 값을 다시 넣는 호출은 통과)
+        if not failures:
+            failures.append(args)
+            raise RuntimeError('색인 갱신 실패')
+        add(*args)
+
+    monkeypatch.setattr(catalog.resolver, 'add', fail_once)
+    with pytest.raises(RuntimeError):
+        editor.update('레오파드게코', {'종류': '도마뱀', '온도_범위_주간': '20-22°C'})
+    failures.clear()
+    with pytest.raises(RuntimeError):
+        editor.insert(make_species('토케이게코'))
+    monkeypatch.undo()
+
+    assert _catalog_state(catalog) == before
+    editor.update('레오파드게코', {'사육_난이도_5단계': 3})
+    editor.delete('레오파드게코')
+    assert [catalog.list_values(i)[2] for i in catalog.list_order] == ['크레스티드게코']
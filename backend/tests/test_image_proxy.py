@@ -0,0 +1,169 @@
+"""이미지 프록시: 로컬 스텁 서버로 캐시 히트/미스, ETag 304, 원본 오류 확인"""
+import io
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+import app as app_module
+import image_proxy
+from conftest import make_catalog, make_species
+from image_proxy import DiskImageCache, ImageFetchError, ImageProxy, UrlFetcher
+
+
+def _png(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new('RGB', (width, height), (30, 120, 60)).save(output, format='PNG')
+    return output.getvalue()
+
+
+@pytest.fixture
+def stub_server():
+    """/photo.png는 800x600 PNG, 래스터가 아닌 응답 몇 가지, 그 밖의 경로는 404를 주는 원본 서버"""
+    script = b'<html><script>alert(document.cookie)</script></html>'
+    routes = {
+        '/photo.png': ('image/png', _png(800, 600)),
+        '/page.html': ('text/html', script),
+        '/icon.svg': ('image/svg+xml', b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'),
+        '/fake.png': ('image/png', script),
+    }
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            if self.path in routes:
+                content_type, body = routes[self.path]
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self.send_error(404)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", requests
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def proxy(tmp_path):
+    return ImageProxy(DiskImageCache(str(tmp_path)), UrlFetcher(timeout=5, allow_private_hosts=True))
+
+
+def test_cache_miss_then_hit(stub_server, proxy):
+    base_url, requests = stub_server
+    first = proxy.get(f"{base_url}/photo.png", 320)
+    second = proxy.get(f"{base_url}/photo.png", 320)
+
+    assert requests == ['/photo.png']
+    assert second.etag == first.etag and second.data == first.data
+    with Image.open(io.BytesIO(first.data)) as img:
+        assert img.width == 320
+    stats = proxy.stats()
+    assert (stats['hits'], stats['entries']) == (1, 1)
+
+
+def test_upstream_error_is_not_cached(stub_server, proxy):
+    base_url, requests = stub_server
+    for _ in range(2):
+        with pytest.raises(ImageFetchError):
+            proxy.get(f"{base_url}/missing.png", 320)
+    assert requests == ['/missing.png', '/missing.png']
+    assert proxy.stats()['entries'] == 0
+
+
+@pytest.mark.parametrize('url', [
+    'file:///etc/passwd',
+    'ftp://example.com/photo.png',
+    'http://127.0.0.1/photo.png',
+    'http://169.254.169.254/latest/meta-data/',
+])
+def test_rejects_non_http_and_internal_urls(tmp_path, url):
+    proxy = ImageProxy(DiskImageCache(str(tmp_path)), UrlFetcher(timeout=5))
+    with pytest.raises(ImageFetchError):
+        proxy.get(url, 320)
+
+
+@pytest.mark.parametrize('path', ['/page.html', '/icon.svg', '/fake.png'])
+def test_non_raster_upstream_is_rejected_and_not_cached(stub_server, proxy, path):
+    base_url, requests = stub_server
+    for _ in range(2):
+        with pytest.raises(ImageFetchError):
+            proxy.get(f"{base_url}{path}", 320)
+    assert requests == [path, path]
+    assert proxy.stats()['entries'] == 0
+
+
+def test_connects_to_the_address_it_checked(stub_server, tmp_path, monkeypatch):
+    # 첫 해석은 공개 주소, 그 뒤로는 루프백을 주는 재바인딩 호스트
+    base_url, requests = stub_server
+    port = int(base_url.rsplit(':', 1)[1])
+    public_address = ('93.184.216.34', port)
+    answers = iter([public_address[0]])
+    resolve, connect = socket.getaddrinfo, socket.create_connection
+    connected = []
+
+    def rebinding_getaddrinfo(host, *args, **kwargs):
+        if host != 'rebind.example':
+            return resolve(host, *args, **kwargs)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (next(answers, '127.0.0.1'), port))]
+
+    def offline_create_connection(address, *args, **kwargs):
+        # 공개 주소로는 실제로 나가지 않고 연결 거부로 끝낸다
+        if tuple(address) == public_address:
+            connected.append(address)
+            raise ConnectionRefusedError(address)
+        return connect(address, *args, **kwargs)
+
+    monkeypatch.setattr(image_proxy.socket, 'getaddrinfo', rebinding_getaddrinfo)
+    monkeypatch.setattr(image_proxy.socket, 'create_connection', offline_create_connection)
+    proxy = ImageProxy(DiskImageCache(str(tmp_path)), UrlFetcher(timeout=5))
+    for _ in range(2):
+        with pytest.raises(ImageFetchError):
+            proxy.get(f"http://rebind.example:{port}/photo.png", 320)
+    assert connected == [public_address]
+    assert requests == []
+
+
+@pytest.fixture
+def client(stub_server, proxy, monkeypatch):
+    base_url, _ = stub_server
+    catalog = make_catalog([
+        make_species('스텁게코', 사진_URL=f"{base_url}/photo.png"),
+        make_species('깨진사진게코', 사진_URL=f"{base_url}/missing.png"),
+        make_species('스크립트게코', 사진_URL=f"{base_url}/page.html"),
+    ])
+    monkeypatch.setattr(app_module, 'dataset', catalog)
+    monkeypatch.setattr(app_module, 'image_proxy', proxy)
+    return app_module.app.test_client()
+
+
+def test_endpoint_etag_304(client, stub_server):
+    _, requests = stub_server
+    first = client.get('/api/species/스텁게코/image?w=300')
+    assert first.status_code == 200
+    assert first.headers['Content-Type'] == 'image/jpeg'
+    assert first.headers['X-Content-Type-Options'] == 'nosniff'
+    etag = first.headers['ETag']
+
+    second = client.get('/api/species/스텁게코/image?w=300', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+    assert requests == ['/photo.png']
+
+
+@pytest.mark.parametrize('name', ['깨진사진게코', '스크립트게코'])
+def test_endpoint_upstream_error_returns_502(client, name):
+    response = client.get(f'/api/species/{name}/image')
+    assert response.status_code == 502
+    assert response.get_json()['error']['code'] == 'IMAGE_FETCH_FAILED'
@@ -0,0 +1,102 @@
+"""추천 엔진: 상한 가지치기 결과가 전체 계산과 같은지, top_n 경계"""
+import random
+from typing import Any, Dict
+
+import pytest
+
+from conftest import TAGS, make_catalog, random_species
+from recommendation_engine import DEFAULT_POLICY, RecommendationEngine
+from request_schema import decode_preferences
+from scoring_policy import PolicyRegistry, ScoringPolicy
+from species_validation import ALLOWED_SPECIES_TYPES
+
+CATALOG_SIZE = 80
+TOP_N_CASES = (1, 3, CATALOG_SIZE - 1, CATALOG_SIZE, CATALOG_SIZE + 20)
+
+
+def random_preferences(rng: random.Random) -> Dict[str, Any]:
+    """검증을 통과하는 임의 선호도 (가중치 0/음수 포함)"""
+    prefs: Dict[str, Any] = {'종류': rng.sample(ALLOWED_SPECIES_TYPES, rng.randint(1, len(ALLOWED_SPECIES_TYPES)))}
+    for key, max_value in (('사육_난이도_5단계', 5), ('초기비용_등급_5단계_max', 5), ('사육장_사이즈_3단계_max', 3),
+                           ('먹이빈도_등급_prefer', 5), ('핸들링적합도_5단계_prefer', 5)):
+        if rng.random() < 0.6:
+            prefs[key] = rng.randint(1, max_value)
+    for key, choices in (('활동패턴', ['야행성', '주행성', '']), ('식성타입', ['잡식', '초식', '육식']),
+                         ('관상용_애완용', ['관상용', '애완용', '둘 다'])):
+        if rng.random() < 0.6:
+            prefs[key] = rng.choice(choices)
+    if rng.random() < 0.5:
+        prefs['외형태그'] = rng.sample(TAGS, rng.randint(1, 3))
+    if rng.random() < 0.3:
+        prefs['종류_가중치'] = {t: rng.choice([0, 5, 10, 20, -3]) for t in prefs['종류']}
+    if rng.random() < 0.3:
+        questions = ['사육_난이도_5단계', '초기비용_등급_5단계', '활동패턴', '외형태그', '관상용_애완용', '온도습도_5단계']
+        prefs['custom_weights'] = {q: rng.choice([0, 1, 5, 20, -5, 2.5]) for q in rng.sample(questions, 3)}
+    preferences, errors = decode_preferences({'preferences': prefs})
+    assert not errors
+    return preferences
+
+
+@pytest.fixture(scope='module')
+def engine():
+    rng = random.Random(43)
+    species = random_species(rng, CATALOG_SIZE)
+    # 동점이 많이 생기도록 같은 값의 종을 섞는다 (동점은 인덱스 순서)
+    species += [dict(values, 종_한글명=f"{values['종_한글명']}-복제") for values in species[:10]]
+    return RecommendationEngine(make_catalog(species))
+
+
+@pytest.mark.parametrize('group_column', [None, '종류'])
+def test_pruned_top_n_matches_full_scan(engine, group_column):
+    rng = random.Random(7 if group_column is None else 8)
+    for _ in range(150):
+        preferences = random_preferences(rng)
+        custom_weights = engine.resolve_weights(preferences, DEFAULT_POLICY)
+        for top_n in TOP_N_CASES:
+            pruned = engine.top_scores_by_group(preferences, custom_weights, DEFAULT_POLICY, top_n, group_column)
+            full = engine.top_scores_by_group(
+                preferences, custom_weights, DEFAULT_POLICY, top_n, group_column, prune=False
+            )
+            assert pruned == full, (preferences, top_n)
+
+
+@pytest.mark.parametrize('top_n', [0, -1])
+def test_non_positive_top_n_is_empty(engine, top_n):
+    preferences = random_preferences(random.Random(1))
+    custom_weights = engine.resolve_weights(preferences, DEFAULT_POLICY)
+    for prune in (True, False):
+        assert engine.top_scores(preferences, custom_weights, DEFAULT_POLICY, top_n, prune) == []
+        assert engine.top_scores_by_group(preferences, custom_weights, DEFAULT_POLICY, top_n, '종류', prune) == {}
+    assert engine.recommend(preferences, {'top_n': top_n})['results'] == []
+    groups = engine.recommend(preferences, {'top_n': top_n, 'group_by': '종류'})['groups']
+    assert all(group['results'] == [] for group in groups)
+
+
+def _client_scores(matrix, custom_weights):
+    """score_matrix 문서의 클라이언트 계산 그대로"""
+    weights = custom_weights or matrix['default_weights']
+    results = []
+    for i, name in enumerate(matrix['species']):
+        total = matrix['type_scores'][i]
+        for j, key in enumerate(matrix['questions']):
+            total += (matrix['scores'][i][j] / 100) * weights.get(key, matrix['default_weights'][key])
+        score = min(100, max(0, total / sum(weights.values()) * 100))
+        if score > 0:
+            results.append((name, round(score, 1)))
+    return sorted(results, key=lambda item: -item[1])
+
+
+def test_matrix_reweights_zero_default_question():
+    policy = ScoringPolicy('zero-tags', 'test', dict(DEFAULT_POLICY.weights, 외형태그=0, 식성타입=0))
+    engine = RecommendationEngine(make_catalog(random_species(random.Random(5), 40)), PolicyRegistry.single(policy))
+    preferences, errors = decode_preferences({'preferences': {
+        '종류': ALLOWED_SPECIES_TYPES, '외형태그': TAGS[:2], '식성타입': '잡식',
+    }})
+    assert not errors
+
+    matrix = engine.score_matrix(preferences, policy)
+    column = matrix['questions'].index('외형태그')
+    assert any(row[column] > 0 for row in matrix['scores'])
+    for custom_weights in ({}, {'외형태그': 30}, {'외형태그': 30, '식성타입': 10, '사육_난이도_5단계': 0}):
+        results = engine.recommend(dict(preferences, custom_weights=custom_weights), {'top_n': 100})['results']
+        assert _client_scores(matrix, custom_weights) == [(r['종_한글명'], r['match_score']) for r in results]
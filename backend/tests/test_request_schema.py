@@ -0,0 +1,49 @@
+"""요청 스키마: 잘못된 입력은 엔진까지 가지 않고 400"""
+import pytest
+
+import app as app_module
+from conftest import make_catalog, make_species
+from recommendation_engine import RecommendationEngine
+from request_schema import decode_preferences
+
+
+@pytest.mark.parametrize('types', [[['게코']], [1], ['게코', None], [], '게코'])
+def test_type_list_rejects_non_string_items(types):
+    preferences, errors = decode_preferences({'preferences': {'종류': types}})
+    assert preferences is None
+    assert errors == ["'종류'는 최소 1개 이상 선택해야 합니다"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    catalog = make_catalog([make_species('레오파드게코'), make_species('크레스티드게코')])
+    monkeypatch.setattr(app_module, 'dataset', catalog)
+    monkeypatch.setattr(app_module, 'engine', RecommendationEngine(catalog))
+    return app_module.app.test_client()
+
+
+def test_grouped_recommend_with_nested_type_list_is_400(client):
+    response = client.post('/api/recommend', json={
+        'preferences': {'종류': [['게코']]},
+        'options': {'group_by': '종류'},
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'INVALID_INPUT'
+
+    response = client.post('/api/recommend', json={
+        'preferences': {'종류': ['게코']},
+        'options': {'group_by': '종류'},
+    })
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('body', [[], ['게코'], 'x', 3])
+def test_session_with_non_object_body_is_400(client, body):
+    response = client.post('/api/session', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'INVALID_INPUT'
+
+    session_id = client.post('/api/session', json={}).get_json()['session_id']
+    response = client.patch(f'/api/session/{session_id}', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'INVALID_INPUT'
@@ -0,0 +1,69 @@
+"""점수 규칙: 컴파일된 조회와 evaluate가 전 등급 범위에서 같은지, 범위 밖 등급은 예전 식과 같은지"""
+import pytest
+
+from scoring_helpers import DEFAULT_SCORE_TABLES
+from scoring_rules import compile_score_tables
+
+# 값 범위 안팎과 정수가 아닌 등급
+GRADE_DOMAIN = [-3, -1, 0, 1, 1.5, 2, 2.0, 2.5, 3, 4, 4.75, 5, 6, 7, 10]
+
+
+@pytest.fixture(scope='module')
+def compiled():
+    return compile_score_tables(DEFAULT_SCORE_TABLES)
+
+
+def test_lookup_matches_evaluate(compiled):
+    for key, rule in compiled.items():
+        spec = rule.spec
+        if spec.kind == 'category':
+            domain = spec.values + ['기타', '', None]
+            pairs = [(s, a) for s in domain for a in domain]
+        elif spec.kind == 'grade':
+            pairs = [(s, None) for s in GRADE_DOMAIN]
+        else:
+            pairs = [(s, a) for s in GRADE_DOMAIN for a in GRADE_DOMAIN]
+        for species_value, answer in pairs:
+            expected = spec.evaluate(species_value, answer, rule.points)
+            assert rule.lookup(species_value, answer) == expected, (key, species_value, answer)
+
+
+def _clamp(score):
+    return max(0, min(100, score))
+
+
+# 규칙 파일 이전의 계산식 (scoring_helpers의 분기문)
+def _difficulty(s, a):
+    diff = s - a
+    if diff == 0:
+        return 100
+    if diff < 0:
+        return 90 if diff == -1 else 75 if diff == -2 else 60
+    return 50 if diff == 1 else 25
+
+
+def _budget(s, a, over_1, over_more):
+    if s <= a:
+        return 100
+    return over_1 if s - a == 1 else over_more
+
+
+BASELINE = {
+    '사육_난이도_5단계': _difficulty,
+    '초기비용_등급_5단계': lambda s, a: _budget(s, a, 33, 0),
+    '먹이빈도_등급': lambda s, a: _budget(s, a, 50, 25),
+    '핸들링적합도_5단계': lambda s, a: _budget(a, s, 50, 25),
+    '사육장_사이즈_3단계': lambda s, a: 100 if s <= a else 0,
+    '온도습도_5단계': lambda s, a: _clamp(100 - (s - 1) * 20),
+    '성체크기_등급_3단계': lambda s, a: _clamp(100 - (s - 1) * 50),
+}
+
+
+@pytest.mark.parametrize('key', list(BASELINE))
+def test_default_tables_match_previous_formulas(compiled, key):
+    rule = compiled[key]
+    answers = [None] if rule.spec.kind == 'grade' else GRADE_DOMAIN
+    for species_value in GRADE_DOMAIN:
+        for answer in answers:
+            score, _ = rule.lookup(species_value, answer)
+            assert score == BASELINE[key](species_value, answer), (key, species_value, answer)
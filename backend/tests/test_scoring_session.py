@@ -0,0 +1,57 @@
+"""점수 세션: 답변을 여러 번 바꾼 뒤의 미리보기가 새로 계산한 recommend와 같은지"""
+import random
+
+from catalog_changes import CatalogEditor
+from conftest import TAGS, make_catalog, make_species, random_species
+from recommendation_engine import RecommendationEngine
+from request_schema import decode_preferences
+from scoring_session import ScoringSession
+from species_validation import ALLOWED_SPECIES_TYPES
+
+ANSWER_CHOICES = {
+    '종류': lambda rng: rng.sample(ALLOWED_SPECIES_TYPES, rng.randint(1, len(ALLOWED_SPECIES_TYPES))),
+    '종류_가중치': lambda rng: {t: rng.choice([0, 5, 10, 20]) for t in ALLOWED_SPECIES_TYPES},
+    '사육_난이도_5단계': lambda rng: rng.randint(1, 5),
+    '초기비용_등급_5단계_max': lambda rng: rng.randint(1, 5),
+    '먹이빈도_등급_prefer': lambda rng: rng.randint(1, 5),
+    '활동패턴': lambda rng: rng.choice(['야행성', '주행성']),
+    '식성타입': lambda rng: rng.choice(['잡식', '초식', '육식']),
+    '외형태그': lambda rng: rng.sample(TAGS, rng.randint(1, 3)),
+    'custom_weights': lambda rng: {q: rng.choice([0, 5, 20]) for q in ('사육_난이도_5단계', '활동패턴', '외형태그')},
+}
+
+
+def _expected(engine, preferences, top_n):
+    results = engine.recommend(dict(preferences), {'top_n': top_n})['results']
+    return [(r['종_한글명'], r['match_score']) for r in results]
+
+
+def _preview(session, top_n):
+    return [(r['종_한글명'], r['match_score']) for r in session.top(top_n)]
+
+
+def test_top_matches_recommend_after_answer_changes():
+    rng = random.Random(11)
+    species = random_species(rng, 60)
+    # 동점 순서(인덱스 순)도 확인하도록 같은 값의 종을 섞는다
+    species += [dict(values, 종_한글명=f"{values['종_한글명']}-복제") for values in species[:8]]
+    catalog = make_catalog(species)
+    engine = RecommendationEngine(catalog)
+    editor = CatalogEditor(catalog)
+    session = ScoringSession(engine, {'종류': ['게코']})
+
+    for step in range(80):
+        keys = rng.sample(list(ANSWER_CHOICES), rng.randint(1, 2))
+        merged = dict(session.preferences, **{key: ANSWER_CHOICES[key](rng) for key in keys})
+        decoded, errors = decode_preferences({'preferences': merged}, partial=True)
+        assert not errors
+        session.update({key: decoded[key] for key in keys})
+        if step % 10 == 9:
+            # 관리자 변경은 바뀐 종 한 행만 다시 계산
+            change = editor.insert(make_species(f"새종{step:03d}", 종류=rng.choice(ALLOWED_SPECIES_TYPES)))
+            session.refresh_species(change.index)
+
+        assert session.ranking == sorted((-score, i) for i, score in enumerate(session.totals) if score > 0)
+        for top_n in (1, 5, len(catalog.records) + 5):
+            assert _preview(session, top_n) == _expected(engine, session.preferences, top_n), (step, keys)
+    assert session.top(0) == []
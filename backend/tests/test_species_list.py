@@ -0,0 +1,50 @@
+"""도감 목록: 종류/난이도가 비어 있는 종도 정렬되고 커서로 끝까지 넘어가는지"""
+import pytest
+
+import app as app_module
+from catalog import decode_list_cursor, encode_list_cursor
+from conftest import make_catalog, make_species
+from recommendation_engine import RecommendationEngine
+
+
+@pytest.fixture
+def catalog():
+    return make_catalog([
+        make_species('가게코'),
+        make_species('종류없음', 종류=None),
+        make_species('난이도없음', 사육_난이도_5단계=None),
+        make_species('둘다없음', 종류=None, 사육_난이도_5단계=None),
+        make_species('나뱀', 종류='뱀', 사육_난이도_5단계=1),
+    ])
+
+
+def test_missing_sort_values_sort_last(catalog):
+    assert [catalog.list_values(i) for i in catalog.list_order] == [
+        ('게코', 2, '가게코'),
+        ('게코', None, '난이도없음'),
+        ('뱀', 1, '나뱀'),
+        (None, 2, '종류없음'),
+        (None, None, '둘다없음'),
+    ]
+
+
+def test_cursor_round_trips_missing_values():
+    for values in (('게코', None, '난이도없음'), (None, None, '둘다없음'), ('뱀', 1, '나뱀')):
+        assert decode_list_cursor(encode_list_cursor(values)) == values
+    assert decode_list_cursor(encode_list_cursor(('게코', '2', 'x'))) is None
+
+
+def test_list_pages_through_missing_values(catalog, monkeypatch):
+    monkeypatch.setattr(app_module, 'dataset', catalog)
+    monkeypatch.setattr(app_module, 'engine', RecommendationEngine(catalog))
+    client = app_module.app.test_client()
+    names, cursor = [], None
+    while True:
+        response = client.get('/api/species/list', query_string={'limit': 2, 'cursor': cursor or ''})
+        assert response.status_code == 200
+        body = response.get_json()
+        names += [item['종_한글명'] for item in body['items']]
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+    assert names == ['가게코', '난이도없음', '나뱀', '종류없음', '둘다없음']
@@ -0,0 +1,84 @@
+"""기동 준비(warm-up) 단계 진행 상황 (/api/health/ready)"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+
+class WarmupState:
+    """
+    백그라운드 준비 작업의 단계별 상태와 소요 시간
+
+    status: pending → running → ready | failed
+    단계(stage)는 실행 순서대로 기록하며, 각 단계는 running → done | failed | skipped 이다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.created = time.monotonic()
+        self.status = 'pending'
+        self.error: Optional[str] = None
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._stages: List[Dict[str, Any]] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.status == 'ready'
+
+    def start(self) -> None:
+        """준비 시작 (이전 기록은 지움)"""
+        with self._lock:
+            self.status = 'running'
+            self.error = None
+            self._started = time.monotonic()
+            self._finished = None
+            self._stages = []
+
+    def finish(self, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.status = 'failed' if error else 'ready'
+            self.error = error
+            self._finished = time.monotonic()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        단계 하나의 소요 시간 기록
+
+            with warmup.stage('load_catalog') as info:
+                info['items'] = ...   # 단계별 부가 정보
+        """
+        entry = {'name': name, 'status': 'running', 'duration_ms': None}
+        info: Dict[str, Any] = {}
+        with self._lock:
+            self._stages.append(entry)
+        started = time.perf_counter()
+        try:
+            yield info
+        except BaseException:
+            entry['status'] = 'failed'
+            raise
+        else:
+            entry['status'] = info.pop('status', 'done')
+        finally:
+            entry['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            entry.update(info)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 상태 (진행 중인 단계, 단계별 소요 시간, 전체 소요 시간)"""
+        with self._lock:
+            stages = [dict(entry) for entry in self._stages]
+            if self._started is None:
+                elapsed = None
+            else:
+                elapsed = round(((self._finished or time.monotonic()) - self._started) * 1000, 1)
+            running = [entry['name'] for entry in stages if entry['status'] == 'running']
+            return {
+                'status': self.status,
+                'ready': self.status == 'ready',
+                'current_stage': running[-1] if running else None,
+                'stages': stages,
+                'elapsed_ms': elapsed,
+                'error': self.error
+            }
@@ -97,12 +97,19 @@ function createCard(item) {
   return el;
 }
 
-async function fetchDexList({ q, difficulty }) {
+// 도감 카드가 그리는 필드만 받는다 (편집 모달 기본값 포함)
+const DEX_CARD_FIELDS = ['종_한글명', '종류', '사육_난이도_5단계', '초기비용_등급_5단계', '활동패턴', '식성타입', '사진_URL', '사육_요약'];
+const DEX_PAGE_SIZE = 48;
+
+// 목록 한 페이지 조회 (cursor: 이전 페이지의 next_cursor)
+async function fetchDexList({ q, difficulty, cursor }) {
   const apiBaseUrl = (typeof getApiBaseUrl === 'function') ? getApiBaseUrl() : 'http://localhost:5000';
   const params = new URLSearchParams();
   if (q) params.set('q', q);
   if (difficulty) params.set('difficulty', difficulty);
-  params.set('limit', '500');
+  if (cursor) params.set('cursor', cursor);
+  params.set('limit', String(DEX_PAGE_SIZE));
+  params.set('fields', DEX_CARD_FIELDS.join(','));
 
   const res = await fetch(`${apiBaseUrl}/api/species/list?${params.toString()}`);
   if (!res.ok) {
@@ -114,7 +121,8 @@ async function fetchDexList({ q, difficulty }) {
     }
     throw new Error(`도감 데이터를 불러오지 못했습니다 (${res.status}): ${text}`);
   }
-  return await res.json();
+  const page = await res.json();
+  return { items: page.items || [], nextCursor: page.next_cursor || null };
 }
 
 function setStatus(msg, isError = false) {
@@ -229,26 +237,66 @@ async function boot() {
   const imgEl = document.getElementById('dexImg');
   const previewImg = document.getElementById('dexPreviewImg');
 
+  const moreBtn = document.getElementById('dexMoreBtn');
+  const sentinel = document.getElementById('dexMoreSentinel');
+
   let lastFetch = { q: '', difficulty: '' };
   let baseItems = [];
+  // 지금까지 받은 페이지 다음 커서 (없으면 마지막 페이지)
+  let nextCursor = null;
+  let loading = false;
+  // 검색 조건이 바뀌면 증가: 이전 조건의 늦은 응답은 버린다
+  let generation = 0;
+
+  function updateMore() {
+    if (moreBtn) moreBtn.style.display = nextCursor ? '' : 'none';
+  }
 
-  async function refresh() {
-    const q = (search?.value || '').trim();
-    const difficulty = (difficultySel?.value || '').trim();
-    setStatus('불러오는 중...');
+  async function loadPage(reset) {
+    if (!reset && (loading || !nextCursor)) return;
+    const current = reset ? ++generation : generation;
+    const { q, difficulty } = lastFetch;
+    loading = true;
+    if (reset) setStatus('불러오는 중...');
+    if (moreBtn) moreBtn.disabled = true;
     try {
-      lastFetch = { q, difficulty };
-      const res = await fetchDexList({ q, difficulty });
-      baseItems = res.items || [];
-      const merged = applyDexOverrides(baseItems);
+      const page = await fetchDexList({ q, difficulty, cursor: reset ? null : nextCursor });
+      if (current !== generation) return;
+      baseItems = reset ? page.items : baseItems.concat(page.items);
+      nextCursor = page.nextCursor;
       setStatus('');
-      renderGrid(merged);
+      renderGrid(applyDexOverrides(baseItems));
     } catch (e) {
+      if (current !== generation) return;
       console.error(e);
       setStatus(e.message || '도감 데이터를 불러오지 못했습니다.', true);
+    } finally {
+      if (current === generation) {
+        loading = false;
+        if (moreBtn) moreBtn.disabled = false;
+        updateMore();
+      }
     }
   }
 
+  // 첫 페이지부터 다시 조회
+  async function refresh() {
+    const q = (search?.value || '').trim();
+    const difficulty = (difficultySel?.value || '').trim();
+    lastFetch = { q, difficulty };
+    nextCursor = null;
+    loading = false;
+    await loadPage(true);
+  }
+
+  if (moreBtn) moreBtn.addEventListener('click', () => loadPage(false));
+  // 목록 끝이 화면에 들어오면 다음 페이지를 이어 받는다
+  if (sentinel && 'IntersectionObserver' in window) {
+    new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) loadPage(false);
+    }, { rootMargin: '400px' }).observe(sentinel);
+  }
+
   const debounced = (() => {
     let t = null;
     return () => {